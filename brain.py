@@ -2,56 +2,118 @@ import numpy as np
 import random
 from consts import MUTATION_RATE, MUTATION_STRENGTH, MAX_HUNGER
 
-_MOTHER_INPUT_BUFFER = np.zeros(4, dtype=np.float32)
+MOTHER_NUM_INPUTS = 4
+
+_MOTHER_INPUT_BUFFER = np.zeros(MOTHER_NUM_INPUTS, dtype=np.float32)
 _CREATURE_INPUT_BUFFER = np.zeros(33, dtype=np.float32)
 
 
-class MotherBrain:
+class _FeedForward:
     """
-    Inputs (4 total):
-        - Mother's hunger level (normalized)
-        - Mother's points (normalized)
-        - Number of offspring (normalized)
-        - Average offspring hunger (normalized)
+    ReLU feedforward network with a tanh output, stored as one flat genome.
 
-    Outputs (3 total - goal signals):
-        - Food priority (how much offspring should prioritize food)
-        - Exploration (how much offspring should explore)
-        - Safety (how cautious offspring should be)
+    `genome` is a single contiguous float32 vector holding every layer's
+    weights then biases, in layer order. `weights[i]` and `biases[i]` are
+    views into it, so copy, mutation, crossover and pickling each touch one
+    array, and a population's genomes stack into an (N, genome_len) matrix.
     """
-    __slots__ = ('input_size', 'hidden_sizes',
-                 'output_size', 'weights', 'biases')
-
-    def __init__(self, input_size=4, hidden_sizes=None, output_size=3):
-        if hidden_sizes is None:
-            hidden_sizes = [8, 6]
+    __slots__ = ('input_size', 'hidden_sizes', 'output_size',
+                 'genome', 'weights', 'biases')
 
+    def _build(self, input_size, hidden_sizes, output_size, genome):
         self.input_size = input_size
         self.hidden_sizes = hidden_sizes
         self.output_size = output_size
-
+        self.genome = genome
         self.weights = []
         self.biases = []
-
         layer_sizes = [input_size] + hidden_sizes + [output_size]
+        start = 0
+        for fan_in, fan_out in zip(layer_sizes[:-1], layer_sizes[1:]):
+            end = start + fan_in * fan_out
+            self.weights.append(genome[start:end].reshape(fan_in, fan_out))
+            self.biases.append(genome[end:end + fan_out])
+            start = end + fan_out
+
+    def _initialize(self, input_size, hidden_sizes, output_size, rng):
+        if rng is None:
+            rng = np.random
+        self._build(input_size, hidden_sizes, output_size,
+                    np.zeros(genome_length(input_size, hidden_sizes, output_size),
+                             dtype=np.float32))
+        layer_sizes = [input_size] + hidden_sizes + [output_size]
+        for i, w in enumerate(self.weights):
+            # Xavier initialization; biases start at zero
+            w[:] = (rng.standard_normal(w.shape) * np.sqrt(2.0 / layer_sizes[i]))
 
-        for i in range(len(layer_sizes) - 1):
-            w = (np.random.randn(layer_sizes[i], layer_sizes[i + 1]) *
-                 np.sqrt(2.0 / layer_sizes[i])).astype(np.float32)
-            b = np.zeros(layer_sizes[i + 1], dtype=np.float32)
-            self.weights.append(w)
-            self.biases.append(b)
+    @classmethod
+    def from_genome(cls, genome, input_size, hidden_sizes, output_size):
+        """A brain whose layers are views into `genome` (not copied)."""
+        brain = cls.__new__(cls)
+        brain._build(input_size, list(hidden_sizes), output_size, genome)
+        return brain
 
     def forward(self, inputs):
         x = np.asarray(inputs, dtype=np.float32)
 
         for i in range(len(self.weights) - 1):
             x = np.dot(x, self.weights[i]) + self.biases[i]
-            np.maximum(x, 0, out=x)  # ReLU
+            np.maximum(x, 0, out=x)  # In-place ReLU
 
         x = np.dot(x, self.weights[-1]) + self.biases[-1]
         return np.tanh(x)
 
+    def copy(self):
+        return self.from_genome(self.genome.copy(), self.input_size,
+                                self.hidden_sizes, self.output_size)
+
+    def mutate(self, rate=None, strength=None, rng=None):
+        mutate_genomes(self.genome, rate, strength, rng)
+
+    def crossover(self, other, rng=None):
+        if rng is None:
+            rng = np.random
+
+        # Each gene comes from either parent with equal probability
+        mask = rng.random(self.genome.size) < 0.5
+        return self.from_genome(np.where(mask, self.genome, other.genome),
+                                self.input_size, self.hidden_sizes, self.output_size)
+
+    def __getstate__(self):
+        return (self.input_size, self.hidden_sizes, self.output_size, self.genome)
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple) and len(state) == 2:
+            # Pickled before the flat genome: (None, slot dict) with per-layer lists
+            slots = state[1]
+            genome = np.concatenate(
+                [part.ravel() for w, b in zip(slots['weights'], slots['biases'])
+                 for part in (w, b)]).astype(np.float32)
+            state = (slots['input_size'], slots['hidden_sizes'], slots['output_size'], genome)
+        input_size, hidden_sizes, output_size, genome = state
+        self._build(input_size, list(hidden_sizes), output_size, genome)
+
+
+class MotherBrain(_FeedForward):
+    """
+    Inputs (4 total):
+        - Mother's hunger level (normalized)
+        - Mother's points (normalized)
+        - Number of offspring (normalized)
+        - Average offspring hunger (normalized)
+
+    Outputs (3 total - goal signals):
+        - Food priority (how much offspring should prioritize food)
+        - Exploration (how much offspring should explore)
+        - Safety (how cautious offspring should be)
+    """
+    __slots__ = ()
+
+    def __init__(self, input_size=MOTHER_NUM_INPUTS, hidden_sizes=None, output_size=3, rng=None):
+        if hidden_sizes is None:
+            hidden_sizes = [8, 6]
+        self._initialize(input_size, hidden_sizes, output_size, rng)
+
     def get_goals(self, mother_hunger, mother_points, num_offspring, avg_offspring_hunger):
         _MOTHER_INPUT_BUFFER[0] = mother_hunger / MAX_HUNGER
         _MOTHER_INPUT_BUFFER[1] = min(mother_points / 100.0, 1.0)
@@ -63,30 +125,8 @@ class MotherBrain:
         goals[1] = goals[1] * 1.3  # Amplify exploration signal
         return goals
 
-    def copy(self):
-        new_brain = MotherBrain(
-            self.input_size, self.hidden_sizes.copy(), self.output_size)
-        new_brain.weights = [w.copy() for w in self.weights]
-        new_brain.biases = [b.copy() for b in self.biases]
-        return new_brain
-
-    def mutate(self, rate=None, strength=None):
-        if rate is None:
-            rate = MUTATION_RATE
-        if strength is None:
-            strength = MUTATION_STRENGTH
-
-        for i in range(len(self.weights)):
-            mask = np.random.random(self.weights[i].shape) < rate
-            mutations = np.random.randn(*self.weights[i].shape) * strength
-            self.weights[i] += mask * mutations
 
-            mask = np.random.random(self.biases[i].shape) < rate
-            mutations = np.random.randn(*self.biases[i].shape) * strength
-            self.biases[i] += mask * mutations
-
-
-class NeuralNetwork:
+class NeuralNetwork(_FeedForward):
     """
     A simple feedforward neural network for creature decision-making.
     Inputs (33 total):
@@ -101,40 +141,12 @@ class NeuralNetwork:
         - 6 direction preferences (one for each hex neighbor)
         - Stay preference
     """
-    __slots__ = ('input_size', 'hidden_sizes',
-                 'output_size', 'weights', 'biases')
+    __slots__ = ()
 
-    def __init__(self, input_size=33, hidden_sizes=None, output_size=7):
+    def __init__(self, input_size=33, hidden_sizes=None, output_size=7, rng=None):
         if hidden_sizes is None:
             hidden_sizes = [24, 16]
-
-        self.input_size = input_size
-        self.hidden_sizes = hidden_sizes
-        self.output_size = output_size
-
-        # Initialize weights and biases
-        self.weights = []
-        self.biases = []
-
-        layer_sizes = [input_size] + hidden_sizes + [output_size]
-
-        for i in range(len(layer_sizes) - 1):
-            # Xavier initialization
-            w = (np.random.randn(layer_sizes[i], layer_sizes[i + 1]) *
-                 np.sqrt(2.0 / layer_sizes[i])).astype(np.float32)
-            b = np.zeros(layer_sizes[i + 1], dtype=np.float32)
-            self.weights.append(w)
-            self.biases.append(b)
-
-    def forward(self, inputs):
-        x = np.asarray(inputs, dtype=np.float32)
-
-        for i in range(len(self.weights) - 1):
-            x = np.dot(x, self.weights[i]) + self.biases[i]
-            np.maximum(x, 0, out=x)  # In-place ReLU
-
-        x = np.dot(x, self.weights[-1]) + self.biases[-1]
-        return np.tanh(x)
+        self._initialize(input_size, hidden_sizes, output_size, rng)
 
     def decide(self, inputs):
         x = np.asarray(inputs, dtype=np.float32)
@@ -150,41 +162,179 @@ class NeuralNetwork:
         x = np.dot(x, weights[-1]) + biases[-1]
         return int(np.argmax(np.tanh(x)))
 
-    def copy(self):
-        new_nn = NeuralNetwork(
-            self.input_size, self.hidden_sizes.copy(), self.output_size)
-        new_nn.weights = [w.copy() for w in self.weights]
-        new_nn.biases = [b.copy() for b in self.biases]
-        return new_nn
-
-    def mutate(self, rate=None, strength=None):
-        if rate is None:
-            rate = MUTATION_RATE
-        if strength is None:
-            strength = MUTATION_STRENGTH
-
-        for i in range(len(self.weights)):
-            mask = np.random.random(self.weights[i].shape) < rate
-            mutations = np.random.randn(*self.weights[i].shape) * strength
-            self.weights[i] += mask * mutations
-
-            # Mutate biases
-            mask = np.random.random(self.biases[i].shape) < rate
-            mutations = np.random.randn(*self.biases[i].shape) * strength
-            self.biases[i] += mask * mutations
-
-    def crossover(self, other):
-
-        child = self.copy()
-
-        for i in range(len(child.weights)):
-            # Randomly select weights from either parent
-            mask = np.random.random(child.weights[i].shape) < 0.5
-            child.weights[i] = np.where(
-                mask, self.weights[i], other.weights[i])
-
-            # Same for biases
-            mask = np.random.random(child.biases[i].shape) < 0.5
-            child.biases[i] = np.where(mask, self.biases[i], other.biases[i])
-
-        return child
+
+def genome_length(input_size, hidden_sizes, output_size):
+    """Number of weights and biases in a network of the given shape."""
+    layer_sizes = [input_size] + list(hidden_sizes) + [output_size]
+    return sum(fan_in * fan_out + fan_out
+               for fan_in, fan_out in zip(layer_sizes[:-1], layer_sizes[1:]))
+
+
+def _architecture_groups(brains):
+    """Indices into `brains`, grouped by (class, input size, hidden sizes, output size)."""
+    groups = {}
+    for i, brain in enumerate(brains):
+        key = (type(brain), brain.input_size, tuple(brain.hidden_sizes), brain.output_size)
+        groups.setdefault(key, []).append(i)
+    return groups
+
+
+def stack_genomes(brains):
+    """(N, genome_len) matrix of same-shaped brains' genomes, one row each."""
+    return np.stack([brain.genome for brain in brains])
+
+
+def mutate_genomes(genomes, rate=None, strength=None, rng=None):
+    """In-place masked-Gaussian mutation of a genome or a (k, genome_len) matrix of them.
+
+    Each gene independently gets N(0, strength) noise with probability `rate`.
+    """
+    if rate is None:
+        rate = MUTATION_RATE
+    if strength is None:
+        strength = MUTATION_STRENGTH
+    if rng is None:
+        rng = np.random
+
+    mask = rng.random(genomes.shape) < rate
+    genomes += mask * (rng.standard_normal(genomes.shape) * strength)
+
+
+def mutated_copies(brains, rng=None, mutations=((None, None),)):
+    """Mutated copies of `brains`, in order, without touching the originals.
+
+    Brains are grouped by architecture; each group's genomes are stacked into
+    one (k, genome_len) matrix and every (rate, strength) round in `mutations`
+    is a single `mutate_genomes` call over it (None means the default). Each
+    child gets its own copy of its row, so no child keeps the whole batch alive.
+    """
+    children = [None] * len(brains)
+    for (cls, input_size, hidden_sizes, output_size), indices in _architecture_groups(brains).items():
+        genomes = stack_genomes([brains[i] for i in indices])
+        for rate, strength in mutations:
+            mutate_genomes(genomes, rate, strength, rng)
+        for i, genome in zip(indices, genomes):
+            children[i] = cls.from_genome(genome.copy(), input_size, hidden_sizes, output_size)
+    return children
+
+
+def forward_genomes(genomes, layer_sizes, inputs):
+    """Evaluate an (N, genome_len) matrix of same-shaped genomes, one input row each.
+
+    `inputs` is an (N, input_size) array; row i is fed to genome i. Each
+    layer is a strided (N, in, out) view of the matrix, applied with a single
+    batched matmul. matmul runs the same per-row kernel as `np.dot`, so row i
+    of the result is bit-identical to the brain's own `forward(inputs[i])`.
+    """
+    num_layers = len(layer_sizes) - 1
+    n = len(genomes)
+    x = np.asarray(inputs, dtype=np.float32)[:, None, :]
+
+    start = 0
+    for i in range(num_layers):
+        fan_in, fan_out = layer_sizes[i], layer_sizes[i + 1]
+        end = start + fan_in * fan_out
+        w = genomes[:, start:end].reshape(n, fan_in, fan_out)
+        b = genomes[:, end:end + fan_out][:, None, :]
+        start = end + fan_out
+        x = np.matmul(x, w) + b
+        if i < num_layers - 1:
+            np.maximum(x, 0, out=x)  # In-place ReLU
+
+    return np.tanh(x[:, 0, :])
+
+
+class GenomeTable:
+    """
+    Row-aligned copies of the genomes of the brains assigned to store rows.
+
+    There is one (capacity, genome_len) float32 matrix per architecture;
+    `arch[row]` picks the matrix holding that row's genome (-1 for no brain).
+    A genome is written once, when its brain is assigned to the row, so a
+    batched forward pass only gathers the rows it needs instead of stacking
+    every brain's genome again. Assigned brains must not change afterwards;
+    mutate a copy and assign that instead.
+    """
+    __slots__ = ('arch', 'layer_sizes', 'matrices')
+
+    def __init__(self, capacity):
+        self.arch = np.full(capacity, -1, dtype=np.int16)
+        self.layer_sizes = []  # Per architecture: [input, *hidden, output]
+        self.matrices = []
+
+    @classmethod
+    def from_arrays(cls, arch, layer_sizes, matrices):
+        """A table over existing arrays (not copied), e.g. a view of shared memory."""
+        table = cls.__new__(cls)
+        table.arch = arch
+        table.layer_sizes = layer_sizes
+        table.matrices = matrices
+        return table
+
+    def grow(self, capacity):
+        arch = np.full(capacity, -1, dtype=np.int16)
+        arch[:len(self.arch)] = self.arch
+        self.arch = arch
+        for i, old in enumerate(self.matrices):
+            new = np.empty((capacity, old.shape[1]), dtype=np.float32)
+            new[:len(old)] = old
+            self.matrices[i] = new
+
+    def assign(self, row, brain):
+        """Record `brain`'s genome (or None) as the row's."""
+        if brain is None:
+            self.arch[row] = -1
+            return
+        layer_sizes = [brain.input_size] + list(brain.hidden_sizes) + [brain.output_size]
+        if layer_sizes in self.layer_sizes:
+            arch = self.layer_sizes.index(layer_sizes)
+        else:
+            arch = len(self.layer_sizes)
+            self.layer_sizes.append(layer_sizes)
+            self.matrices.append(np.empty((len(self.arch), brain.genome.size), dtype=np.float32))
+        self.matrices[arch][row] = brain.genome
+        self.arch[row] = arch
+
+    def forward(self, rows, inputs):
+        """The outputs of the brains of `rows` (which all have one), one input row each.
+
+        Rows are grouped by architecture, one `forward_genomes` call per group.
+        """
+        arch = self.arch[rows]
+        first = arch[0]
+        if (arch == first).all():
+            return forward_genomes(self.matrices[first][rows], self.layer_sizes[first], inputs)
+
+        inputs = np.asarray(inputs, dtype=np.float32)
+        outputs = None
+        for group in np.unique(arch).tolist():
+            layer_sizes = self.layer_sizes[group]
+            if outputs is None:
+                outputs = np.empty((len(rows), layer_sizes[-1]), dtype=np.float32)
+            elif layer_sizes[-1] != outputs.shape[1]:
+                raise ValueError("batched brains must share one output size")
+            members = np.flatnonzero(arch == group)
+            outputs[members] = forward_genomes(self.matrices[group][rows[members]],
+                                               layer_sizes, inputs[members])
+        return outputs
+
+
+def decide_batch(table, rows, inputs):
+    """Batched `NeuralNetwork.decide`: the argmax direction for each row's brain."""
+    return np.argmax(table.forward(rows, inputs), axis=1)
+
+
+def mother_goals_batch(table, rows, mother_hunger, mother_points, num_offspring,
+                       avg_offspring_hunger):
+    """Batched `MotherBrain.get_goals` for the mother brains of `rows`; one value per mother."""
+    num_offspring = np.asarray(num_offspring, dtype=np.float64)
+    inputs = np.empty((len(rows), 4), dtype=np.float32)
+    inputs[:, 0] = np.asarray(mother_hunger, dtype=np.float64) / MAX_HUNGER
+    inputs[:, 1] = np.minimum(np.asarray(mother_points, dtype=np.float64) / 100.0, 1.0)
+    inputs[:, 2] = np.minimum(num_offspring / 5.0, 1.0)
+    inputs[:, 3] = np.where(num_offspring > 0,
+                            np.asarray(avg_offspring_hunger, dtype=np.float64) / MAX_HUNGER, 0.0)
+    goals = table.forward(rows, inputs)
+    # Boost exploration goal to encourage spreading out
+    goals[:, 1] *= 1.3
+    return goals
@@ -0,0 +1,307 @@
+"""Full-world checkpoints: maze, food, toxins, every creature and every genome.
+
+A checkpoint is a single uncompressed `.npz`: a JSON header for the scalar
+grid state and RNG streams, plus the creature store's arrays as saved. Every
+genome is packed into one float32 array, so loading is a handful of array
+reads followed by cheap object construction; each brain copies its slice
+out, so the file's array is not kept alive by whichever brains survive.
+
+    save_checkpoint(grid, "world.npz")
+    grid = load_checkpoint("world.npz")
+
+The move mode travels with the world: a grid saved in two-phase or
+sequential, batched or per-creature mode resumes in the same mode, and one
+that planned its moves in stripe workers gets a fresh `StripePool` of the
+same size.
+
+`CheckpointWriter` takes the snapshot on the calling thread (only array
+copies) and does the file I/O on a background thread, so the tick loop is
+not held up by the disk.
+"""
+import json
+import os
+import threading
+import numpy as np
+from grid import Grid
+from creature import Creature
+from creature_store import CreatureStore, USED, ARRAYS as STORE_ARRAYS
+from brain import NeuralNetwork, MotherBrain, genome_length
+from sampler import EmptyHexSampler
+from elites import Elite
+from stripes import StripePool
+
+CHECKPOINT_FILE = "world.npz"
+CHECKPOINT_VERSION = 5
+
+_BRAIN_CLASSES = {"NeuralNetwork": NeuralNetwork, "MotherBrain": MotherBrain}
+
+
+def _pack_brains(brains, architectures):
+    """Concatenate brains' (or None) genomes into one array plus per-brain offset and architecture."""
+    arch_ids = np.full(len(brains), -1, dtype=np.int32)
+    offsets = np.zeros(len(brains) + 1, dtype=np.int64)
+    parts = []
+    total = 0
+    for i, brain in enumerate(brains):
+        if brain is not None:
+            arch = (type(brain).__name__, brain.input_size,
+                    list(brain.hidden_sizes), brain.output_size)
+            if arch not in architectures:
+                architectures.append(arch)
+            arch_ids[i] = architectures.index(arch)
+            parts.append(brain.genome)
+            total += brain.genome.size
+        offsets[i + 1] = total
+    genomes = (np.concatenate(parts) if parts
+               else np.zeros(0, dtype=np.float32))
+    return genomes, offsets, arch_ids
+
+
+def _unpack_brain(genomes, start, arch):
+    if arch is None:
+        return None
+    name, input_size, hidden_sizes, output_size = arch
+    end = start + genome_length(input_size, hidden_sizes, output_size)
+    return _BRAIN_CLASSES[name].from_genome(genomes[start:end].copy(), input_size,
+                                            hidden_sizes, output_size)
+
+
+def _architecture(architectures, arch_id):
+    return architectures[arch_id] if arch_id >= 0 else None
+
+
+def _ragged(lists, dtype=np.int32):
+    """Concatenate variable-length int lists into (values, offsets)."""
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(values) for values in lists])
+    values = np.fromiter((v for values in lists for v in values),
+                         dtype=dtype, count=int(offsets[-1]))
+    return values, offsets
+
+
+def snapshot(grid):
+    """Copy the whole world into a dict of arrays, ready for `np.savez`."""
+    store = grid.store
+    size = store.size
+    views = store.views
+
+    goals = np.zeros((size, 3), dtype=np.float32)
+    has_goals = np.zeros(size, dtype=bool)
+    for row, creature in enumerate(views):
+        if creature is not None and creature._goals is not None:
+            goals[row] = creature._goals
+            has_goals[row] = True
+
+    architectures = []
+    genomes, brain_offsets, brain_arch = _pack_brains(
+        [c.brain if c is not None else None for c in views], architectures)
+    mother_genomes, mother_brain_offsets, mother_brain_arch = _pack_brains(
+        [c.mother_brain if c is not None else None for c in views], architectures)
+    elites = list(grid.elites._elites.items())
+    elite_genomes, elite_brain_offsets, elite_brain_arch = _pack_brains(
+        [elite.brain for _, elite in elites], architectures)
+    elite_mother_genomes, elite_mother_brain_offsets, elite_mother_brain_arch = _pack_brains(
+        [elite.mother_brain for _, elite in elites], architectures)
+    offspring, offspring_offsets = _ragged(
+        [[child.id for child in c.offspring] if c is not None else [] for c in views])
+
+    header = {
+        "version": CHECKPOINT_VERSION,
+        "rows": grid.rows,
+        "cols": grid.cols,
+        "seed": grid.seed,
+        "tick_count": grid.tick_count,
+        "evolution_tick_counter": grid.evolution_tick_counter,
+        "toxin_tick_counter": grid.toxin_tick_counter,
+        "food_tick_counter": grid.food_tick_counter,
+        "next_family": grid._next_family,
+        "next_elite_key": grid.elites._next_key,
+        "two_phase": grid.two_phase,
+        "batched": grid.batched,
+        "stripe_workers": grid.stripes.workers if grid.stripes is not None else 0,
+        "architectures": architectures,
+        "rng_state": grid.rng.bit_generator.state,
+        "random_state": grid.random.getstate(),
+    }
+
+    return {
+        "header": np.array(json.dumps(header)),
+        "content": grid.flat_content.copy(),
+        "creature_ids": grid.flat_creature_ids.copy(),
+        "empty_hexes": grid._empty_hexes.members().copy(),
+        "taken_colors": np.array(sorted(grid.taken_colors), dtype=np.uint8).reshape(-1, 3),
+        "free_rows": np.array(store._free, dtype=np.int32),
+        **{name: getattr(store, name)[:size].copy() for name in STORE_ARRAYS},
+        "goals": goals,
+        "has_goals": has_goals,
+        "offspring": offspring,
+        "offspring_offsets": offspring_offsets,
+        "genomes": genomes,
+        "brain_offsets": brain_offsets,
+        "brain_arch": brain_arch,
+        "mother_genomes": mother_genomes,
+        "mother_brain_offsets": mother_brain_offsets,
+        "mother_brain_arch": mother_brain_arch,
+        "elite_keys": np.array([key for key, _ in elites], dtype=np.int64),
+        "elite_points": np.array([elite.points for _, elite in elites], dtype=np.int64),
+        "elite_genomes": elite_genomes,
+        "elite_brain_offsets": elite_brain_offsets,
+        "elite_brain_arch": elite_brain_arch,
+        "elite_mother_genomes": elite_mother_genomes,
+        "elite_mother_brain_offsets": elite_mother_brain_offsets,
+        "elite_mother_brain_arch": elite_mother_brain_arch,
+    }
+
+
+def write_snapshot(arrays, filename=CHECKPOINT_FILE):
+    """Write a `snapshot` to disk atomically, so a crash never leaves half a file."""
+    tmp = filename + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, filename)
+
+
+def save_checkpoint(grid, filename=CHECKPOINT_FILE):
+    write_snapshot(snapshot(grid), filename)
+
+
+def load_checkpoint(filename=CHECKPOINT_FILE, workers=None):
+    """Rebuild a `Grid` exactly as it was saved, RNG streams and move mode included.
+
+    `workers` overrides the saved number of stripe workers (0 for none);
+    the caller closes any `StripePool` attached here.
+    """
+    with np.load(filename) as data:
+        arrays = {key: data[key] for key in data.files}
+    header = json.loads(arrays["header"].item())
+    if header["version"] != CHECKPOINT_VERSION:
+        raise ValueError(f"unsupported checkpoint version {header['version']}")
+
+    grid = Grid(seed=header["seed"], generate=False,
+                rows=header["rows"], cols=header["cols"],
+                two_phase=header["two_phase"], batched=header["batched"])
+
+    grid.tick_count = header["tick_count"]
+    grid.evolution_tick_counter = header["evolution_tick_counter"]
+    grid.toxin_tick_counter = header["toxin_tick_counter"]
+    grid.food_tick_counter = header["food_tick_counter"]
+    grid._next_family = header["next_family"]
+    grid.rng.bit_generator.state = header["rng_state"]
+    version, state, gauss = header["random_state"]
+    grid.random.setstate((version, tuple(state), gauss))
+    grid.taken_colors = {tuple(color) for color in arrays["taken_colors"].tolist()}
+
+    grid.flat_content[:] = arrays["content"]
+    grid.flat_creature_ids[:] = arrays["creature_ids"]
+
+    # Store rows, then a view for every row that holds a creature
+    store = grid.store = CreatureStore(max(len(arrays["flags"]), 1))
+    size = store.size = len(arrays["flags"])
+    for name in STORE_ARRAYS:
+        getattr(store, name)[:size] = arrays[name]
+    store._free = arrays["free_rows"].tolist()
+    store.recount_families()
+
+    architectures = header["architectures"]
+    genomes = arrays["genomes"]
+    mother_genomes = arrays["mother_genomes"]
+    brain_offsets = arrays["brain_offsets"].tolist()
+    brain_arch = arrays["brain_arch"].tolist()
+    mother_brain_offsets = arrays["mother_brain_offsets"].tolist()
+    mother_brain_arch = arrays["mother_brain_arch"].tolist()
+    goals = arrays["goals"]
+    has_goals = arrays["has_goals"].tolist()
+
+    views = store.views = [None] * size
+    for row, flags in enumerate(arrays["flags"].tolist()):
+        if not flags & USED:
+            continue
+        creature = Creature.__new__(Creature)
+        creature.grid = grid
+        creature._store = store
+        creature.id = row
+        creature._goals = goals[row].copy() if has_goals[row] else None
+        creature.brain = _unpack_brain(
+            genomes, brain_offsets[row], _architecture(architectures, brain_arch[row]))
+        creature.mother_brain = _unpack_brain(
+            mother_genomes, mother_brain_offsets[row],
+            _architecture(architectures, mother_brain_arch[row]))
+        views[row] = creature
+
+    offspring = arrays["offspring"].tolist()
+    offspring_offsets = arrays["offspring_offsets"].tolist()
+    for row, creature in enumerate(views):
+        if creature is not None:
+            creature.offspring = [views[child] for child in
+                                  offspring[offspring_offsets[row]:offspring_offsets[row + 1]]]
+
+    # Each listed row records its index in grid.creatures
+    listed = store.listed[:size]
+    rows = np.flatnonzero(listed >= 0)
+    rows = rows[np.argsort(listed[rows])]
+    grid.creatures = [views[row] for row in rows.tolist()]
+
+    elites = grid.elites
+    for i, (key, points, brain_arch_id, mother_brain_arch_id) in enumerate(zip(
+            arrays["elite_keys"].tolist(), arrays["elite_points"].tolist(),
+            arrays["elite_brain_arch"].tolist(), arrays["elite_mother_brain_arch"].tolist())):
+        elites._insert(key, Elite(
+            points,
+            _unpack_brain(arrays["elite_genomes"], arrays["elite_brain_offsets"][i],
+                          _architecture(architectures, brain_arch_id)),
+            _unpack_brain(arrays["elite_mother_genomes"],
+                          arrays["elite_mother_brain_offsets"][i],
+                          _architecture(architectures, mother_brain_arch_id))))
+    elites._next_key = header["next_elite_key"]
+
+    # The sampler's member order decides which hex a draw picks, so restore it as saved
+    sampler = EmptyHexSampler(grid.n_hexes)
+    sampler.update(arrays["empty_hexes"])
+    grid._empty_hexes = sampler
+
+    for creature in views:
+        if creature is not None and not creature.dead:
+            grid.proximity.add(creature.pos, creature.family)
+
+    grid._all_dirty = True
+    if workers is None:
+        workers = header["stripe_workers"]
+    if workers:
+        grid.two_phase = True
+        grid.stripes = StripePool(grid, workers)
+    return grid
+
+
+class CheckpointWriter:
+    """Periodic background checkpoints for a running grid.
+
+    `maybe_save` is cheap to call every tick. When a checkpoint is due it
+    snapshots the grid on the calling thread and hands the write to a
+    background thread; a checkpoint that comes due while the previous write
+    is still in flight is skipped rather than queued.
+    """
+    __slots__ = ('filename', 'every', '_thread')
+
+    def __init__(self, filename=CHECKPOINT_FILE, every=10000):
+        self.filename = filename
+        self.every = every
+        self._thread = None
+
+    def maybe_save(self, grid):
+        if self.every and grid.tick_count % self.every == 0:
+            self.save(grid)
+
+    def save(self, grid):
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        arrays = snapshot(grid)
+        self._thread = threading.Thread(
+            target=write_snapshot, args=(arrays, self.filename), daemon=True)
+        self._thread.start()
+        return True
+
+    def wait(self):
+        """Block until the in-flight write, if any, has reached the disk."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
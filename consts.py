@@ -1,7 +1,19 @@
 W, H = 1800, 900
 HEX_SIZE = 10
+# World size in hexes; None fits the world to the W x H window. Larger worlds
+# are explored in the viewer with a pan/zoom camera.
+WORLD_ROWS = None
+WORLD_COLS = None
+# Viewer: hexes per side of a cached render chunk, and the zoom below which the
+# world is drawn as one pixel per hex instead of sprites
+CHUNK_SIZE = 32
+LOD_ZOOM = 0.5
 X_DIFF, Y_DIFF, X_OFFSET = 1.75, 1.51, 0.87
 MAX_HUNGER = 1500
+# Hunger from which a creature counts as hungry: it senses it, and other families may eat it
+HUNGER_THRESHOLD = MAX_HUNGER * 0.8
+# Recently visited positions each creature remembers, to discourage cycling
+POSITION_HISTORY_SIZE = 6
 REPRODUCTION_THRESHOLD = 250  # Hunger needed to reproduce (lowered to encourage faster reproduction)
 REPRODUCTION_COST = 5  # Hunger cost to reproduce (lowered to make reproduction easier)
 # Probability of reproduction when conditions are met
@@ -11,10 +23,30 @@ REPRODUCTION_PROBABILITY = 0.15  # Increased to encourage more offspring
 MUTATION_RATE = 0.15  # Increased mutation rate for more diversity
 MUTATION_STRENGTH = 0.4  # Increased mutation strength for exploration behavior
 
+# Decide every creature's move with one batched forward pass per tick; same
+# outcome as one at a time. Default for grids built without an explicit `batched`
+BATCHED_INFERENCE = True
+# Plan every move from one snapshot and resolve conflicts in bulk, so the outcome
+# does not depend on creature order (takes precedence over BATCHED_INFERENCE).
+# Default for grids built without an explicit `two_phase`
+TWO_PHASE_MOVES = False
+# Ticks between batched recomputations of every family's mother-brain goals
+GOAL_REFRESH_INTERVAL = 1
+
+# Frames per second the simulation publishes to the viewer process
+FRAME_RATE = 30
+
+# Time every tick phase in the UI; P writes the stats, as does quitting
+PROFILE_TICKS = False
+
 # Evolution Spawn Constants
 EVOLUTION_SPAWN_INTERVAL = 1  # Number of ticks between evolution spawn attempts
 # Probability of spawning evolved creature when interval reached
 EVOLUTION_SPAWN_PROBABILITY = 0.5
+# Families kept in the hall of fame that evolution spawns draw parents from
+ELITE_ARCHIVE_SIZE = 16
+# Elites compared per evolution spawn; the fittest becomes the parent
+TOURNAMENT_SIZE = 3
 
 # Toxin Constants
 TOXIN_DAMAGE = 100  # Hunger damage when stepping on a toxin
@@ -0,0 +1,110 @@
+"""Shared control block for the simulation, viewer and options processes.
+
+Everything lives in `multiprocessing.Value` / `Array` shared memory, so the
+simulation reads its flags with a plain memory load instead of a round trip
+to a Manager process. Writers (the viewer and options windows) change a
+parameter and then bump `version`; the simulation re-applies parameters
+only when the version moves.
+"""
+from multiprocessing import Array, Value
+import brain
+import consts
+import creature
+import grid
+import intents
+
+# Live-tunable constants: (name, step, minimum, maximum). Each is read from its
+# module's globals at call time, so rebinding the global takes effect at once.
+TUNABLES = (
+    ("MUTATION_RATE", 0.01, 0.0, 1.0),
+    ("MUTATION_STRENGTH", 0.05, 0.0, 5.0),
+    ("REPRODUCTION_PROBABILITY", 0.01, 0.0, 1.0),
+    ("REPRODUCTION_THRESHOLD", 25, 0, consts.MAX_HUNGER),
+    ("REPRODUCTION_COST", 1, 0, consts.MAX_HUNGER),
+    ("EVOLUTION_SPAWN_INTERVAL", 1, 1, 10000),
+    ("EVOLUTION_SPAWN_PROBABILITY", 0.05, 0.0, 1.0),
+    ("TOXIN_DAMAGE", 10, 0, consts.MAX_HUNGER),
+    ("TOXIN_SPAWN_INTERVAL", 1, 1, 10000),
+    ("TOXIN_SPAWN_PROBABILITY", 0.01, 0.0, 1.0),
+    ("FOOD_SPAWN_INTERVAL", 1, 1, 10000),
+    ("FOOD_SPAWN_PROBABILITY", 0.01, 0.0, 1.0),
+    ("EXPLORATION_REWARD", 1, 0, 1000),
+    ("FAMILY_PROXIMITY_PENALTY", 1, 0, 1000),
+    ("DISTANCE_FROM_MOTHER_BONUS", 1, 0, 1000),
+)
+
+# Modules that bind the tunables as globals
+_TUNABLE_MODULES = (consts, brain, creature, grid, intents)
+
+
+class ControlBlock:
+    """Run state and tunable parameters shared between processes.
+
+    Create it in the parent and pass it to each `Process`. Flags are
+    single-writer or idempotent, so they need no lock; only the step counter,
+    which both sides modify, is locked.
+    """
+    __slots__ = ('_running', '_paused', '_steps', '_version', '_params')
+
+    def __init__(self):
+        self._running = Value('b', True, lock=False)
+        self._paused = Value('b', False, lock=False)
+        self._steps = Value('i', 0)
+        self._version = Value('L', 0, lock=False)
+        self._params = Array('d', [float(getattr(consts, name)) for name, *_ in TUNABLES],
+                             lock=False)
+
+    @property
+    def running(self):
+        return bool(self._running.value)
+
+    def stop(self):
+        self._running.value = False
+
+    @property
+    def paused(self):
+        return bool(self._paused.value)
+
+    @paused.setter
+    def paused(self, value):
+        self._paused.value = bool(value)
+
+    def request_step(self, count=1):
+        """Ask a paused simulation to advance `count` ticks."""
+        with self._steps.get_lock():
+            self._steps.value += count
+
+    def take_step(self):
+        """Consume one requested step; False when none is pending."""
+        with self._steps.get_lock():
+            if self._steps.value <= 0:
+                return False
+            self._steps.value -= 1
+            return True
+
+    @property
+    def version(self):
+        return self._version.value
+
+    def get(self, index):
+        value = self._params[index]
+        return value if isinstance(TUNABLES[index][1], float) else int(value)
+
+    def set(self, index, value):
+        _, step, minimum, maximum = TUNABLES[index]
+        value = min(max(value, minimum), maximum)
+        # Keep repeated float nudges from drifting off the step grid
+        self._params[index] = round(value, 6) if isinstance(step, float) else int(value)
+        self._version.value += 1
+
+    def nudge(self, index, steps):
+        """Move a parameter by `steps` increments of its step size."""
+        self.set(index, self.get(index) + steps * TUNABLES[index][1])
+
+    def apply(self):
+        """Rebind every tunable in the simulation's modules to its shared value."""
+        for index, (name, *_) in enumerate(TUNABLES):
+            value = self.get(index)
+            for module in _TUNABLE_MODULES:
+                if name in vars(module):
+                    setattr(module, name, value)
@@ -1,60 +1,69 @@
 from hex import Content, COLORS
-from consts import (MAX_HUNGER, REPRODUCTION_THRESHOLD, REPRODUCTION_COST, REPRODUCTION_PROBABILITY, 
+from consts import (MAX_HUNGER, HUNGER_THRESHOLD, REPRODUCTION_THRESHOLD, REPRODUCTION_COST, REPRODUCTION_PROBABILITY, 
                     TOXIN_DAMAGE, EXPLORATION_REWARD, FAMILY_PROXIMITY_PENALTY, 
                     FAMILY_PROXIMITY_THRESHOLD, DISTANCE_FROM_MOTHER_BONUS)
 from brain import NeuralNetwork, MotherBrain
-import random
+from creature_store import DEAD, CAPTURED, IS_MOTHER
 import math
 
-_HUNGER_THRESHOLD = MAX_HUNGER * 0.8
 _INV_MAX_HUNGER = 1.0 / MAX_HUNGER
 
 
 class Creature:
-    __slots__ = ('grid', 'col_index', 'row_key', 'mother', 'offspring', '_shared_points',
-                 'position_history', 'history_size', 'brain', 'mother_brain', 'color',
-                 'hunger', 'dead', 'captured', 'is_mother')
-
-    def __init__(self, grid, col_index, row_key, taken_colors=None, parent_brain=None, mother=None, parent_mother_brain=None):
+    """
+    A view onto one row of the grid's `CreatureStore`, which holds the
+    creature's numeric state (position, hunger, points, family, flags, color,
+    position history). The view itself keeps only what is not a number: the
+    brains (whose genomes the store mirrors for batched inference), the
+    offspring list and the cached family goals.
+    """
+    __slots__ = ('grid', '_store', 'id', 'offspring', '_brain', '_mother_brain', '_goals')
+
+    def __init__(self, grid, pos, taken_colors=None, parent_brain=None, mother=None, parent_mother_brain=None,
+                 brain=None):
         self.grid = grid
-        self.col_index = col_index
-        self.row_key = row_key
-        self.mother = mother
-        self.offspring = []
-        self._shared_points = 0
-        self.position_history = []  # Track recent positions to prevent cycling
-        self.history_size = 6  # Track last 6 positions
-        self.hunger = 0
-        self.dead = False
-        self.captured = False
-        self.is_mother = False
-
-        if parent_brain is not None:
-            self.brain = parent_brain.copy()
-            self.brain.mutate()
+        store = self._store = grid.store
+        # Row in grid.store, which is also the id in grid.creature_ids
+        self.id = row = store.allocate(self)
+        store.pos[row] = pos  # Flat hex index, row * grid.cols + col
+        if mother is not None:
+            store.add_child(row, mother.id)
+            # Stable id of the root mother's family, for vectorized family checks
+            store.family[row] = mother.family
         else:
-            self.brain = NeuralNetwork()
+            store.family[row] = grid.new_family()
+        self.offspring = []
+        self._goals = None  # Cached mother-brain goals for this family
+
+        # Brains are finished before they are assigned: assigning copies the genome into the store
+        if brain is None:
+            if parent_brain is not None:
+                brain = parent_brain.copy()
+                brain.mutate(rng=grid.rng)
+            else:
+                brain = NeuralNetwork(rng=grid.rng)
+        self.brain = brain
 
         # Mother brain for goal-setting
         if mother is None:
             if parent_mother_brain is not None:
                 self.mother_brain = parent_mother_brain.copy()
             else:
-                self.mother_brain = MotherBrain()
+                self.mother_brain = MotherBrain(rng=grid.rng)
             self.is_mother = True
         else:
             self.mother_brain = None
-            self.is_mother = False
 
         # Generate a unique color not in taken_colors
         if taken_colors is None:
             taken_colors = set()
 
+        rand = grid.random
         max_attempts = 1000
         for _ in range(max_attempts):
-            red = random.randint(30, 255)
-            green = random.randint(30, 255)
-            blue = random.randint(30, 255)
+            red = rand.randint(30, 255)
+            green = rand.randint(30, 255)
+            blue = rand.randint(30, 255)
             color = (red, green, blue)
 
             # Check that the color isn't too dark (brightness check)
@@ -65,67 +74,169 @@ class Creature:
                 break
         else:
             # Fallback color
-            self.color = (50, random.randint(120, 255),
-                          random.randint(120, 255))
+            self.color = (50, rand.randint(120, 255),
+                          rand.randint(120, 255))
+
+    @property
+    def brain(self):
+        return self._brain
+
+    @brain.setter
+    def brain(self, value):
+        self._brain = value
+        self._store.brains.assign(self.id, value)
+
+    @property
+    def mother_brain(self):
+        return self._mother_brain
+
+    @mother_brain.setter
+    def mother_brain(self, value):
+        self._mother_brain = value
+        self._store.mother_brains.assign(self.id, value)
+
+    @property
+    def pos(self):
+        return self._store.pos.item(self.id)
+
+    @pos.setter
+    def pos(self, value):
+        self._store.pos[self.id] = value
+
+    @property
+    def mother(self):
+        store = self._store
+        mother = store.mother.item(self.id)
+        return store.views[mother] if mother >= 0 else None
+
+    @property
+    def family(self):
+        return self._store.family.item(self.id)
+
+    def _points_row(self):
+        # While the mother lives, the whole family shares her points
+        store = self._store
+        mother = store.mother.item(self.id)
+        if mother >= 0 and not store.flags.item(mother) & DEAD:
+            return mother
+        return self.id
 
     @property
     def point(self):
-        if self.mother is not None and not self.mother.dead:
-            return self.mother._shared_points
-        return self._shared_points
+        return self._store.points.item(self._points_row())
 
     @point.setter
     def point(self, value):
-        if self.mother is not None and not self.mother.dead:
-            self.mother._shared_points = value
-        else:
-            self._shared_points = value
+        self._store.points[self._points_row()] = value
+
+    @property
+    def hunger(self):
+        return self._store.hunger.item(self.id)
+
+    @hunger.setter
+    def hunger(self, value):
+        self._store.set_hunger(self.id, value)
+
+    @property
+    def dead(self):
+        return (self._store.flags.item(self.id) & DEAD) != 0
+
+    @property
+    def captured(self):
+        return (self._store.flags.item(self.id) & CAPTURED) != 0
+
+    @captured.setter
+    def captured(self, value):
+        self._set_flag(CAPTURED, value)
+
+    @property
+    def is_mother(self):
+        return (self._store.flags.item(self.id) & IS_MOTHER) != 0
+
+    @is_mother.setter
+    def is_mother(self, value):
+        self._set_flag(IS_MOTHER, value)
+
+    def _set_flag(self, flag, value):
+        flags = self._store.flags
+        current = flags.item(self.id)
+        flags[self.id] = current | flag if value else current & ~flag
+
+    @property
+    def color(self):
+        return tuple(self._store.color[self.id].tolist())
+
+    @color.setter
+    def color(self, value):
+        self._store.color[self.id] = value
+
+    @property
+    def position_history(self):
+        """Recently visited positions, oldest first."""
+        store = self._store
+        history = store.history[self.id].tolist()
+        head = store.history_head.item(self.id)
+        return [pos for pos in history[head:] + history[:head] if pos >= 0]
+
+    def add_offspring(self, child):
+        self._store.sibling[child.id] = len(self.offspring)
+        self.offspring.append(child)
+
+    def remove_offspring(self, child):
+        """Drop `child` in O(1) by moving the last offspring into its place."""
+        offspring = self.offspring
+        sibling = self._store.sibling
+        index = sibling.item(child.id)
+        last = offspring.pop()
+        if last is not child:
+            offspring[index] = last
+            sibling[last.id] = index
+        sibling[child.id] = -1
 
     def get_mother_goals(self):
+        """The family's goal vector, normally refreshed for all mothers at once by the grid."""
         mother = self.mother
         if mother is not None and not mother.dead and mother.mother_brain is not None:
-            offspring = mother.offspring
-            total_hunger = 0
-            alive_count = 0
-            for o in offspring:
-                if not o.dead:
-                    total_hunger += o.hunger
-                    alive_count += 1
-            avg_hunger = total_hunger / max(1, alive_count)
-            return mother.mother_brain.get_goals(
-                mother.hunger,
-                mother.point,
-                alive_count,
-                avg_hunger
-            )
+            return mother.family_goals()
         return None
 
+    def family_goals(self):
+        """This mother's goal vector for her family, computed now if the grid has not cached it."""
+        goals = self._goals
+        if goals is None:
+            store = self._store
+            count = store.kids.item(self.id)
+            goals = self.mother_brain.get_goals(
+                self.hunger,
+                self.point,
+                count,
+                store.kids_hunger.item(self.id) / max(1, count)
+            )
+            self._goals = goals
+        return goals
+
+    # A family is everyone descended from one root mother, so comparing family
+    # ids is the same as comparing root mothers
     def is_eatable_creature(self, other_creature):
         if other_creature is None or other_creature.dead:
             return False
-        my_mother = self.mother if self.mother is not None else self
-        other_mother = other_creature.mother if other_creature.mother is not None else other_creature
-        if my_mother == other_mother:
+        if self.family == other_creature.family:
             return False
-        return other_creature.hunger >= _HUNGER_THRESHOLD
+        return other_creature.hunger >= HUNGER_THRESHOLD
 
     def is_dangerous_creature(self, other_creature):
         """Check if another creature can capture/eat us."""
         if other_creature is None or other_creature.dead:
             return False
-        my_mother = self.mother if self.mother is not None else self
-        other_mother = other_creature.mother if other_creature.mother is not None else other_creature
-        if my_mother == other_mother:
+        if self.family == other_creature.family:
             return False
         # We're in danger if we're very hungry and from a different family
-        return self.hunger >= _HUNGER_THRESHOLD
+        return self.hunger >= HUNGER_THRESHOLD
 
     def is_enemy_creature(self, other_creature):
         if other_creature is None or other_creature.dead:
             return False
-        my_mother = self.mother if self.mother is not None else self
-        other_mother = other_creature.mother if other_creature.mother is not None else other_creature
-        return my_mother != other_mother
+        return self.family != other_creature.family
 
     def capture_food(self, dead=False, fats=50, eaten_creature=None):
         if dead:
@@ -143,185 +254,138 @@ class Creature:
             fats = fats - mother_share
         self.point += fats
 
-    def get_current_hex(self):
-        if self.row_key in self.grid.hexs:
-            row = self.grid.hexs[self.row_key]
-            if 0 <= self.col_index < len(row):
-                return row[self.col_index]
-        return None
-
-    def can_move_to(self, col_index, row_key):
-        if row_key not in self.grid.hexs:
-            return False
-
-        row = self.grid.hexs[row_key]
-        if col_index < 0 or col_index >= len(row):
-            return False
-
-        hex = row[col_index]
-        if hex.content == Content.WALL:
+    def can_move_to(self, pos):
+        grid = self.grid
+        content = grid.flat_content.item(pos)
+        if content == Content.WALL:
             return False
         # Can move to: empty, food, toxins, dead creatures, or eatable living creatures
-        if hex.content == Content.EMPTY or hex.content == Content.FOOD or hex.content == Content.TOXIN:
+        if content == Content.EMPTY or content == Content.FOOD or content == Content.TOXIN:
             return True
-        if hex.content == Content.CREATURE and hex.creature:
-            if hex.creature.dead and not hex.creature.captured:
-                return True  # Can move to dead uncaptured creatures
-            if self.is_eatable_creature(hex.creature):
-                return True  # Can move to eatable living creatures
+        if content == Content.CREATURE:
+            return self._can_enter(grid.flat_creature_ids.item(pos))
         return False
 
+    def _can_enter(self, occupant):
+        """Whether the hex of creature row `occupant` is food: a dead uncaptured
+        creature, or an eatable living one."""
+        store = self._store
+        state = store.flags.item(occupant)
+        if state & DEAD:
+            return not state & CAPTURED
+        return (store.family.item(occupant) != store.family.item(self.id) and
+                store.hunger.item(occupant) >= HUNGER_THRESHOLD)
+
+    def sense(self):
+        """Return the 33-value input vector for the brain and the mother's goals."""
+        inputs = self._get_sensory_inputs()
+
+        goals = self.get_mother_goals()
+        if goals is not None:
+            inputs.append(float(goals[0]))
+            inputs.append(float(goals[1]))
+            inputs.append(float(goals[2]))
+        else:
+            inputs.append(0.0)
+            inputs.append(0.0)
+            inputs.append(0.0)
+        return inputs, goals
+
     def think(self):
         mother = self.mother
         if mother is not None and mother.dead:
-            self.dead = True
+            self.die()
             return
 
         if not self.dead:
-            inputs = self._get_sensory_inputs()
+            inputs, goals = self.sense()
+            self.act(self.brain.decide(inputs), goals)
 
-            goals = self.get_mother_goals()
-            if goals is not None:
-                inputs.append(float(goals[0]))
-                inputs.append(float(goals[1]))
-                inputs.append(float(goals[2]))
-            else:
-                inputs.append(0.0)
-                inputs.append(0.0)
-                inputs.append(0.0)
+    def act(self, preferred_dir, goals):
+        """Carry out the brain's preferred direction, applying rewards and penalties."""
+        valid_moves = self._get_valid_moves()
 
-            preferred_dir = self.brain.decide(inputs)
-            valid_moves = self._get_valid_moves()
+        if not valid_moves:
+            # No valid moves, stay in place
+            self.move()
+            return
 
-            if not valid_moves:
-                # No valid moves, stay in place
-                self.move(0, 0)
-                return
+        # Direction 6 means stay
+        # punish for trying to stay too often
+        if preferred_dir == 6:
+            self.point = max(0, self.point - 8)
+            self.hunger = min(MAX_HUNGER, self.hunger + 8)
+            self.move()
+            return
 
-            # Direction 6 means stay
-            # punish for trying to stay too often
-            if preferred_dir == 6:
-                self.point = max(0, self.point - 8)
-                self.hunger = min(MAX_HUNGER, self.hunger + 8)
-                self.move(0, 0)
+        # Apply mother's goal influence for food priority and exploration
+        food_bonus = 0
+        exploration_bonus = 0
+        if goals is not None:
+            food_priority = (goals[0] + 1) / 2  # Normalize to 0-1
+            exploration_priority = (goals[1] + 1) / 2
+            food_bonus = int(food_priority * 5)
+            exploration_bonus = int(exploration_priority * EXPLORATION_REWARD)
+
+        # Try to find the preferred direction in valid moves
+        for dir_idx, new_pos, has_food, has_enemy in valid_moves:
+            if dir_idx == preferred_dir:
+                # Check if this move would revisit a recent position
+                history = self.position_history
+                if new_pos in history:
+                    self.point = max(0, self.point - 15)
+                    self.hunger = min(MAX_HUNGER, self.hunger + 5)
+                    break
+
+                # Penalize for moving towards enemy creatures (different mother)
+                if has_enemy:
+                    self.point = max(0, self.point - 8)
+                    self.hunger = min(MAX_HUNGER, self.hunger + 2)
+
+                # Check family proximity and penalize clustering
+                family_nearby = self._count_family_nearby(new_pos)
+                if family_nearby > 2:
+                    self.point = max(0, self.point - FAMILY_PROXIMITY_PENALTY)
+                    self.hunger = min(MAX_HUNGER, self.hunger + 3)
+                
+                if new_pos not in history:
+                    self.point += exploration_bonus
+                
+                if self.mother is not None and not self.mother.dead:
+                    distance = self._calculate_distance(new_pos, self.mother.pos)
+                    if distance > 5:
+                        self.point += DISTANCE_FROM_MOTHER_BONUS
+
+                # Reward for moving towards food
+                self.point += (2 + food_bonus) if has_food else 0
+                self.move(new_pos)
                 return
 
-            # Apply mother's goal influence for food priority and exploration
-            food_bonus = 0
-            exploration_bonus = 0
-            if goals is not None:
-                food_priority = (goals[0] + 1) / 2  # Normalize to 0-1
-                exploration_priority = (goals[1] + 1) / 2
-                food_bonus = int(food_priority * 5)
-                exploration_bonus = int(exploration_priority * EXPLORATION_REWARD)
-
-            # Try to find the preferred direction in valid moves
-            for dir_idx, col_d, row_d, has_food, has_enemy in valid_moves:
-                if dir_idx == preferred_dir:
-                    # Check if this move would revisit a recent position
-                    new_col = self.col_index + col_d
-                    new_row_key = self.row_key
-                    if row_d != 0:
-                        rows = self.grid.get_row_keys()
-                        current_row_idx = self.grid.get_row_index(
-                            self.row_key)  # O(1)
-                        if current_row_idx >= 0:
-                            new_row_idx = current_row_idx + row_d
-                            if 0 <= new_row_idx < len(rows):
-                                new_row_key = rows[new_row_idx]
-                            pass
-                    new_pos = (new_col, new_row_key)
-                    if new_pos in self.position_history:
-                        self.point = max(0, self.point - 15)
-                        self.hunger = min(MAX_HUNGER, self.hunger + 5)
-                        break
-
-                    # Penalize for moving towards enemy creatures (different mother)
-                    if has_enemy:
-                        self.point = max(0, self.point - 8)
-                        self.hunger = min(MAX_HUNGER, self.hunger + 2)
-
-                    # Check family proximity and penalize clustering
-                    family_nearby = self._count_family_nearby(new_col, new_row_key)
-                    if family_nearby > 2:
-                        self.point = max(0, self.point - FAMILY_PROXIMITY_PENALTY)
-                        self.hunger = min(MAX_HUNGER, self.hunger + 3)
-                    
-                    if new_pos not in self.position_history:
-                        self.point += exploration_bonus
-                    
-                    if self.mother is not None and not self.mother.dead:
-                        distance = self._calculate_distance(new_col, new_row_key, 
-                                                           self.mother.col_index, self.mother.row_key)
-                        if distance > 5:
-                            self.point += DISTANCE_FROM_MOTHER_BONUS
-
-                    # Reward for moving towards food
-                    self.point += (2 + food_bonus) if has_food else 0
-                    self.move(col_d, row_d)
-                    return
-
-            # Preferred direction is blocked- punish
-            self.point = max(0, self.point - 8)
-            self.hunger = min(MAX_HUNGER, self.hunger + 8)
-            self.move(0, 0)  # Stay in place (also causes hunger)
+        # Preferred direction is blocked- punish
+        self.point = max(0, self.point - 8)
+        self.hunger = min(MAX_HUNGER, self.hunger + 8)
+        self.move()  # Stay in place (also causes hunger)
 
     def _get_valid_moves(self):
+        grid = self.grid
+        neighbors = grid.neighbors[self.pos]
+        contents = grid.flat_content[neighbors].tolist()
+        occupants = grid.flat_creature_ids[neighbors].tolist()
+        can_enter = self._can_enter
+
+        # Directions follow the neighbor table: left, right, up-left,
+        # up-right, down-left, down-right. Off-grid neighbors read as walls.
+        # The only creatures a move can enter are food, and an enemy that is
+        # not food blocks the move, so a valid move never has an enemy.
         valid_moves = []
-        rows = self.grid.get_row_keys()
-
-        current_row_idx = self.grid.get_row_index(self.row_key)
-        if current_row_idx < 0:
-            return valid_moves
-
-        is_even_row = current_row_idx % 2 == 0
-
-        # Define all 6 hex directions: (direction_index, col_delta, row_delta)
-        # Horizontal directions
-        directions = [
-            (0, -1, 0),   # Left
-            (1, 1, 0),    # Right
-        ]
-
-        # Add diagonal directions based on row parity
-        if current_row_idx > 0:
-            if is_even_row:
-                directions.append((2, -1, -1))  # Up-left
-                directions.append((3, 0, -1))   # Up-right
-            else:
-                directions.append((2, 0, -1))   # Up-left
-                directions.append((3, 1, -1))   # Up-right
-
-        if current_row_idx < len(rows) - 1:
-            if is_even_row:
-                directions.append((4, -1, 1))   # Down-left
-                directions.append((5, 0, 1))    # Down-right
-            else:
-                directions.append((4, 0, 1))    # Down-left
-                directions.append((5, 1, 1))    # Down-right
-
-        for dir_idx, col_d, row_d in directions:
-            new_col = self.col_index + col_d
-            new_row_key = self.row_key
-
-            if row_d != 0:
-                new_row_index = current_row_idx + row_d
-                if 0 <= new_row_index < len(rows):
-                    new_row_key = rows[new_row_index]
-                else:
-                    continue
-
-            if self.can_move_to(new_col, new_row_key):
-                content, creature = self._get_hex_content(new_col, new_row_key)
-                has_food = (content == Content.FOOD or
-                            (content == Content.CREATURE and creature and creature.dead and not creature.captured) or
-                            (content == Content.CREATURE and creature and self.is_eatable_creature(creature)))
-                # Check if there's an enemy creature nearby in this direction
-                has_enemy = (content == Content.CREATURE and creature and
-                             not creature.dead and self.is_enemy_creature(creature) and
-                             not self.is_eatable_creature(creature))
-                valid_moves.append(
-                    (dir_idx, col_d, row_d, has_food, has_enemy))
+        for dir_idx, (new_pos, content, occupant) in enumerate(
+                zip(neighbors.tolist(), contents, occupants)):
+            if content == Content.FOOD:
+                valid_moves.append((dir_idx, new_pos, True, False))
+            elif content == Content.EMPTY or content == Content.TOXIN:
+                valid_moves.append((dir_idx, new_pos, False, False))
+            elif content == Content.CREATURE and can_enter(occupant):
+                valid_moves.append((dir_idx, new_pos, True, False))
 
         return valid_moves
 
@@ -390,185 +454,91 @@ class Creature:
         return inputs
 
     def _get_neighbor_contents(self):
-        neighbors = []
-        rows = self.grid.get_row_keys()
-
-        current_row_idx = self.grid.get_row_index(self.row_key)
-        if current_row_idx < 0:
-            return [(Content.WALL, None)] * 6
-
-        is_even_row = current_row_idx % 2 == 0
-
-        # Left
-        neighbors.append(self._get_hex_content(
-            self.col_index - 1, self.row_key))
-
-        # Right
-        neighbors.append(self._get_hex_content(
-            self.col_index + 1, self.row_key))
-
-        # Previous row (up-left, up-right)
-        if current_row_idx > 0:
-            prev_y = rows[current_row_idx - 1]
-            if is_even_row:
-                neighbors.append(self._get_hex_content(
-                    self.col_index - 1, prev_y))
-                neighbors.append(self._get_hex_content(self.col_index, prev_y))
-            else:
-                neighbors.append(self._get_hex_content(self.col_index, prev_y))
-                neighbors.append(self._get_hex_content(
-                    self.col_index + 1, prev_y))
-        else:
-            neighbors.extend([(Content.WALL, None), (Content.WALL, None)])
-
-        # Next row (down-left, down-right)
-        if current_row_idx < len(rows) - 1:
-            next_y = rows[current_row_idx + 1]
-            if is_even_row:
-                neighbors.append(self._get_hex_content(
-                    self.col_index - 1, next_y))
-                neighbors.append(self._get_hex_content(self.col_index, next_y))
-            else:
-                neighbors.append(self._get_hex_content(self.col_index, next_y))
-                neighbors.append(self._get_hex_content(
-                    self.col_index + 1, next_y))
-        else:
-            neighbors.extend([(Content.WALL, None), (Content.WALL, None)])
-
-        return neighbors
-
-    def _get_hex_content(self, col_index, row_key):
-        if row_key not in self.grid.hexs:
-            return (Content.WALL, None)
-
-        row = self.grid.hexs[row_key]
-        if col_index < 0 or col_index >= len(row):
-            return (Content.WALL, None)
-
-        hex = row[col_index]
-        return (hex.content, hex.creature)
-
-    def move(self, col_delta=0, row_delta=0):
-        current_hex = self.get_current_hex()
-        if current_hex:
-            current_hex.content = Content.EMPTY
-            current_hex.creature = None
-            self.grid.update_empty_hex_tracking(
-                self.col_index, self.row_key, True)
-        new_col = self.col_index + col_delta
-        if row_delta != 0:
-            rows = self.grid.get_row_keys()
-            current_row_index = self.grid.get_row_index(
-                self.row_key)
-            if current_row_index >= 0:
-                new_row_index = current_row_index + row_delta
-                if 0 <= new_row_index < len(rows):
-                    new_row_key = rows[new_row_index]
-                else:
-                    new_row_key = self.row_key
-            else:
-                new_row_key = self.row_key
-        else:
-            new_row_key = self.row_key
-
-        if self.can_move_to(new_col, new_row_key):
-            self.col_index = new_col
-            self.row_key = new_row_key
-
-            current_pos = (self.col_index, self.row_key)
-            if current_pos in self.position_history:
-                self.position_history.remove(current_pos)
-            self.position_history.append(current_pos)
-            if len(self.position_history) > self.history_size:
-                self.position_history.pop(0)
-
-        new_hex = self.get_current_hex()
-        if new_hex:
-            if new_hex.content == Content.TOXIN:
-                self.hunger = min(MAX_HUNGER, self.hunger + TOXIN_DAMAGE)
-                new_hex.content = Content.EMPTY
-                self.grid.update_empty_hex_tracking(
-                    self.col_index, self.row_key, True)
-
-            dead = (new_hex.content ==
-                    Content.CREATURE and new_hex.creature and new_hex.creature.dead and not new_hex.creature.captured)
-            eatable_living = (new_hex.content == Content.CREATURE and new_hex.creature and
-                              not new_hex.creature.dead and self.is_eatable_creature(new_hex.creature))
-            if new_hex.content == Content.FOOD or dead or eatable_living:
-                # how faty was the creature
-                fats = 0
-                eaten_creature = None
-                if dead:
-                    fats = new_hex.creature.point // 10
-                    new_hex.creature.captured = True
-                    eaten_creature = new_hex.creature
-                elif eatable_living:
-                    # Eating a living hungry creature from another mother
-                    fats = new_hex.creature.point // 10
-                    eaten_creature = new_hex.creature
-                    new_hex.creature.dead = True
-                    new_hex.creature.captured = True
-                self.capture_food(dead or eatable_living, fats, eaten_creature)
-            new_hex.content = Content.CREATURE
-            new_hex.creature = self
-            self.grid.update_empty_hex_tracking(
-                self.col_index, self.row_key, False)
-        self.hunger = min(MAX_HUNGER, self.hunger + 1)
-        self.point = max(0, self.point - 1)
-        if self.hunger >= MAX_HUNGER:
-            self.dead = True
-
-    def _count_family_nearby(self, col, row_key, radius=FAMILY_PROXIMITY_THRESHOLD):
-        count = 0
-        rows = self.grid.get_row_keys()
-        current_row_idx = self.grid.get_row_index(row_key)
-        
-        if current_row_idx < 0:
-            return 0
-        
-        my_mother = self.mother if self.mother is not None else self
-        
-        for row_offset in range(-radius, radius + 1):
-            row_idx = current_row_idx + row_offset
-            if row_idx < 0 or row_idx >= len(rows):
-                continue
-            check_row_key = rows[row_idx]
-            if check_row_key not in self.grid.hexs:
-                continue
-            
-            row = self.grid.hexs[check_row_key]
-            for col_offset in range(-radius, radius + 1):
-                check_col = col + col_offset
-                if check_col < 0 or check_col >= len(row):
-                    continue
-                
-                hex_obj = row[check_col]
-                if hex_obj.content == Content.CREATURE and hex_obj.creature:
-                    other = hex_obj.creature
-                    if not other.dead:
-                        other_mother = other.mother if other.mother is not None else other
-                        if my_mother == other_mother and other != self:
-                            count += 1
-        
-        return count
-    
-    def _calculate_distance(self, col1, row1, col2, row2):
-        row1_idx = self.grid.get_row_index(row1)
-        row2_idx = self.grid.get_row_index(row2)
-        
-        if row1_idx < 0 or row2_idx < 0:
-            return 0
-        
-        row_dist = abs(row2_idx - row1_idx)
+        # Off-grid neighbors point at the padding cell, which reads as a wall
+        grid = self.grid
+        neighbors = grid.neighbors[self.pos]
+        contents = grid.flat_content[neighbors].tolist()
+        creature_ids = grid.flat_creature_ids[neighbors].tolist()
+        slots = grid.store.views
+        return [(content, slots[creature_id] if creature_id >= 0 else None)
+                for content, creature_id in zip(contents, creature_ids)]
+
+    def move(self, new_pos=None):
+        """Move to the neighboring hex `new_pos`, or stay put when it is None.
+
+        The per-tick hunger and point decay, and starving to death, are
+        applied to everyone at once by `Grid.age_creatures` after all moves.
+        """
+        grid = self.grid
+        pos = self.pos
+        grid.set_hex(pos, Content.EMPTY)
+
+        if new_pos is None:
+            # Staying re-enters the hex just vacated, so it is recorded like a
+            # move; this is how the spawn hex gets into the history
+            self._store.remember(self.id, pos)
+        elif new_pos != grid.off_grid and self.can_move_to(new_pos):
+            pos = self.pos = new_pos
+            self._store.remember(self.id, new_pos)
+
+        content = grid.flat_content.item(pos)
+        if content == Content.TOXIN:
+            self.hunger = min(MAX_HUNGER, self.hunger + TOXIN_DAMAGE)
+            content = Content.EMPTY
+            grid.set_hex(pos, Content.EMPTY)
+
+        other = grid.get_creature(pos) if content == Content.CREATURE else None
+        dead = (other is not None and other.dead and not other.captured)
+        eatable_living = (other is not None and
+                          not other.dead and self.is_eatable_creature(other))
+        if content == Content.FOOD or dead or eatable_living:
+            # how faty was the creature
+            fats = 0
+            eaten_creature = None
+            if dead:
+                fats = other.point // 10
+                other.mark_captured()
+                eaten_creature = other
+            elif eatable_living:
+                # Eating a living hungry creature from another mother
+                fats = other.point // 10
+                eaten_creature = other
+                other.die()
+                other.mark_captured()
+            self.capture_food(dead or eatable_living, fats, eaten_creature)
+        grid.set_hex(pos, Content.CREATURE, self)
+
+    def die(self):
+        if self.dead:
+            return  # Corpses may already have been eaten and their hex reused
+        self._store.mark_dead(self.id)
+        grid = self.grid
+        grid.proximity.discard(self.pos)
+        grid.mark_hex_dirty(self.pos)
+        grid._deaths.append(self)
+
+    def mark_captured(self):
+        """Flag the (dead) creature as eaten and queue its removal from the grid."""
+        self.captured = True
+        self.grid._captures.append(self)
+
+    def _count_family_nearby(self, pos, radius=FAMILY_PROXIMITY_THRESHOLD):
+        return self.grid.proximity.count_family(pos, self.family, radius, exclude=self.pos)
+
+    def _calculate_distance(self, pos1, pos2):
+        cols = self.grid.cols
+        row1, col1 = divmod(pos1, cols)
+        row2, col2 = divmod(pos2, cols)
+        row_dist = abs(row2 - row1)
         col_dist = abs(col2 - col1)
         return max(row_dist, col_dist)
 
     def can_reproduce(self):
         if not self.dead:
-            prop = random.uniform(0, 1)
+            prop = self.grid.random.uniform(0, 1)
             if prop > REPRODUCTION_PROBABILITY:
                 return False
-            family_nearby = self._count_family_nearby(self.col_index, self.row_key, 2)
+            family_nearby = self._count_family_nearby(self.pos, 2)
             if family_nearby > 3:
                 return False
             return self.hunger <= REPRODUCTION_THRESHOLD
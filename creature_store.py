@@ -0,0 +1,196 @@
+import numpy as np
+from consts import MAX_HUNGER, POSITION_HISTORY_SIZE
+from brain import GenomeTable
+
+# Bits of CreatureStore.flags
+USED = 1  # Row holds a creature (free rows are 0)
+DEAD = 2
+CAPTURED = 4
+IS_MOTHER = 8
+
+# Per-row arrays, in the order checkpoints save them
+ARRAYS = ('pos', 'hunger', 'points', 'family', 'mother', 'flags', 'color',
+          'history', 'history_head', 'listed', 'sibling')
+
+# Per-row arrays derived from the others, rebuilt by `recount_families` instead of saved
+_DERIVED = ('kids', 'kids_hunger')
+
+
+class CreatureStore:
+    """
+    Structure-of-arrays storage for every creature's numeric state.
+
+    Each creature owns one row, which doubles as its id in the grid's
+    `creature_ids`. `Creature` objects are thin views onto their row that also
+    hold the parts that are not numbers (brains, offspring, cached goals);
+    `views` maps each row back to its view. Released rows go on a free-list
+    and are handed out again before the arrays grow.
+
+    Per row: flat position, hunger, points, family id, the mother's row (-1
+    for none), flag bits, color, and a ring of the last POSITION_HISTORY_SIZE
+    positions visited (-1 for unused entries) with its write head. `listed`
+    and `sibling` are the creature's index in `Grid.creatures` and in its
+    mother's offspring list (-1 for neither), so both lists can drop a member
+    in O(1) by moving their last entry into its place. `kids` and
+    `kids_hunger` are the number of living creatures whose mother is the row
+    and their total hunger, kept up to date by every write that changes them
+    (`add_child`, `mark_dead`, `set_hunger`, `set_hunger_many`).
+
+    `brains` and `mother_brains` hold a row-aligned copy of each creature's
+    brain genomes, for batched inference; `Creature` writes them whenever a
+    brain is assigned.
+    """
+    __slots__ = ('size', 'pos', 'hunger', 'points', 'family', 'mother', 'flags',
+                 'color', 'history', 'history_head', 'listed', 'sibling', 'kids', 'kids_hunger', 'brains', 'mother_brains',
+                 'views', '_free')
+
+    def __init__(self, capacity=256):
+        self.size = 0  # Rows ever handed out; rows >= size are untouched
+        self.pos = np.zeros(capacity, dtype=np.int32)
+        self.hunger = np.zeros(capacity, dtype=np.int64)
+        self.points = np.zeros(capacity, dtype=np.int64)
+        self.family = np.zeros(capacity, dtype=np.int64)
+        self.mother = np.full(capacity, -1, dtype=np.int32)
+        self.flags = np.zeros(capacity, dtype=np.uint8)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.history = np.full((capacity, POSITION_HISTORY_SIZE), -1, dtype=np.int32)
+        self.history_head = np.zeros(capacity, dtype=np.int8)
+        self.listed = np.full(capacity, -1, dtype=np.int32)
+        self.sibling = np.full(capacity, -1, dtype=np.int32)
+        self.kids = np.zeros(capacity, dtype=np.int64)
+        self.kids_hunger = np.zeros(capacity, dtype=np.int64)
+        self.brains = GenomeTable(capacity)
+        self.mother_brains = GenomeTable(capacity)
+        self.views = []
+        self._free = []
+
+    @property
+    def capacity(self):
+        return self.flags.shape[0]
+
+    def _grow(self):
+        capacity = 2 * self.capacity
+        for name in ARRAYS + _DERIVED:
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self.brains.grow(capacity)
+        self.mother_brains.grow(capacity)
+
+    def allocate(self, view):
+        """Claim a row for `view`, reset to a fresh creature, and return it."""
+        if self._free:
+            row = self._free.pop()
+            self.views[row] = view
+        else:
+            row = self.size
+            if row == self.capacity:
+                self._grow()
+            self.size += 1
+            self.views.append(view)
+        self.hunger[row] = 0
+        self.points[row] = 0
+        self.mother[row] = -1
+        self.flags[row] = USED
+        self.history[row] = -1
+        self.history_head[row] = 0
+        self.listed[row] = -1
+        self.sibling[row] = -1
+        self.kids[row] = 0
+        self.kids_hunger[row] = 0
+        self.brains.arch[row] = -1
+        self.mother_brains.arch[row] = -1
+        return row
+
+    def add_child(self, row, mother):
+        """Make the (living) creature in `row` a child of the row `mother`."""
+        self.mother[row] = mother
+        self.kids[mother] += 1
+        self.kids_hunger[mother] += self.hunger[row]
+
+    def mark_dead(self, row):
+        self.flags[row] |= DEAD
+        mother = self.mother.item(row)
+        if mother >= 0:
+            self.kids[mother] -= 1
+            self.kids_hunger[mother] -= self.hunger[row]
+
+    def set_hunger(self, row, value):
+        mother = self.mother.item(row)
+        if mother >= 0 and not self.flags.item(row) & DEAD:
+            self.kids_hunger[mother] += value - self.hunger.item(row)
+        self.hunger[row] = value
+
+    def set_hunger_many(self, rows, values):
+        """`set_hunger` for several distinct rows at once."""
+        mother = self.mother[rows]
+        counted = (mother >= 0) & ((self.flags[rows] & DEAD) == 0)
+        np.add.at(self.kids_hunger, mother[counted], (values - self.hunger[rows])[counted])
+        self.hunger[rows] = values
+
+    def recount_families(self):
+        """Rebuild `kids` and `kids_hunger` from scratch, e.g. after loading the other arrays."""
+        alive = self.alive_rows()
+        mother = self.mother[alive]
+        children = mother >= 0
+        capacity = self.capacity
+        self.kids[:] = np.bincount(mother[children], minlength=capacity)
+        self.kids_hunger[:] = np.bincount(mother[children], weights=self.hunger[alive][children],
+                                          minlength=capacity)
+
+    def release(self, row):
+        self.flags[row] = 0
+        self.views[row] = None
+        self._free.append(row)
+
+    def alive_rows(self):
+        """Rows of every living creature, ascending."""
+        return np.flatnonzero((self.flags[:self.size] & (USED | DEAD)) == USED)
+
+    def point_owners(self, rows):
+        """Row whose points each creature in `rows` uses: its mother's while she lives."""
+        mother = self.mother[rows]
+        pooled = (mother >= 0) & ((self.flags[mother] & DEAD) == 0)
+        return np.where(pooled, mother, rows)
+
+    def age(self):
+        """Advance every living creature by one tick of hunger and point decay.
+
+        Hunger rises by one, capped at MAX_HUNGER, and each creature costs its
+        point owner one point, floored at zero. Returns the rows that are now
+        starving and must die; they are not marked here.
+        """
+        alive = self.alive_rows()
+        if alive.size == 0:
+            return alive
+        hunger = self.hunger
+        self.set_hunger_many(alive, np.minimum(hunger[alive] + 1, MAX_HUNGER))
+
+        # Families pool their points in the mother's row, so several decrements
+        # can land on one row; clamping once after is the same as per step
+        owners, counts = np.unique(self.point_owners(alive), return_counts=True)
+        self.points[owners] = np.maximum(self.points[owners] - counts, 0)
+        return alive[hunger[alive] >= MAX_HUNGER]
+
+    def family_stats(self, mothers):
+        """(living offspring count, their total hunger) for each row in `mothers`."""
+        return self.kids[mothers], self.kids_hunger[mothers]
+
+    def remember_many(self, rows, positions):
+        """`remember` for several distinct rows at once."""
+        history = self.history
+        new = ~(history[rows] == positions[:, None]).any(axis=1)
+        rows = rows[new]
+        head = self.history_head[rows].astype(np.intp)
+        history[rows, head] = positions[new]
+        self.history_head[rows] = (head + 1) % POSITION_HISTORY_SIZE
+
+    def remember(self, row, pos):
+        """Add `pos` to the row's history ring unless it is already there."""
+        history = self.history[row]
+        if pos in history.tolist():
+            return
+        head = self.history_head.item(row)
+        history[head] = pos
+        self.history_head[row] = (head + 1) % POSITION_HISTORY_SIZE
@@ -0,0 +1,109 @@
+import heapq
+
+
+class Elite:
+    """A detached genome snapshot: copies of a mother's brains and her best score."""
+    __slots__ = ('points', 'brain', 'mother_brain')
+
+    def __init__(self, points, brain, mother_brain):
+        self.points = points
+        self.brain = brain
+        self.mother_brain = mother_brain
+
+
+class EliteArchive:
+    """
+    Bounded hall of fame of the best families seen so far.
+
+    Holds at most `capacity` elites, one per family, each scored by the
+    highest points its mother ever reached. Entries keep copied brains, never
+    the creature, so an archived family does not pin its members or the grid.
+
+    `_heap` is a min-heap of (points, key) with lazy invalidation: raising an
+    elite's score pushes a fresh item and leaves the old one to be skipped
+    when it reaches the top, so the weakest elite is found in amortized
+    O(log n).
+    """
+    __slots__ = ('capacity', '_elites', '_heap', '_next_key')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._elites = {}  # family (or synthetic key for loaded genomes) -> Elite
+        self._heap = []
+        self._next_key = -1  # Loaded genomes get negative keys, families are >= 0
+
+    def __len__(self):
+        return len(self._elites)
+
+    def ranked(self):
+        """All elites, best first."""
+        return sorted(self._elites.values(), key=lambda elite: elite.points, reverse=True)
+
+    def best(self):
+        if not self._elites:
+            return None
+        return max(self._elites.values(), key=lambda elite: elite.points)
+
+    def offer(self, mother):
+        """Record a mother's current points, archiving her family if it makes the cut."""
+        points = mother.point
+        key = mother.family
+        elite = self._elites.get(key)
+        if elite is not None:
+            if points > elite.points:
+                elite.points = points
+                self._push(points, key)
+            return
+        if len(self._elites) >= self.capacity:
+            if points <= self._weakest().points:
+                return
+            self._evict_weakest()
+        self._insert(key, Elite(points, mother.brain.copy(),
+                                mother.mother_brain.copy() if mother.mother_brain is not None else None))
+
+    def add(self, points, brain, mother_brain):
+        """Archive a genome that belongs to no living family (e.g. loaded from disk)."""
+        if len(self._elites) >= self.capacity:
+            if points <= self._weakest().points:
+                return
+            self._evict_weakest()
+        key = self._next_key
+        self._next_key -= 1
+        self._insert(key, Elite(points, brain, mother_brain))
+
+    def tournament(self, rng, size):
+        """The fittest of `size` elites drawn at random, or None if the archive is empty."""
+        if not self._elites:
+            return None
+        contestants = rng.sample(list(self._elites.values()), min(size, len(self._elites)))
+        return max(contestants, key=lambda elite: elite.points)
+
+    def _insert(self, key, elite):
+        self._elites[key] = elite
+        self._push(elite.points, key)
+
+    def _push(self, points, key):
+        heap = self._heap
+        heapq.heappush(heap, (points, key))
+        # Stale items pile up while scores climb; rebuild once they dominate
+        if len(heap) > 4 * self.capacity + 64:
+            self._heap = [(elite.points, key) for key, elite in self._elites.items()]
+            heapq.heapify(self._heap)
+
+    def _weakest_key(self):
+        heap = self._heap
+        elites = self._elites
+        while True:
+            points, key = heap[0]
+            elite = elites.get(key)
+            if elite is not None and elite.points == points:
+                return key
+            heapq.heappop(heap)
+
+    def _weakest(self):
+        return self._elites[self._weakest_key()]
+
+    def _evict_weakest(self):
+        key = self._weakest_key()
+        heapq.heappop(self._heap)
+        del self._elites[key]
@@ -0,0 +1,212 @@
+"""Shared-memory frame channel from the simulation process to the viewer.
+
+The simulation publishes the hex content, each hex's creature state and a
+color index into a per-frame palette, plus the tick counter, into one of two
+frame slots in a `multiprocessing.shared_memory` block, then flips the
+"latest" marker to it. The viewer copies out whichever frame is latest. Each
+slot has its own lock, held only for the copy in or out, so neither side
+ever waits on the other's drawing or ticking.
+
+Nothing here imports pygame; the simulation side runs headless.
+"""
+import time
+from multiprocessing import Lock
+import numpy as np
+from consts import FRAME_RATE
+from grid import Grid, hex_layout
+from hex import Content, ALIVE, MOTHER, DEAD
+from shared import SharedArrays
+import creature_store
+
+_SLOT_FIELDS = ('header', 'content', 'state', 'color', 'palette')
+
+
+class FrameChannel:
+    """
+    Double-buffered frame slots in shared memory.
+
+    Layout: an int64 "latest slot" marker (-1 before the first frame), then
+    two slots of [tick, palette size] int64, content uint8[n], state uint8[n],
+    color int32[n] (palette row, -1 for no creature) and palette uint8[n, 3].
+    Create it in the parent with `create` and hand it to both processes.
+    """
+
+    def __init__(self, rows, cols, block, locks):
+        self.rows = rows
+        self.cols = cols
+        self.n_hexes = rows * cols
+        self.block = block
+        self.locks = locks
+        self._map()
+
+    @classmethod
+    def create(cls, rows=None, cols=None):
+        """A channel for a world of the given size (default: `hex_layout`'s)."""
+        _, _, _, rows, cols = hex_layout(rows, cols)
+        channel = cls(rows, cols, SharedArrays(cls._spec(rows * cols)), (Lock(), Lock()))
+        channel._latest[0] = -1
+        return channel
+
+    @staticmethod
+    def _spec(n_hexes):
+        spec = [('latest', (1,), np.int64)]
+        for slot in range(2):
+            spec += [(f'header{slot}', (2,), np.int64),
+                     (f'content{slot}', (n_hexes,), np.uint8),
+                     (f'state{slot}', (n_hexes,), np.uint8),
+                     (f'color{slot}', (n_hexes,), np.int32),
+                     (f'palette{slot}', (n_hexes, 3), np.uint8)]
+        return spec
+
+    def _map(self):
+        arrays = self.block.arrays
+        self._latest = arrays['latest']
+        self._slots = [{name: arrays[f'{name}{slot}'] for name in _SLOT_FIELDS}
+                       for slot in range(2)]
+
+    def __getstate__(self):
+        return {'rows': self.rows, 'cols': self.cols, 'block': self.block,
+                'locks': self.locks}
+
+    def __setstate__(self, state):
+        self.rows = state['rows']
+        self.cols = state['cols']
+        self.n_hexes = self.rows * self.cols
+        self.block = state['block']
+        self.locks = state['locks']
+        self._map()
+
+    def write(self, tick, content, state, color, palette):
+        """Publish a frame into the slot the reader is not pointed at, then flip to it."""
+        back = 1 if self._latest[0] == 0 else 0
+        slot = self._slots[back]
+        with self.locks[back]:
+            slot['header'][0] = tick
+            slot['header'][1] = len(palette)
+            slot['content'][:] = content
+            slot['state'][:] = state
+            slot['color'][:] = color
+            slot['palette'][:len(palette)] = palette
+        self._latest[0] = back
+
+    def read(self, content, state, color, palette):
+        """Copy the latest frame into the given arrays; returns (tick, palette size) or None."""
+        latest = int(self._latest[0])
+        if latest < 0:
+            return None
+        slot = self._slots[latest]
+        with self.locks[latest]:
+            tick, palette_size = slot['header'].tolist()
+            content[:] = slot['content']
+            state[:] = slot['state']
+            color[:] = slot['color']
+            palette[:palette_size] = slot['palette'][:palette_size]
+        return tick, palette_size
+
+    def close(self):
+        self._latest = None
+        self._slots = None
+        self.block.close()
+
+    def unlink(self):
+        self.block.unlink()
+
+
+class FramePublisher:
+    """Simulation side: snapshots a grid into the channel at most FRAME_RATE times a second."""
+    __slots__ = ('channel', 'interval', '_next_time', '_state', '_color')
+
+    def __init__(self, channel, frame_rate=FRAME_RATE):
+        self.channel = channel
+        self.interval = 1.0 / frame_rate if frame_rate else 0.0
+        self._next_time = 0.0
+        self._state = np.zeros(channel.n_hexes, dtype=np.uint8)
+        self._color = np.full(channel.n_hexes, -1, dtype=np.int32)
+
+    def maybe_publish(self, grid):
+        now = time.perf_counter()
+        if now >= self._next_time:
+            self._next_time = now + self.interval
+            self.publish(grid)
+
+    def publish(self, grid):
+        n = grid.n_hexes
+        ids = grid.flat_creature_ids[:n]
+        occupied = np.flatnonzero(ids >= 0)
+        rows = ids[occupied]
+        store = grid.store
+        state = self._state
+        color = self._color
+        color.fill(-1)
+
+        flags = store.flags[rows]
+        state[occupied] = np.where(flags & creature_store.DEAD, DEAD,
+                                   np.where(flags & creature_store.IS_MOTHER, MOTHER, ALIVE))
+
+        # Pack each color into one int so equal colors share a palette row
+        rgb = store.color[rows].astype(np.int32)
+        keys, indices = np.unique((rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2],
+                                  return_inverse=True)
+        color[occupied] = indices.reshape(-1)
+        palette = np.stack((keys >> 16, keys >> 8, keys), axis=1).astype(np.uint8)
+
+        self.channel.write(grid.tick_count, grid.flat_content[:n], state, color, palette)
+
+
+class FrameGrid:
+    """
+    Viewer side: the latest published frame, dressed up as enough of a `Grid`
+    for `GridRenderer` (layout, neighbor table, content, dirty hexes and
+    `creature_look`). `update` pulls a new frame and marks the hexes whose
+    content, state or color changed since the last one as dirty.
+    """
+
+    hex_center = Grid.hex_center
+    world_size = Grid.world_size
+    _build_neighbor_table = Grid._build_neighbor_table
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.x_step, self.y_step, self.x_shift, self.rows, self.cols = hex_layout(
+            channel.rows, channel.cols)
+        self.n_hexes = self.rows * self.cols
+        n = self.n_hexes
+        self.off_grid = n
+        self.flat_content = np.full(n + 1, Content.EMPTY, dtype=np.uint8)
+        self.flat_content[self.off_grid] = Content.WALL
+        self.content = self.flat_content[:n].reshape(self.rows, self.cols)
+        self.neighbors = self._build_neighbor_table()
+        self.state = np.zeros(n, dtype=np.uint8)
+        self.rgb = np.zeros((n, 3), dtype=np.uint8)
+        self.tick_count = -1
+        self._dirty_hexes = set()
+        self._all_dirty = True
+
+        self._content = np.empty(n, dtype=np.uint8)
+        self._state = np.empty(n, dtype=np.uint8)
+        self._color = np.empty(n, dtype=np.int32)
+        self._palette = np.zeros((n + 1, 3), dtype=np.uint8)
+
+    def update(self):
+        """Pull the latest frame; returns True when it is newer than the one shown."""
+        frame = self.channel.read(self._content, self._state, self._color, self._palette)
+        if frame is None or frame[0] == self.tick_count:
+            return False
+        self.tick_count = frame[0]
+
+        # Row -1 of the palette buffer is never written, so hexes without a
+        # creature resolve to black
+        rgb = self._palette[self._color]
+        content = self.flat_content[:self.n_hexes]
+        changed = ((content != self._content) | (self.state != self._state) |
+                   (self.rgb != rgb).any(axis=1))
+        self._dirty_hexes.update(np.flatnonzero(changed).tolist())
+        content[:] = self._content
+        self.state[:] = self._state
+        self.rgb[:] = rgb
+        return True
+
+    def creature_look(self, pos):
+        if self.flat_content.item(pos) != Content.CREATURE:
+            return None
+        return tuple(self.rgb[pos].tolist()), self.state.item(pos)
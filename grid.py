@@ -1,54 +1,117 @@
 import math
 import random
+import numpy as np
 import pickle
 import os
-from consts import HEX_SIZE, W, H, X_DIFF, Y_DIFF, X_OFFSET, EVOLUTION_SPAWN_INTERVAL, EVOLUTION_SPAWN_PROBABILITY, TOXIN_DAMAGE, TOXIN_SPAWN_PROBABILITY, TOXIN_SPAWN_INTERVAL, FOOD_SPAWN_INTERVAL, FOOD_SPAWN_PROBABILITY
-from hex import Hex, Content, COLORS
+from consts import HEX_SIZE, W, H, WORLD_ROWS, WORLD_COLS, X_DIFF, Y_DIFF, X_OFFSET, EVOLUTION_SPAWN_INTERVAL, EVOLUTION_SPAWN_PROBABILITY, TOXIN_DAMAGE, TOXIN_SPAWN_PROBABILITY, TOXIN_SPAWN_INTERVAL, FOOD_SPAWN_INTERVAL, FOOD_SPAWN_PROBABILITY, HUNGER_THRESHOLD, BATCHED_INFERENCE, TWO_PHASE_MOVES, GOAL_REFRESH_INTERVAL, ELITE_ARCHIVE_SIZE, TOURNAMENT_SIZE
+from hex import Content, COLORS, ALIVE, MOTHER, DEAD
 from creature import Creature
+from creature_store import CreatureStore, DEAD as DEAD_FLAG
+from brain import decide_batch, mother_goals_batch, mutated_copies, MOTHER_NUM_INPUTS
+from sensing import SensoryEncoder, NUM_INPUTS
+from proximity import ProximityIndex
+from sampler import EmptyHexSampler
+from elites import EliteArchive
+from intents import plan_moves, resolve_moves, apply_moves
+
+
+def hex_layout(rows=None, cols=None):
+    """(x_step, y_step, x_shift, rows, cols) of the hex lattice.
+
+    Dimensions default to WORLD_ROWS / WORLD_COLS, and when those are None
+    to as many hexes as fit the W x H window.
+    """
+    x_step = int(HEX_SIZE * X_DIFF)
+    y_step = int(HEX_SIZE * Y_DIFF)
+    x_shift = int(HEX_SIZE * X_OFFSET)
+    if rows is None:
+        rows = WORLD_ROWS
+    if cols is None:
+        cols = WORLD_COLS
+    if cols is None:
+        cols = len([x for x in range(HEX_SIZE, W-HEX_SIZE, x_step)
+                    if x <= (W - (2 * HEX_SIZE))])
+    if rows is None:
+        rows = len([y for y in range(HEX_SIZE, H-HEX_SIZE, y_step)
+                    if y <= H - math.sqrt(3) * HEX_SIZE])
+    return x_step, y_step, x_shift, rows, cols
 
 
 class Grid:
 
-    def __init__(self):
-        self.hexs: dict[float, list] = {}
+    def __init__(self, seed=None, generate=True, rows=None, cols=None, two_phase=None,
+                 batched=None):
+        # Every stochastic decision in the world draws from these two streams,
+        # so a given seed reproduces a run exactly. The numpy generator feeds
+        # array draws (maze, brain weights, mutation); the stdlib one feeds
+        # scalar draws (spawn gates, sampling, colors).
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.random = random.Random(seed)
+
         self.creatures = []
+        # Creatures that died / were eaten since the last remove_dead_creatures
+        self._deaths = []
+        self._captures = []
         self.taken_colors = set()
         self.evolution_tick_counter = 0
         self.toxin_tick_counter = 0
         self.food_tick_counter = 0
-        self.best_mother = None
+        self.elites = EliteArchive(ELITE_ARCHIVE_SIZE)
+        self.tick_count = 0
 
-        self._row_keys_cache = None
-        self._row_index_map = {}
-        self._empty_hexes = set()
         self._dirty_hexes = set()
         self._all_dirty = True
 
-        toggle = False
-        for y in range(HEX_SIZE, H-HEX_SIZE, int(HEX_SIZE * Y_DIFF)):
-            for x in range(HEX_SIZE, W-HEX_SIZE, int(HEX_SIZE * X_DIFF)):
-                if x <= (W - (2 * HEX_SIZE)) and y <= H - math.sqrt(3) * HEX_SIZE:
-                    new_hex = Hex(x+(int(HEX_SIZE*X_OFFSET*(toggle))),
-                                  y, HEX_SIZE)
-                    self.add_hex(new_hex)
-            toggle = not toggle
-        self._rebuild_row_cache()
-        self.generate_maze_cellular_automata()
-        self._allocate_empty()
-        self.load_best()
+        # Creature state, one row per creature; creature_ids holds the row
+        self.store = CreatureStore()
+        self._next_family = 0
+        self._sensory_encoder = SensoryEncoder()
+        # Movement mode of this grid (see move_creatures); None takes the consts default
+        self.two_phase = TWO_PHASE_MOVES if two_phase is None else two_phase
+        self.batched = BATCHED_INFERENCE if batched is None else batched
+        # A `stripes.StripePool` planning two-phase moves in worker processes
+        self.stripes = None
+
+        # Hex layout: odd rows are shifted right by half a hex
+        self.x_step, self.y_step, self.x_shift, self.rows, self.cols = hex_layout(rows, cols)
+
+        self.n_hexes = self.rows * self.cols
+
+        # Structure-of-arrays hex storage. The flat buffers carry one extra
+        # padding cell at index n_hexes (the off-grid sentinel), which reads as
+        # a wall with no creature, so neighbor gathers need no bounds checks.
+        # content / creature_ids are [row, col] views of the same memory.
+        self.off_grid = self.n_hexes
+        flat_content = np.full(self.n_hexes + 1, Content.EMPTY, dtype=np.uint8)
+        flat_content[self.off_grid] = Content.WALL
+        self.bind_hex_buffers(flat_content, np.full(self.n_hexes + 1, -1, dtype=np.int32))
+        self.neighbors = self._build_neighbor_table()
+        self.proximity = ProximityIndex(self.rows, self.cols)
+        self._empty_hexes = EmptyHexSampler(self.n_hexes)
+
+        # generate=False leaves an empty world for a checkpoint to fill in
+        if generate:
+            self.generate_maze_cellular_automata()
+            self._allocate_empty()
+            self.load_best()
 
     def save_best(self, filename="best_creature.pkl"):
-        if self.best_mother:
+        best = self.elites.best()
+        if best:
             try:
+                # The top-level keys keep the single-best format readable
                 data = {
-                    'brain': self.best_mother.brain,
-                    'mother_brain': self.best_mother.mother_brain,
-                    'points': self.best_mother.point
+                    'brain': best.brain,
+                    'mother_brain': best.mother_brain,
+                    'points': best.points,
+                    'elites': [(elite.points, elite.brain, elite.mother_brain)
+                               for elite in self.elites.ranked()],
                 }
                 with open(filename, 'wb') as f:
                     pickle.dump(data, f)
-                print(f"Saved best creature with {
-                      self.best_mother.point} points.")
+                print(f"Saved {len(self.elites)} elites, best with {
+                      best.points} points.")
             except Exception as e:
                 print(f"Error saving best creature: {e}")
 
@@ -58,350 +121,500 @@ class Grid:
                 with open(filename, 'rb') as f:
                     data = pickle.load(f)
 
-                dummy = Creature(self, 0, 0, self.taken_colors)
-
-                # Check if the loaded brain has the correct input size
-                loaded_brain = data['brain']
-                if loaded_brain.input_size != dummy.brain.input_size:
-                    print(f"Warning: Saved brain has incompatible architecture (input_size={
-                          loaded_brain.input_size}, expected={dummy.brain.input_size}). Creating new brain.")
-                    # Keep the new brain architecture but still load the mother brain if compatible
-                else:
-                    dummy.brain = loaded_brain
-
-                # Load mother brain if compatible
-                loaded_mother_brain = data['mother_brain']
-                if loaded_mother_brain and loaded_mother_brain.input_size == dummy.mother_brain.input_size:
-                    dummy.mother_brain = loaded_mother_brain
-
-                dummy.point = data['points']
-                dummy.is_mother = True
-
-                self.best_mother = dummy
-                print(f"Loaded best creature with {dummy.point} points.")
+                elites = data.get('elites')
+                if elites is None:
+                    elites = [(data['points'], data['brain'], data['mother_brain'])]
+
+                for points, brain, mother_brain in elites:
+                    # Incompatible brains are dropped; the spawn grows a fresh one instead
+                    if brain is not None and brain.input_size != NUM_INPUTS:
+                        print(f"Warning: Saved brain has incompatible architecture (input_size={
+                              brain.input_size}, expected={NUM_INPUTS}). Creating new brain.")
+                        brain = None
+                    if mother_brain is not None and mother_brain.input_size != MOTHER_NUM_INPUTS:
+                        mother_brain = None
+                    self.elites.add(points, brain, mother_brain)
+
+                print(f"Loaded {len(self.elites)} elites, best with {
+                      self.elites.best().points} points.")
             except Exception as e:
                 print(f"Error loading best creature: {e}")
 
-    def add_hex(self, hex: Hex):
-        if not self.hexs.get(hex.center_y):
-            self.hexs[hex.center_y] = []
-        self.hexs.get(hex.center_y).append(hex)
-        self._row_keys_cache = None  # Invalidate cache
-
-    def _rebuild_row_cache(self):
-        self._row_keys_cache = list(self.hexs.keys())
-        self._row_index_map = {key: idx for idx,
-                               key in enumerate(self._row_keys_cache)}
-
     def _allocate_empty(self):
-        for y_coord, row in self.hexs.items():
-            for i, hex in enumerate(row):
-                if hex.content == Content.EMPTY:
-                    self._empty_hexes.add((i, y_coord))
-
-    def get_row_keys(self):
-        if self._row_keys_cache is None:
-            self._rebuild_row_cache()
-        return self._row_keys_cache
-
-    def get_row_index(self, row_key):
-        if self._row_keys_cache is None:
-            self._rebuild_row_cache()
-        return self._row_index_map.get(row_key, -1)
-
-    def mark_hex_dirty(self, col_index, row_key):
+        self._empty_hexes.update(np.flatnonzero(self.content == Content.EMPTY))
+
+    def bind_hex_buffers(self, flat_content, flat_creature_ids):
+        """Keep the hex state in the given flat buffers, e.g. ones in shared memory.
+
+        The buffers must already hold the current state; `content` and
+        `creature_ids` become views of them.
+        """
+        self.flat_content = flat_content
+        self.flat_creature_ids = flat_creature_ids
+        self.content = flat_content[:self.n_hexes].reshape(self.rows, self.cols)
+        self.creature_ids = flat_creature_ids[:self.n_hexes].reshape(self.rows, self.cols)
+
+    def _build_neighbor_table(self):
+        """(n_hexes, 6) flat indices of each hex's neighbors, off_grid where missing.
+
+        Column order is left, right, up-left, up-right, down-left, down-right,
+        matching the creature brain's direction outputs. Odd rows are shifted
+        right, so their diagonal neighbors sit at col and col+1 instead of
+        col-1 and col.
+        """
+        rows, cols = self.rows, self.cols
+        row, col = np.divmod(np.arange(self.n_hexes), cols)
+        diag_left = col - 1 + row % 2
+        diag_right = col + row % 2
+        offsets = ((row, col - 1), (row, col + 1),
+                   (row - 1, diag_left), (row - 1, diag_right),
+                   (row + 1, diag_left), (row + 1, diag_right))
+
+        table = np.empty((self.n_hexes, 6), dtype=np.int32)
+        for direction, (r, c) in enumerate(offsets):
+            valid = (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+            table[:, direction] = np.where(valid, r * cols + c, self.off_grid)
+        return table
+
+    def hex_center(self, pos):
+        row_index, col_index = divmod(pos, self.cols)
+        x = HEX_SIZE + col_index * self.x_step + \
+            (self.x_shift if row_index % 2 else 0)
+        y = HEX_SIZE + row_index * self.y_step
+        return x, y
+
+    def world_size(self):
+        """Pixel (width, height) of the whole world at zoom 1."""
+        return (2 * HEX_SIZE + (self.cols - 1) * self.x_step + self.x_shift,
+                2 * HEX_SIZE + (self.rows - 1) * self.y_step)
+
+    def get_creature(self, pos):
+        creature_id = self.flat_creature_ids.item(pos)
+        if creature_id >= 0:
+            return self.store.views[creature_id]
+        return None
+
+    def creature_look(self, pos):
+        """(color, sprite state) of the creature at `pos`, or None."""
+        creature = self.get_creature(pos)
+        if creature is None:
+            return None
+        if creature.dead:
+            return creature.color, DEAD
+        return creature.color, MOTHER if creature.is_mother else ALIVE
+
+    def set_hex(self, pos, content, creature=None):
+        """Write a hex's content and occupant, keeping empty tracking in sync."""
+        self.flat_content[pos] = content
+        if self.flat_creature_ids.item(pos) >= 0:
+            self.proximity.discard(pos)
+        if creature is not None:
+            self.flat_creature_ids[pos] = creature.id
+            if not creature.dead:
+                self.proximity.add(pos, creature.family)
+        else:
+            self.flat_creature_ids[pos] = -1
+        self.update_empty_hex_tracking(pos, content == Content.EMPTY)
+        self.mark_hex_dirty(pos)
+
+    def new_family(self):
+        family = self._next_family
+        self._next_family += 1
+        return family
+
+    def move_many(self, rows, old, new):
+        """Move the creatures in store `rows` from hexes `old` to hexes `new` in bulk.
+
+        `old` and `new` must not overlap. Whatever was on a new hex (food,
+        toxin, an eaten creature) is overwritten.
+        """
+        flat_content = self.flat_content
+        flat_creature_ids = self.flat_creature_ids
+        flat_content[old] = Content.EMPTY
+        flat_creature_ids[old] = -1
+        flat_content[new] = Content.CREATURE
+        flat_creature_ids[new] = rows
+        self.store.pos[rows] = new
+
+        old = old.tolist()
+        new = new.tolist()
+        proximity = self.proximity
+        empty_hexes = self._empty_hexes
+        for old_pos, new_pos, family in zip(old, new, self.store.family[rows].tolist()):
+            proximity.discard(old_pos)
+            proximity.discard(new_pos)
+            proximity.add(new_pos, family)
+            empty_hexes.add(old_pos)
+            empty_hexes.discard(new_pos)
+        self._dirty_hexes.update(old)
+        self._dirty_hexes.update(new)
+
+    def _release_creature(self, creature):
+        if creature.id >= 0:
+            self.store.release(creature.id)
+            creature.id = -1
+
+    def mark_hex_dirty(self, pos):
         """Mark a hex as needing redraw."""
-        self._dirty_hexes.add((col_index, row_key))
+        self._dirty_hexes.add(pos)
 
-    def update_empty_hex_tracking(self, col_index, row_key, is_empty):
-        pos = (col_index, row_key)
+    def update_empty_hex_tracking(self, pos, is_empty):
         if is_empty:
             self._empty_hexes.add(pos)
         else:
             self._empty_hexes.discard(pos)
 
     def draw(self, screen):
-        hexs = self.hexs
-        row_keys = self.get_row_keys()
-
-        for row_key in row_keys:
-            row = hexs[row_key]
-            for hex in row:
-                hex.draw(screen)
+        # Imported lazily so headless runs never load pygame
+        from render import draw_grid
+        draw_grid(screen, self)
+
+    def tick(self):
+        """Advance the world by one step, in the same phase order as the UI loop."""
+        self.move_creatures()
+        self.age_creatures()
+        self.remove_dead_creatures()
+        self.handle_reproduction()
+        self.handle_evolution_spawn()
+        self.spawn_toxins()
+        self.spawn_food()
+        self.tick_count += 1
+
+    def refresh_family_goals(self):
+        """Evaluate every mother brain with living offspring in one batched pass.
+
+        Offspring read the cached row through `Creature.get_mother_goals`.
+        """
+        mothers = []
+        for creature in self.creatures:
+            if creature.is_mother:
+                creature._goals = None
+                if not creature.dead and creature.mother_brain is not None:
+                    mothers.append(creature)
+        if not mothers:
+            return
+
+        store = self.store
+        rows = np.array([mother.id for mother in mothers], dtype=np.intp)
+        counts, hunger = store.family_stats(rows)
+        with_offspring = np.flatnonzero(counts)
+        if with_offspring.size == 0:
+            return
+        rows = rows[with_offspring]
+        counts = counts[with_offspring]
+        mothers = [mothers[i] for i in with_offspring.tolist()]
+
+        goals = mother_goals_batch(
+            store.mother_brains, rows,
+            store.hunger[rows],
+            store.points[store.point_owners(rows)],
+            counts,
+            hunger[with_offspring] / counts)
+        for mother, row in zip(mothers, goals):
+            mother._goals = row
 
     def move_creatures(self):
+        if self.tick_count % GOAL_REFRESH_INTERVAL == 0:
+            self.refresh_family_goals()
+
+        if self.two_phase:
+            self._move_creatures_two_phase()
+            return
+        if self.batched:
+            self._move_creatures_batched()
+            return
+
         creatures_list = self.creatures
         for creature in creatures_list:
             creature.think()
             if creature.is_mother:
                 self.update_best_mother_creature(creature)
 
-    def remove_dead_creatures(self):
-        """Remove creatures that are dead or have been captured"""
-        alive_creatures = []
+    def _move_creatures_batched(self):
+        """Encode every creature's inputs first, then run all brains in one pass.
+
+        Moves are then applied in list order with the same outcome as calling
+        `think` on each creature in turn. Earlier movers can change what a
+        later creature would sense, so `touched` collects the hexes whose
+        sensed state changed this tick; a creature on or next to one senses
+        and decides again on its own. So does one whose family goals are not
+        cached yet, since `get_mother_goals` computes them from the family as
+        it stands at that creature's turn.
+        """
+        creatures_list = self.creatures
+        thinkers, _ = self._thinkers()
+        ready = []
+        for creature in thinkers:
+            mother = creature.mother
+            if mother is None or mother.mother_brain is None or mother._goals is not None:
+                ready.append(creature)
+
+        decisions = {}
+        if ready:
+            inputs, goals_list = self._sensory_encoder.encode(self, ready)
+            rows = np.fromiter((c.id for c in ready), dtype=np.intp, count=len(ready))
+            directions = decide_batch(self.store.brains, rows, inputs)
+            positions = self.store.pos[rows]
+            for creature, direction, goals, around in zip(
+                    ready, directions.tolist(), goals_list, self.neighbors[positions].tolist()):
+                decisions[creature] = (direction, goals, around)
+
+        # Sensing only tells hunger apart by this threshold
+        threshold = HUNGER_THRESHOLD
+        touched = set()
+        for creature in creatures_list:
+            mother = creature.mother
+            if mother is not None and mother.dead:
+                if not creature.dead:
+                    touched.add(creature.pos)
+                creature.die()
+            elif not creature.dead:
+                pos = creature.pos
+                decision = decisions.get(creature)
+                if decision is None or (touched and (pos in touched or
+                                                     not touched.isdisjoint(decision[2]))):
+                    inputs, goals = creature.sense()
+                    direction = creature.brain.decide(inputs)
+                else:
+                    direction, goals, _ = decision
+
+                hungry = creature.hunger >= threshold
+                mother_hungry = mother is not None and mother.hunger >= threshold
+                creature.act(direction, goals)
+                if creature.pos != pos or (creature.hunger >= threshold) != hungry:
+                    touched.add(pos)
+                    touched.add(creature.pos)
+                # Meals feed the mother a share
+                if mother is not None and (mother.hunger >= threshold) != mother_hungry:
+                    touched.add(mother.pos)
+            if creature.is_mother:
+                self.update_best_mother_creature(creature)
 
-        for creature in self.creatures:
-            if creature.dead and creature.captured:
-                if creature.mother is not None and creature in creature.mother.offspring:
-                    creature.mother.offspring.remove(creature)
-                if creature.is_mother and len(creature.offspring) == 0 or (creature.dead and not creature.is_mother and creature.mother and len(creature.mother.offspring) == 1):
-                    self.taken_colors.discard(creature.color)
-                    for child in creature.offspring:
-                        child.mother = None
-                    creature.offspring.clear()
+    def _thinkers(self):
+        """(living creatures whose mother, if any, lives; living orphans), in list order."""
+        creatures_list = self.creatures
+        flags = self.store.flags
+        rows = np.fromiter((creature.id for creature in creatures_list), dtype=np.intp,
+                           count=len(creatures_list))
+        mothers = self.store.mother[rows]
+        alive = (flags[rows] & DEAD_FLAG) == 0
+        orphaned = (mothers >= 0) & ((flags[mothers] & DEAD_FLAG) != 0)
+        thinkers = [creatures_list[i] for i in np.flatnonzero(alive & ~orphaned).tolist()]
+        orphans = [creatures_list[i] for i in np.flatnonzero(alive & orphaned).tolist()]
+        return thinkers, orphans
+
+    def _move_creatures_two_phase(self):
+        """Plan every move from one snapshot, settle conflicts, then apply them in bulk.
+
+        Unlike the other modes the outcome does not depend on the order of
+        `creatures`; see `intents` for the conflict rules.
+        """
+        thinkers, orphans = self._thinkers()
+        for creature in orphans:
+            creature.die()
+
+        if thinkers:
+            if self.stripes is not None:
+                plan = self.stripes.plan(thinkers)
             else:
-                alive_creatures.append(creature)
+                inputs, goals_list = self._sensory_encoder.encode(self, thinkers)
+                rows = np.fromiter((c.id for c in thinkers), dtype=np.intp, count=len(thinkers))
+                directions = decide_batch(self.store.brains, rows, inputs)
+                has_goals = np.fromiter((goals is not None for goals in goals_list),
+                                        dtype=bool, count=len(thinkers))
+                plan = plan_moves(self, rows, directions, inputs[:, 30:], has_goals)
+            apply_moves(self, plan, resolve_moves(self, plan))
 
-        self.creatures = alive_creatures
+        for creature in self.creatures:
+            if creature.is_mother:
+                self.update_best_mother_creature(creature)
+
+    def age_creatures(self):
+        """Apply a tick of hunger and point decay to everyone at once, then kill the starving."""
+        views = self.store.views
+        for row in self.store.age().tolist():
+            views[row].die()
+
+    def remove_dead_creatures(self):
+        """Settle the deaths and captures queued since the last call.
+
+        A mother's death kills her offspring. Captured creatures leave
+        `creatures` and their mother's offspring by swap-remove, so the work
+        is per event instead of a sweep over the whole population.
+        """
+        # Orphans killed here are queued behind their mother and visited too
+        deaths = self._deaths
+        for creature in deaths:
+            for child in creature.offspring:
+                child.die()
+        deaths.clear()
+
+        listed = self.store.listed
+        captures = self._captures
+        for creature in captures:
+            self._unlist_creature(creature)
+            mother = creature.mother
+            if mother is not None:
+                mother.remove_offspring(creature)
+            if creature.is_mother and len(creature.offspring) == 0 or (not creature.is_mother and mother is not None and len(mother.offspring) == 1):
+                self.taken_colors.discard(creature.color)
+            # Offspring read their mother's row, so it is only
+            # released once the last of them is gone
+            if not creature.offspring:
+                self._release_creature(creature)
+            if (mother is not None and not mother.offspring and mother.captured
+                    and listed.item(mother.id) < 0):
+                # Captured earlier, she was only waiting for this last child
+                self._release_creature(mother)
+        captures.clear()
+
+    def _list_creature(self, creature):
+        self.store.listed[creature.id] = len(self.creatures)
+        self.creatures.append(creature)
+
+    def _unlist_creature(self, creature):
+        """Drop `creature` from `creatures` in O(1) by moving the last one into its place."""
+        creatures = self.creatures
+        listed = self.store.listed
+        index = listed.item(creature.id)
+        last = creatures.pop()
+        if last is not creature:
+            creatures[index] = last
+            listed[last.id] = index
+        listed[creature.id] = -1
 
     def handle_reproduction(self):
+        """Place this tick's offspring one parent at a time, then mutate all their brains at once."""
         new_creatures = []
         for creature in self.creatures:
             if creature.can_reproduce():
                 offspring = self.reproduce_creature(creature)
                 if offspring:
                     new_creatures.append(offspring)
-        self.creatures.extend(new_creatures)
-
-    def reproduce_creature(self, parent):
-        # Find an empty adjacent hex
-        parent_hex = parent.get_current_hex()
-        if not parent_hex:
-            return None
-
-        rows = self.get_row_keys()
-        current_row_idx = self.get_row_index(parent.row_key)
-        if current_row_idx < 0:
-            return None
 
-        row = self.hexs[parent.row_key]
-        is_even_row = current_row_idx % 2 == 0
+        if new_creatures:
+            # Each child still holds its parent's brain; swap in mutated copies
+            brains = mutated_copies([child.brain for child in new_creatures], self.rng)
+            for child, brain in zip(new_creatures, brains):
+                child.brain = brain
+                self._list_creature(child)
 
-        adjacent_positions = []
+    def reproduce_creature(self, parent):
+        """Place a child of `parent` on an empty neighboring hex, or return None.
 
-        # Left and right
-        if parent.col_index > 0:
-            adjacent_positions.append((parent.col_index - 1, parent.row_key))
-        if parent.col_index < len(row) - 1:
-            adjacent_positions.append((parent.col_index + 1, parent.row_key))
-
-        # Previous row
-        if current_row_idx > 0:
-            prev_y = rows[current_row_idx - 1]
-            prev_row = self.hexs[prev_y]
-            if is_even_row:
-                if parent.col_index < len(prev_row):
-                    adjacent_positions.append((parent.col_index, prev_y))
-                if parent.col_index > 0:
-                    adjacent_positions.append((parent.col_index - 1, prev_y))
-            else:
-                if parent.col_index < len(prev_row):
-                    adjacent_positions.append((parent.col_index, prev_y))
-                if parent.col_index + 1 < len(prev_row):
-                    adjacent_positions.append((parent.col_index + 1, prev_y))
-
-        # Next row
-        if current_row_idx < len(rows) - 1:
-            next_y = rows[current_row_idx + 1]
-            next_row = self.hexs[next_y]
-            if is_even_row:
-                if parent.col_index < len(next_row):
-                    adjacent_positions.append((parent.col_index, next_y))
-                if parent.col_index > 0:
-                    adjacent_positions.append((parent.col_index - 1, next_y))
-            else:
-                if parent.col_index < len(next_row):
-                    adjacent_positions.append((parent.col_index, next_y))
-                if parent.col_index + 1 < len(next_row):
-                    adjacent_positions.append((parent.col_index + 1, next_y))
+        The child shares the parent's brain object; `handle_reproduction`
+        gives every child its own mutated copy once all are placed.
+        """
+        # Find an empty adjacent hex
+        off_grid = self.off_grid
+        adjacent_positions = [pos for pos in self.neighbors[parent.pos].tolist()
+                              if pos != off_grid]
 
         # Shuffle to randomize spawn position
-        random.shuffle(adjacent_positions)
+        self.random.shuffle(adjacent_positions)
 
         # Find first empty position
-        for col_idx, row_key in adjacent_positions:
-            row = self.hexs[row_key]
-            if 0 <= col_idx < len(row):
-                hex = row[col_idx]
-                if hex.content == Content.EMPTY:
-                    if parent.reproduce():
-                        if parent.mother:
-                            mother = parent.mother
-                        else:
-                            mother = parent
-                        # Pass parent's brain for inheritance, link to root mother
-                        offspring = Creature(
-                            self, col_idx, row_key, parent_brain=parent.brain, mother=mother)
-                        offspring.color = parent.color
-                        mother.offspring.append(offspring)
-                        hex.content = Content.CREATURE
-                        hex.creature = offspring
-                        return offspring
+        flat_content = self.flat_content
+        for pos in adjacent_positions:
+            if flat_content.item(pos) == Content.EMPTY:
+                if parent.reproduce():
+                    if parent.mother:
+                        mother = parent.mother
+                    else:
+                        mother = parent
+                    # Inherit parent's brain, link to root mother
+                    offspring = Creature(
+                        self, pos, mother=mother, brain=parent.brain)
+                    offspring.color = parent.color
+                    mother.add_offspring(offspring)
+                    self.set_hex(pos, Content.CREATURE, offspring)
+                    return offspring
         return None
 
     def add_creature(self, x, y):
-        i, y = self.get_hex_pos(x, y) or (-1, -1)
-        if i > -1 and y > -1 and self.hexs[y][i].content == Content.EMPTY:
+        pos = self.get_hex_pos(x, y)
+        if pos is not None and self.flat_content.item(pos) == Content.EMPTY:
             # Get all existing creature colors
-            creature = Creature(self, i, y, self.taken_colors)
+            creature = Creature(self, pos, self.taken_colors)
             creature.is_mother = True  # Mark user-created creatures as mothers
-            self.creatures.append(creature)
+            self._list_creature(creature)
             # Mark the hex as filled
-            self.hexs[y][i].content = Content.CREATURE
-            self.hexs[y][i].creature = creature
-            self.update_empty_hex_tracking(i, y, False)
+            self.set_hex(pos, Content.CREATURE, creature)
 
     def get_hex_pos(self, x, y):
-        hex_y = math.floor(HEX_SIZE + int(HEX_SIZE * Y_DIFF) *
-                           math.floor(y/int(HEX_SIZE * Y_DIFF)))
-        raw = self.hexs.get(hex_y)
-        if raw:
-            raw_len = len(raw)
-            if raw_len >= 1:
-                hex_i = int(
-                    (x - raw[0].center_x + HEX_SIZE / 2)/int(HEX_SIZE * X_DIFF))
-                if hex_i < raw_len:
-                    return (hex_i, hex_y)
-
-    def generate_maze_cellular_automata(self, wall_probability=0.45, iterations=5):
-        for row in self.hexs.values():
-            for hex in row:
-                if random.random() < wall_probability:
-                    hex.content = Content.WALL
-                    hex.fill = True
-                else:
-                    hex.content = Content.EMPTY
-                    hex.fill = False
+        """Flat index of the hex under screen point (x, y), or None."""
+        hex_y = math.floor(y / self.y_step)
+        if 0 <= hex_y < self.rows and self.cols >= 1:
+            row_x = self.hex_center(hex_y * self.cols)[0]
+            hex_i = int((x - row_x + HEX_SIZE / 2) / self.x_step)
+            if 0 <= hex_i < self.cols:
+                return hex_y * self.cols + hex_i
+        return None
+
+    def generate_maze_cellular_automata(self, wall_probability=0.45, iterations=5,
+                                        survival_threshold=3, birth_threshold=5,
+                                        food_probability=0.1):
+        """Seed random walls, then smooth them with `iterations` CA passes.
+
+        A wall survives with at least `survival_threshold` wall neighbors; a
+        passage turns into a wall with at least `birth_threshold`.
+        """
+        walls = self.rng.random(self.content.shape) < wall_probability
+        self.content[:] = np.where(walls, Content.WALL, Content.EMPTY)
 
         for _ in range(iterations):
-            self._apply_ca_rules()
+            self._apply_ca_rules(survival_threshold,
+                                 birth_threshold, food_probability)
 
-    def _apply_ca_rules(self):
-        new_states = {}
+    def _apply_ca_rules(self, survival_threshold=3, birth_threshold=5, food_probability=0.1):
+        content = self.content
+        walls = content == Content.WALL
+        wall_count = self._count_wall_neighbors(walls)
 
-        for y_coord, row in self.hexs.items():
-            new_states[y_coord] = []
-            for i, hex in enumerate(row):
-                wall_count = self._count_wall_neighbors(i, y_coord)
+        # Walls with too few wall neighbors open up; passages with too many close
+        new_walls = np.where(walls, wall_count >= survival_threshold,
+                             wall_count >= birth_threshold)
 
-                # Apply rules
-                if hex.content == Content.WALL:
-                    # Wall becomes passage if too few wall neighbors
-                    new_content = Content.EMPTY if wall_count < 3 else Content.WALL
-                else:
-                    # Passage becomes wall if too many wall neighbors
-                    new_content = Content.WALL if wall_count >= 5 else Content.EMPTY
-
-                # Occasionally add food to empty cells
-                if new_content == Content.EMPTY and random.random() < 0.1:
-                    new_content = Content.FOOD
-
-                new_states[y_coord].append(new_content)
-
-        # Apply new states
-        for y_coord, row in self.hexs.items():
-            for i, hex in enumerate(row):
-                hex.content = new_states[y_coord][i]
-                hex.fill = hex.content != Content.EMPTY
-
-    def _count_wall_neighbors(self, col_index, y_coord):
-        count = 0
-        row = self.hexs[y_coord]
-
-        rows = self.get_row_keys()
-        current_row_idx = self.get_row_index(y_coord)
-
-        is_even_row = current_row_idx % 2 == 0
-
-        if col_index > 0 and row[col_index - 1].content == Content.WALL:
-            count += 1
-        if col_index < len(row) - 1 and row[col_index + 1].content == Content.WALL:
-            count += 1
-
-        # Previous row (up-left, up-right)
-        if current_row_idx > 0:
-            prev_y = rows[current_row_idx - 1]
-            prev_row = self.hexs[prev_y]
-
-            if is_even_row:
-                # Even row: check col and col-1
-                if col_index < len(prev_row) and prev_row[col_index].content == Content.WALL:
-                    count += 1
-                if col_index > 0 and prev_row[col_index - 1].content == Content.WALL:
-                    count += 1
-            else:
-                # Odd row: check col and col+1
-                if col_index < len(prev_row) and prev_row[col_index].content == Content.WALL:
-                    count += 1
-                if col_index + 1 < len(prev_row) and prev_row[col_index + 1].content == Content.WALL:
-                    count += 1
-
-        # Next row (down-left, down-right)
-        if current_row_idx < len(rows) - 1:
-            next_y = rows[current_row_idx + 1]
-            next_row = self.hexs[next_y]
-
-            if is_even_row:
-                # Even row: check col and col-1
-                if col_index < len(next_row) and next_row[col_index].content == Content.WALL:
-                    count += 1
-                if col_index > 0 and next_row[col_index - 1].content == Content.WALL:
-                    count += 1
-            else:
-                # Odd row: check col and col+1
-                if col_index < len(next_row) and next_row[col_index].content == Content.WALL:
-                    count += 1
-                if col_index + 1 < len(next_row) and next_row[col_index + 1].content == Content.WALL:
-                    count += 1
+        # Occasionally add food to empty cells
+        food = ~new_walls & (self.rng.random(content.shape) < food_probability)
+
+        content[:] = np.where(new_walls, Content.WALL,
+                              np.where(food, Content.FOOD, Content.EMPTY))
+
+    @staticmethod
+    def _count_wall_neighbors(walls):
+        """Wall-neighbor count for every hex of a (rows, cols) bool array at once.
 
+        Uses shifted views of a zero-padded copy (off-grid is not a wall).
+        Diagonal neighbors of even rows sit at col-1 and col, of odd rows at
+        col and col+1, matching the neighbor table.
+        """
+        padded = np.zeros((walls.shape[0] + 2, walls.shape[1] + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = walls
+
+        # Left and right
+        count = padded[1:-1, :-2] + padded[1:-1, 2:]
+
+        above = padded[:-2]
+        below = padded[2:]
+        # Even rows: up-left/down-left at col-1, up-right/down-right at col
+        count[0::2] += (above[0::2, :-2] + above[0::2, 1:-1] +
+                        below[0::2, :-2] + below[0::2, 1:-1])
+        # Odd rows: shifted right, so col and col+1
+        count[1::2] += (above[1::2, 1:-1] + above[1::2, 2:] +
+                        below[1::2, 1:-1] + below[1::2, 2:])
         return count
 
     def update_best_mother_creature(self, creature):
-        if self.best_mother is None or creature.point > self.best_mother.point:
-            self.best_mother = creature
+        self.elites.offer(creature)
 
     def find_empty_spawn_location(self):
-        """Find an empty spawn location using cached empty hexes or sampling."""
-        if self._empty_hexes:
-            candidates = list(self._empty_hexes)
-            if len(candidates) > 10:
-                candidates = random.sample(
-                    candidates, min(10, len(candidates)))
-
-            for col_idx, row_key in candidates:
-                if row_key in self.hexs:
-                    row = self.hexs[row_key]
-                    if 0 <= col_idx < len(row) and row[col_idx].content == Content.EMPTY:
-                        return (col_idx, row_key)
-                    else:
-                        self._empty_hexes.discard((col_idx, row_key))
+        """Uniformly random empty hex, or None when the grid is full."""
+        return self._empty_hexes.sample(self.random)
 
-        # Fallback: sample random positions instead of iterating all
-        row_keys = self.get_row_keys()
-        if not row_keys:
-            return None
-
-        # Try random sampling first
-        for _ in range(50):
-            row_key = random.choice(row_keys)
-            row = self.hexs[row_key]
-            if row:
-                col_idx = random.randint(0, len(row) - 1)
-                if row[col_idx].content == Content.EMPTY:
-                    self._empty_hexes.add((col_idx, row_key))
-                    return (col_idx, row_key)
-
-        # Last resort: full scan
-        empty_locations = []
-        for y_coord, row in self.hexs.items():
-            for i, hex in enumerate(row):
-                if hex.content == Content.EMPTY:
-                    empty_locations.append((i, y_coord))
-
-        if empty_locations:
-            self._empty_hexes.update(empty_locations)
-            return random.choice(empty_locations)
-        return None
+    def sample_empty_hexes(self, k):
+        """Up to `k` distinct, uniformly random empty hexes."""
+        return self._empty_hexes.sample_k(k, self.random)
 
     def handle_evolution_spawn(self):
         self.evolution_tick_counter += 1
@@ -410,63 +623,68 @@ class Grid:
         if self.evolution_tick_counter >= EVOLUTION_SPAWN_INTERVAL:
             self.evolution_tick_counter = 0
 
-            if random.random() < EVOLUTION_SPAWN_PROBABILITY:
-                best_creature = self.best_mother
-                if best_creature is None:
-                    best_creature = Creature(self, 0, 0, self.taken_colors)
+            if self.random.random() < EVOLUTION_SPAWN_PROBABILITY:
                 spawn_location = self.find_empty_spawn_location()
 
-                if best_creature and spawn_location:
-                    col_idx, row_key = spawn_location
-
-                    # Create evolved creature using best creature's brain and mother brain
-                    evolved_creature = Creature(
-                        self, col_idx, row_key,
-                        self.taken_colors,
-                        parent_brain=best_creature.brain,
-                        parent_mother_brain=best_creature.mother_brain
-                    )
-
-                    # Apply additional evolution pressure - extra mutations for more variation
-                    evolved_creature.brain.mutate(
-                        rate=0.2, strength=0.5)  # Stronger mutations
-                    # Second round of mutations
-                    evolved_creature.brain.mutate(rate=0.15, strength=0.4)
-
-                    # Also apply extra mutations to the mother brain for goal evolution
-                    if evolved_creature.mother_brain is not None:
-                        evolved_creature.mother_brain.mutate(
-                            rate=0.2, strength=0.5)
-                        evolved_creature.mother_brain.mutate(
-                            rate=0.15, strength=0.4)
-                    evolved_creature.is_mother = True
-
-                    self.creatures.append(evolved_creature)
-                    hex = self.hexs[row_key][col_idx]
-                    hex.content = Content.CREATURE
-                    hex.creature = evolved_creature
-
-                    return evolved_creature
+                if spawn_location is not None:
+                    # Pick a parent from the hall of fame by tournament; with an
+                    # empty archive the new family starts from random brains
+                    parent = self.elites.tournament(self.random, TOURNAMENT_SIZE)
+                    # Apply additional evolution pressure - extra, stronger
+                    # mutation rounds for more variation, to the mother brain
+                    # too for goal evolution
+                    pressure = ((0.2, 0.5), (0.15, 0.4))
+                    return self.spawn_mother(
+                        parent.brain if parent else None,
+                        parent.mother_brain if parent else None,
+                        spawn_location,
+                        extra_mutations=pressure,
+                        mother_mutations=pressure)
 
         return None
 
+    def spawn_mother(self, brain, mother_brain, pos=None, extra_mutations=(),
+                     mother_mutations=()):
+        """Start a new family from (mutated copies of) the given brains.
+
+        The brain copy gets the usual mutation followed by any (rate, strength)
+        rounds in `extra_mutations`; the mother brain gets only the rounds in
+        `mother_mutations`. Placed at `pos`, or at a random empty hex when
+        omitted. Returns the new mother, or None when there is no room.
+        """
+        if pos is None:
+            pos = self.find_empty_spawn_location()
+            if pos is None:
+                return None
+        if brain is not None:
+            brain = mutated_copies([brain], self.rng,
+                                   ((None, None),) + tuple(extra_mutations))[0]
+        mother = Creature(self, pos, self.taken_colors,
+                          brain=brain, parent_mother_brain=mother_brain)
+        if mother_mutations:
+            mother.mother_brain = mutated_copies([mother.mother_brain], self.rng,
+                                                 mother_mutations)[0]
+        mother.is_mother = True
+        self._list_creature(mother)
+        self.set_hex(pos, Content.CREATURE, mother)
+        return mother
+
+    def top_mothers(self, k):
+        """The `k` living mothers with the most points, best first."""
+        mothers = [creature for creature in self.creatures
+                   if creature.is_mother and not creature.dead]
+        mothers.sort(key=lambda creature: creature.point, reverse=True)
+        return mothers[:k]
+
     def spawn_toxins(self):
         self.toxin_tick_counter += 1
 
         if self.toxin_tick_counter >= TOXIN_SPAWN_INTERVAL:
             self.toxin_tick_counter = 0
             attempts = 5
-            for _ in range(attempts):
-                spawn = self.find_empty_spawn_location()
-                if not spawn:
-                    break
-                col_idx, row_key = spawn
-                if row_key in self.hexs and 0 <= col_idx < len(self.hexs[row_key]):
-                    hex = self.hexs[row_key][col_idx]
-                    if hex.content == Content.EMPTY and random.random() < TOXIN_SPAWN_PROBABILITY:
-                        hex.content = Content.TOXIN
-                        hex.fill = True
-                        self.update_empty_hex_tracking(col_idx, row_key, False)
+            for spawn in self.sample_empty_hexes(attempts):
+                if self.random.random() < TOXIN_SPAWN_PROBABILITY:
+                    self.set_hex(spawn, Content.TOXIN)
 
     def spawn_food(self):
         self.food_tick_counter += 1
@@ -474,14 +692,6 @@ class Grid:
         if self.food_tick_counter >= FOOD_SPAWN_INTERVAL:
             self.food_tick_counter = 0
             attempts = 5
-            for _ in range(attempts):
-                spawn = self.find_empty_spawn_location()
-                if not spawn:
-                    break
-                col_idx, row_key = spawn
-                if row_key in self.hexs and 0 <= col_idx < len(self.hexs[row_key]):
-                    hex = self.hexs[row_key][col_idx]
-                    if hex.content == Content.EMPTY and random.random() < FOOD_SPAWN_PROBABILITY:
-                        hex.content = Content.FOOD
-                        hex.fill = True
-                        self.update_empty_hex_tracking(col_idx, row_key, False)
+            for spawn in self.sample_empty_hexes(attempts):
+                if self.random.random() < FOOD_SPAWN_PROBABILITY:
+                    self.set_hex(spawn, Content.FOOD)
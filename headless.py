@@ -0,0 +1,135 @@
+"""Run the simulation without a display.
+
+Drives the same phases as `the_hive` but never imports pygame, so the
+tick rate is bounded only by the simulation itself:
+
+    python headless.py --ticks 10000
+    python headless.py --seconds 3600 --save
+    python headless.py --ticks 5000 --seed 42   # reproducible run
+    python headless.py --checkpoint-every 5000 --resume world.npz
+    python headless.py --ticks 2000 --profile   # per-phase timings to JSON
+    python headless.py --rows 1000 --cols 1000   # a million-hex world
+    python headless.py --two-phase   # order-independent moves
+    python headless.py --rows 2000 --cols 2000 --workers 8   # plan moves in 8 processes
+"""
+import argparse
+import time
+from grid import Grid
+from checkpoint import CHECKPOINT_FILE, CheckpointWriter, load_checkpoint
+from profiler import PROFILE_FILE, TickProfiler
+from stripes import StripePool
+
+
+def run_headless(grid=None, max_ticks=None, max_seconds=None, report_every=0,
+                 checkpoint=None):
+    """Tick `grid` until `max_ticks` ticks or `max_seconds` of wall time have passed.
+
+    With neither limit set the loop runs until interrupted. `checkpoint` is an
+    optional `CheckpointWriter` given the chance to save after every tick.
+    Returns the grid and the number of ticks executed.
+    """
+    if grid is None:
+        grid = Grid()
+
+    perf_counter = time.perf_counter
+    grid_tick = grid.tick
+
+    start = perf_counter()
+    deadline = start + max_seconds if max_seconds is not None else None
+    ticks = 0
+    try:
+        while max_ticks is None or ticks < max_ticks:
+            grid_tick()
+            ticks += 1
+            if checkpoint is not None:
+                checkpoint.maybe_save(grid)
+            if deadline is not None and perf_counter() >= deadline:
+                break
+            if report_every and ticks % report_every == 0:
+                elapsed = perf_counter() - start
+                print(f"tick {ticks}: {len(grid.creatures)} creatures, "
+                      f"{ticks / elapsed:.1f} ticks/s")
+    except KeyboardInterrupt:
+        pass
+
+    elapsed = perf_counter() - start
+    if report_every:
+        print(f"{ticks} ticks in {elapsed:.2f}s "
+              f"({ticks / max(elapsed, 1e-9):.1f} ticks/s)")
+    return grid, ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the_hive without a display")
+    parser.add_argument("--ticks", type=int, default=None,
+                        help="stop after this many ticks")
+    parser.add_argument("--seconds", type=float, default=None,
+                        help="stop after this many seconds of wall time")
+    parser.add_argument("--report-every", type=int, default=1000,
+                        help="print progress every N ticks (0 to disable)")
+    parser.add_argument("--rows", type=int, default=None,
+                        help="world height in hexes (default: WORLD_ROWS or fit the window)")
+    parser.add_argument("--cols", type=int, default=None,
+                        help="world width in hexes (default: WORLD_COLS or fit the window)")
+    parser.add_argument("--two-phase", action="store_true",
+                        help="plan all moves from one snapshot and resolve them in bulk")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="sense, decide and plan two-phase moves in N processes, one stripe "
+                             "of rows each; the rest of the tick stays in this process "
+                             "(implies --two-phase; a resumed world keeps its saved count)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed the world's random streams for a reproducible run")
+    parser.add_argument("--save", action="store_true",
+                        help="save the best creature when the run ends")
+    parser.add_argument("--resume", metavar="PATH", default=None,
+                        help="continue from a full-world checkpoint")
+    parser.add_argument("--checkpoint", metavar="PATH", default=CHECKPOINT_FILE,
+                        help="where periodic checkpoints are written")
+    parser.add_argument("--checkpoint-every", type=int, default=0,
+                        help="checkpoint the whole world every N ticks (0 to disable)")
+    parser.add_argument("--profile", metavar="PATH", nargs="?", const=PROFILE_FILE,
+                        default=None, help="time every tick phase and write the stats as JSON")
+    args = parser.parse_args()
+
+    if args.resume:
+        # The checkpoint restores the move mode; flags given here override it
+        grid = load_checkpoint(args.resume, workers=args.workers)
+    else:
+        grid = Grid(seed=args.seed, rows=args.rows, cols=args.cols)
+        if args.workers:
+            grid.stripes = StripePool(grid, args.workers)
+    if args.two_phase or grid.stripes is not None:
+        grid.two_phase = True
+    checkpoint = None
+    if args.checkpoint_every:
+        checkpoint = CheckpointWriter(args.checkpoint, args.checkpoint_every)
+    profiler = None
+    if args.profile:
+        profiler = TickProfiler()
+        profiler.attach(grid)
+
+    try:
+        grid, _ = run_headless(grid, max_ticks=args.ticks,
+                               max_seconds=args.seconds,
+                               report_every=args.report_every,
+                               checkpoint=checkpoint)
+        if checkpoint is not None:
+            # Final checkpoint, so a resume picks up exactly where this run stopped
+            # (taken while the stripe workers are still attached, so it records them)
+            checkpoint.wait()
+            checkpoint.save(grid)
+            checkpoint.wait()
+    finally:
+        if grid.stripes is not None:
+            grid.stripes.close()
+            grid.stripes = None
+    if profiler is not None:
+        profiler.detach()
+        print(profiler.report())
+        profiler.dump(args.profile)
+    if args.save:
+        grid.save_best()
+
+
+if __name__ == "__main__":
+    main()
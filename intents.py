@@ -0,0 +1,237 @@
+"""Order-independent movement: plan every move from one snapshot, then resolve.
+
+`plan_moves` works out each thinking creature's intended move, with the
+rewards and penalties `Creature.act` would give it, from a frozen snapshot
+of the world. `resolve_moves` settles the conflicts between intents, and
+`apply_moves` writes the outcome back in bulk. Nothing depends on the order
+of `Grid.creatures`, so a tick's result is fixed by the snapshot and the RNG
+alone.
+
+Planning reads only arrays (the hex buffers, the neighbor table and the
+store's columns), so it can run on a shared-memory copy of the world in
+another process; see `stripes`.
+
+Conflict rules:
+- Several creatures after the same hex: the one with the highest priority
+  (a random permutation drawn per tick) gets it; the rest stay put.
+- Predators are settled in priority order. Prey is caught where it stands,
+  which cancels its own move, unless it has already made a catch of its own,
+  in which case it got away and the later predator stays put.
+- Toxins, food and corpses on a target affect only its winner.
+
+Point changes are summed per point owner (the family pool) and clamped at
+zero once, instead of after every step as the sequential modes do.
+"""
+import numpy as np
+from consts import (MAX_HUNGER, HUNGER_THRESHOLD, TOXIN_DAMAGE, EXPLORATION_REWARD, FAMILY_PROXIMITY_PENALTY,
+                    FAMILY_PROXIMITY_THRESHOLD, DISTANCE_FROM_MOTHER_BONUS)
+from hex import Content
+from creature_store import DEAD, CAPTURED
+
+STAY = 6  # Brain output for staying put
+
+
+class MovePlan:
+    """
+    Intended moves of N creatures, row-aligned.
+
+    `rows` are store rows, `pos` / `targets` flat hexes, `moving` marks the
+    intents that go ahead to resolution, and `points` / `hunger` are the
+    rewards and penalties to apply whether or not the move wins.
+    """
+    __slots__ = ('rows', 'pos', 'targets', 'moving', 'points', 'hunger')
+
+    def __init__(self, rows, pos, targets, moving, points, hunger):
+        self.rows = rows
+        self.pos = pos
+        self.targets = targets
+        self.moving = moving
+        self.points = points
+        self.hunger = hunger
+
+
+def count_family(grid, centers, families, exclude, radius):
+    """Living members of `families[i]` within `radius` rows and cols of `centers[i]`.
+
+    The array form of `ProximityIndex.count_family`: a creature's hex holds
+    its row while it stands there, so the window is read off the hex buffers.
+    """
+    rows, cols = grid.rows, grid.cols
+    row, col = np.divmod(centers, cols)
+    offsets = np.arange(-radius, radius + 1)
+    window_row = row[:, None, None] + offsets[None, :, None]
+    window_col = col[:, None, None] + offsets[None, None, :]
+    inside = ((window_row >= 0) & (window_row < rows) &
+              (window_col >= 0) & (window_col < cols))
+    hexes = np.where(inside, window_row * cols + window_col, grid.off_grid)
+    occupant = grid.flat_creature_ids[hexes]
+    store = grid.store
+    # An id of -1 indexes the last row; `occupant >= 0` masks it out
+    members = ((occupant >= 0) & ((store.flags[occupant] & DEAD) == 0) &
+               (store.family[occupant] == families[:, None, None]) &
+               (hexes != exclude[:, None, None]))
+    return members.sum(axis=(1, 2))
+
+
+def plan_moves(grid, rows, directions, goals, has_goals):
+    """A `MovePlan` for the creatures in store `rows`.
+
+    `directions` are their brains' choices and `goals` their (N, 3) family
+    goal rows, meaningful where `has_goals` is set.
+    """
+    store = grid.store
+    n = len(rows)
+    pos = store.pos[rows].astype(np.intp)
+    flags = store.flags
+    family = store.family
+    my_family = family[rows]
+
+    # What every neighbor offers, exactly as `Creature._get_valid_moves` sees it
+    neighbors = grid.neighbors[pos]
+    content = grid.flat_content[neighbors]
+    occupant = grid.flat_creature_ids[neighbors]
+    occupant_flags = flags[occupant]
+    is_creature = content == Content.CREATURE
+    corpse = is_creature & ((occupant_flags & (DEAD | CAPTURED)) == DEAD)
+    prey = (is_creature & ((occupant_flags & DEAD) == 0) &
+            (family[occupant] != my_family[:, None]) &
+            (store.hunger[occupant] >= HUNGER_THRESHOLD))
+    has_food = (content == Content.FOOD) | corpse | prey
+    valid = has_food | (content == Content.EMPTY) | (content == Content.TOXIN)
+
+    index = np.arange(n)
+    directions = np.asarray(directions)
+    staying = directions == STAY
+    direction = np.where(staying, 0, directions)
+    targets = neighbors[index, direction].astype(np.intp)
+    chosen = valid[index, direction] & ~staying
+    revisit = chosen & (store.history[rows] == targets[:, None]).any(axis=1)
+    moving = chosen & ~revisit
+
+    points = np.zeros(n, dtype=np.int64)
+    hunger = np.zeros(n, dtype=np.int64)
+    # Staying, a blocked direction and a revisit are punished, unless there
+    # was nowhere to go at all
+    punished = valid.any(axis=1) & ~moving
+    points[punished] -= 8
+    hunger[punished] += 8
+    points[revisit] -= 15
+    hunger[revisit] += 5
+
+    # Goal-driven bonuses
+    food_bonus = np.where(has_goals, np.trunc((goals[:, 0] + 1) / 2 * 5), 0).astype(np.int64)
+    exploration_bonus = np.where(
+        has_goals, np.trunc((goals[:, 1] + 1) / 2 * EXPLORATION_REWARD), 0).astype(np.int64)
+
+    movers = np.flatnonzero(moving)
+    crowded = count_family(grid, targets[movers], my_family[movers], pos[movers],
+                           FAMILY_PROXIMITY_THRESHOLD) > 2
+    crowded_movers = movers[crowded]
+    points[crowded_movers] -= FAMILY_PROXIMITY_PENALTY
+    hunger[crowded_movers] += 3
+
+    points[movers] += exploration_bonus[movers]
+
+    mother = store.mother[rows]
+    mother_alive = (mother >= 0) & ((flags[mother] & DEAD) == 0)
+    cols = grid.cols
+    target_row, target_col = np.divmod(targets, cols)
+    mother_row, mother_col = np.divmod(store.pos[mother].astype(np.intp), cols)
+    far = np.maximum(np.abs(target_row - mother_row), np.abs(target_col - mother_col)) > 5
+    points[moving & mother_alive & far] += DISTANCE_FROM_MOTHER_BONUS
+
+    fed = moving & has_food[index, direction]
+    points[fed] += 2 + food_bonus[fed]
+
+    return MovePlan(rows, pos, targets, moving, points, hunger)
+
+
+def resolve_moves(grid, plan):
+    """Indices into `plan` of the moves that go ahead, after every conflict is settled."""
+    movers = np.flatnonzero(plan.moving)
+    if movers.size == 0:
+        return movers
+    # Drawn per store row rather than per position in the plan, so list order
+    # has no say in who wins
+    rows = plan.rows
+    priority = grid.rng.permutation(grid.store.size)[rows[movers]]
+    targets = plan.targets[movers]
+
+    # One winner per hex: sort by target, highest priority first within each
+    order = np.lexsort((-priority, targets))
+    sorted_targets = targets[order]
+    first = np.ones(order.size, dtype=bool)
+    first[1:] = sorted_targets[1:] != sorted_targets[:-1]
+    winners = order[first]  # Indices into movers
+
+    occupant = grid.flat_creature_ids[targets[winners]]
+    hunting = np.flatnonzero(
+        (occupant >= 0) & ((grid.store.flags[occupant] & DEAD) == 0))
+    if hunting.size == 0:
+        return movers[winners]
+
+    # Predation is rare enough to settle one catch at a time, in priority order
+    eaten = set()
+    made_catch = set()
+    escaped = np.zeros(winners.size, dtype=bool)
+    for i in hunting[np.argsort(-priority[winners[hunting]])].tolist():
+        predator = rows.item(movers.item(winners.item(i)))
+        target = occupant.item(i)
+        if predator in eaten or target in made_catch:
+            escaped[i] = True
+            continue
+        eaten.add(target)
+        made_catch.add(predator)
+    winners = winners[~escaped]
+    caught = np.isin(rows[movers[winners]], np.fromiter(eaten, dtype=np.intp, count=len(eaten)))
+    return movers[winners[~caught]]
+
+
+def apply_moves(grid, plan, moves):
+    """Apply every reward and penalty in `plan`, then carry out `moves` in bulk."""
+    store = grid.store
+    rows = plan.rows
+    hunger = store.hunger
+    store.set_hunger_many(rows, np.clip(hunger[rows] + plan.hunger, 0, MAX_HUNGER))
+    owners = store.point_owners(rows)
+    delta = np.zeros(store.size, dtype=np.int64)
+    np.add.at(delta, owners, plan.points)
+    owners = np.unique(owners)
+    store.points[owners] = np.maximum(store.points[owners] + delta[owners], 0)
+
+    # Staying counts as a visit, as in `Creature.move`
+    staying = np.ones(rows.size, dtype=bool)
+    staying[moves] = False
+    store.remember_many(rows[staying], plan.pos[staying])
+
+    if moves.size == 0:
+        return
+    # In row order, so deaths and captures are queued the same way whatever
+    # the order of the plan
+    moves = moves[np.argsort(rows[moves])]
+    movers = rows[moves]
+    old = plan.pos[moves]
+    new = plan.targets[moves]
+    content = grid.flat_content[new]
+
+    # Catch prey and corpses before anyone lands, so prey leave the
+    # proximity index before their eaters enter it
+    views = store.views
+    meals = []
+    for eater, meal in zip(movers[content == Content.CREATURE].tolist(),
+                           grid.flat_creature_ids[new[content == Content.CREATURE]].tolist()):
+        other = views[meal]
+        fats = other.point // 10
+        other.die()
+        other.mark_captured()
+        meals.append((views[eater], fats, other))
+
+    grid.move_many(movers, old, new)
+    store.remember_many(movers, new)
+
+    poisoned = movers[content == Content.TOXIN]
+    store.set_hunger_many(poisoned, np.minimum(hunger[poisoned] + TOXIN_DAMAGE, MAX_HUNGER))
+    foraged = movers[content == Content.FOOD]
+    store.set_hunger_many(foraged, np.maximum(hunger[foraged] - 20, 0))
+    for eater, fats, other in meals:
+        eater.capture_food(True, fats, other)
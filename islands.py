@@ -0,0 +1,147 @@
+"""Island-model evolution: independent headless worlds that trade their best genomes.
+
+Each island is a separate process running its own `Grid` (own seed, own maze)
+headlessly. Every `ticks_per_epoch` ticks each island reports its top mothers'
+`brain` / `mother_brain` genomes to the coordinator, which forwards them to
+other islands along a ring or a random topology, where they start new
+families. Islands only synchronise at epoch boundaries, so throughput grows
+with the number of cores.
+
+    python islands.py --islands 8 --epochs 20 --ticks 1000 --save
+"""
+import argparse
+import multiprocessing
+import os
+import pickle
+import random
+import time
+from grid import Grid
+from headless import run_headless
+
+_STOP = None
+
+
+def _genomes(grid, k):
+    return [(mother.brain, mother.mother_brain, mother.point)
+            for mother in grid.top_mothers(k)]
+
+
+def _island(island_id, seed, ticks_per_epoch, migrants, inbox, outbox):
+    grid = Grid(seed=seed)
+
+    while True:
+        start = time.perf_counter()
+        _, ticks = run_headless(grid, max_ticks=ticks_per_epoch)
+        elapsed = time.perf_counter() - start
+
+        best = grid.elites.best()
+        outbox.put((island_id, _genomes(grid, migrants), ticks, elapsed,
+                    (best.brain, best.mother_brain, best.points) if best else None))
+
+        immigrants = inbox.get()
+        if immigrants is _STOP:
+            break
+        for brain, mother_brain, _ in immigrants:
+            grid.spawn_mother(brain, mother_brain)
+
+
+def _destinations(num_islands, topology, rng):
+    """Island each island's emigrants go to this epoch."""
+    if topology == "ring":
+        return [(i + 1) % num_islands for i in range(num_islands)]
+    # Random derangement: nobody keeps its own emigrants
+    while True:
+        order = list(range(num_islands))
+        rng.shuffle(order)
+        if all(i != dest for i, dest in enumerate(order)) or num_islands < 2:
+            return order
+
+
+def run_islands(num_islands=None, epochs=10, ticks_per_epoch=500, migrants=2,
+                topology="ring", base_seed=0, verbose=True):
+    """Run the island model and return the global best (brain, mother_brain, points)."""
+    if num_islands is None:
+        num_islands = os.cpu_count() or 1
+    if topology not in ("ring", "random"):
+        raise ValueError(f"unknown topology {topology!r}")
+
+    rng = random.Random(base_seed)
+    outbox = multiprocessing.Queue()
+    inboxes = [multiprocessing.Queue() for _ in range(num_islands)]
+    islands = [multiprocessing.Process(
+        target=_island,
+        args=(i, base_seed + i, ticks_per_epoch, migrants, inboxes[i], outbox),
+        daemon=True)
+        for i in range(num_islands)]
+    for island in islands:
+        island.start()
+
+    global_best = None
+    try:
+        for epoch in range(epochs):
+            reports = [outbox.get() for _ in range(num_islands)]
+            reports.sort(key=lambda report: report[0])
+
+            total_ticks = 0
+            for _, _, ticks, elapsed, best in reports:
+                total_ticks += ticks
+                if best is not None and (global_best is None or best[2] > global_best[2]):
+                    global_best = best
+            if verbose:
+                slowest = max(report[3] for report in reports)
+                print(f"epoch {epoch + 1}/{epochs}: "
+                      f"{total_ticks / max(slowest, 1e-9):.1f} island-ticks/s, "
+                      f"best {global_best[2] if global_best else 0} points")
+
+            if epoch == epochs - 1:
+                for inbox in inboxes:
+                    inbox.put(_STOP)
+                break
+
+            incoming = [[] for _ in range(num_islands)]
+            for (island_id, genomes, _, _, _), dest in zip(
+                    reports, _destinations(num_islands, topology, rng)):
+                incoming[dest].extend(genomes)
+            for inbox, genomes in zip(inboxes, incoming):
+                inbox.put(genomes)
+    finally:
+        for island in islands:
+            island.join(timeout=5)
+            if island.is_alive():
+                island.terminate()
+
+    return global_best
+
+
+def save_genome(best, filename="best_creature.pkl"):
+    """Write a (brain, mother_brain, points) triple in `Grid.load_best` format."""
+    brain, mother_brain, points = best
+    with open(filename, 'wb') as f:
+        pickle.dump({'brain': brain, 'mother_brain': mother_brain,
+                     'points': points}, f)
+    print(f"Saved best creature with {points} points.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Island-model evolution across processes")
+    parser.add_argument("--islands", type=int, default=None,
+                        help="number of worlds (default: one per core)")
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--ticks", type=int, default=500,
+                        help="ticks each island runs between migrations")
+    parser.add_argument("--migrants", type=int, default=2,
+                        help="top mothers each island sends per migration")
+    parser.add_argument("--topology", choices=("ring", "random"), default="ring")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", action="store_true",
+                        help="save the global best to best_creature.pkl")
+    args = parser.parse_args()
+
+    best = run_islands(args.islands, args.epochs, args.ticks, args.migrants,
+                       args.topology, args.seed)
+    if args.save and best is not None:
+        save_genome(best)
+
+
+if __name__ == "__main__":
+    main()
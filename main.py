@@ -1,18 +1,28 @@
-from multiprocessing import Process, Manager, Event
+from multiprocessing import Process, Event, Queue
 from options import options
 from the_hive import the_hive
+from viewer import viewer
+from frames import FrameChannel
+from control import ControlBlock
 
 
 if __name__ == "__main__":
-    with Manager() as manager:
-        state = manager.dict(counter=0, running=True, options_open=False)
-
-        options_event = Event()
-        p1 = Process(target=the_hive, args=(state, options_event))
-        p2 = Process(target=options, args=(state, options_event))
+    control = ControlBlock()
+    options_event = Event()
+    channel = FrameChannel.create()
+    commands = Queue()
+    p1 = Process(target=the_hive, args=(control, channel, commands))
+    p2 = Process(target=viewer, args=(control, options_event, channel, commands))
+    p3 = Process(target=options, args=(control, options_event))
 
+    try:
         p1.start()
         p2.start()
+        p3.start()
 
         p1.join()
         p2.join()
+        p3.join()
+    finally:
+        channel.close()
+        channel.unlink()
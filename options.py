@@ -1,19 +1,35 @@
 import pygame
 from buttons import draw_button
+from control import TUNABLES
 
 WIDTH, HIGHT = 500, 800
 
+ROW_TOP = 70
+ROW_HEIGHT = 40
+
 
 def init_options():
 
     # Button positions
     options_btn = pygame.Rect((WIDTH - 300)/2,   100, 300, 50)
-    back_btn = pygame.Rect((WIDTH - 140)/2,   220, 140, 40)
-    return options_btn, back_btn
+    back_btn = pygame.Rect((WIDTH - 140)/2,   HIGHT - 60, 140, 40)
+    pause_btn = pygame.Rect(40, HIGHT - 110, 200, 40)
+    step_btn = pygame.Rect(WIDTH - 240, HIGHT - 110, 200, 40)
+    # One "-" / "+" pair per tunable parameter
+    param_btns = []
+    for i in range(len(TUNABLES)):
+        y = ROW_TOP + i * ROW_HEIGHT
+        param_btns.append((pygame.Rect(WIDTH - 110, y, 40, 32),
+                           pygame.Rect(WIDTH - 60, y, 40, 32)))
+    return options_btn, back_btn, pause_btn, step_btn, param_btns
+
+
+def _format(value):
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
 
 
-def options(shared, options_event):
-    while shared["running"]:
+def options(control, options_event):
+    while control.running:
         if not options_event.wait(timeout=0.1):
             continue
 
@@ -22,14 +38,15 @@ def options(shared, options_event):
         pygame.display.set_caption("options")
         clock = pygame.time.Clock()
         font = pygame.font.SysFont(None, 36)
+        small_font = pygame.font.SysFont(None, 24)
         state = "menu"
-        options_btn, back_btn = init_options()
+        options_btn, back_btn, pause_btn, step_btn, param_btns = init_options()
 
         # Title
         title = font.render("Options", True, (0, 0, 0))
 
         running_options = True
-        while options_event.is_set() and shared["running"] and running_options:
+        while options_event.is_set() and control.running and running_options:
             screen.fill((200, 80, 80))
             screen.blit(title, ((WIDTH - title.get_width())/2,  20))
             mouse_pos = pygame.mouse.get_pos()
@@ -39,6 +56,19 @@ def options(shared, options_event):
                 draw_button(screen, font, "Go to Options",
                             options_btn, options_btn.collidepoint(mouse_pos))
             if state == "options":
+                for i, (name, *_) in enumerate(TUNABLES):
+                    minus_btn, plus_btn = param_btns[i]
+                    label = small_font.render(
+                        f"{name.lower()}: {_format(control.get(i))}", True, (0, 0, 0))
+                    screen.blit(label, (20, minus_btn.centery - label.get_height() / 2))
+                    draw_button(screen, font, "-", minus_btn,
+                                minus_btn.collidepoint(mouse_pos))
+                    draw_button(screen, font, "+", plus_btn,
+                                plus_btn.collidepoint(mouse_pos))
+                draw_button(screen, font, "Resume" if control.paused else "Pause",
+                            pause_btn, pause_btn.collidepoint(mouse_pos))
+                draw_button(screen, font, "Step", step_btn,
+                            step_btn.collidepoint(mouse_pos))
                 draw_button(screen, font, "Back", back_btn,
                             back_btn.collidepoint(mouse_pos))
 
@@ -49,8 +79,18 @@ def options(shared, options_event):
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if state == "menu" and options_btn.collidepoint(event.pos):
                         state = "options"
-                    elif state == "options" and back_btn.collidepoint(event.pos):
-                        state = "menu"
+                    elif state == "options":
+                        if back_btn.collidepoint(event.pos):
+                            state = "menu"
+                        elif pause_btn.collidepoint(event.pos):
+                            control.paused = not control.paused
+                        elif step_btn.collidepoint(event.pos):
+                            control.request_step()
+                        for i, (minus_btn, plus_btn) in enumerate(param_btns):
+                            if minus_btn.collidepoint(event.pos):
+                                control.nudge(i, -1)
+                            elif plus_btn.collidepoint(event.pos):
+                                control.nudge(i, 1)
 
             pygame.display.flip()
             clock.tick(60)
@@ -0,0 +1,142 @@
+"""Per-phase tick timing.
+
+Instrumentation is attached by wrapping methods, so a run without a profiler
+executes exactly the same code as before and pays nothing:
+
+    profiler = TickProfiler()
+    profiler.attach(grid)
+    ...
+    profiler.dump("tick_profile.json")
+
+Each phase keeps a total call count and a rolling window of its most recent
+durations, from which means and percentiles are reported.
+"""
+import json
+import time
+from collections import deque
+import numpy as np
+import grid as grid_module
+from creature import Creature
+from brain import NeuralNetwork
+from sensing import SensoryEncoder
+from stripes import StripePool
+
+PROFILE_FILE = "tick_profile.json"
+
+# The whole tick, then its phases in order, timed per grid instance
+GRID_PHASES = ('tick', 'move_creatures', 'refresh_family_goals', 'age_creatures',
+               'remove_dead_creatures', 'handle_reproduction', 'handle_evolution_spawn',
+               'spawn_toxins', 'spawn_food')
+
+# Hot sub-steps of a creature's think/act, timed on the class: (owner, attribute, phase)
+SUB_STEPS = (
+    (SensoryEncoder, 'encode', 'sense_batch'),
+    (grid_module, 'decide_batch', 'decide_batch'),
+    (grid_module, 'plan_moves', 'plan_moves'),
+    (StripePool, 'plan', 'stripe_plan'),
+    (grid_module, 'resolve_moves', 'resolve_moves'),
+    (grid_module, 'apply_moves', 'apply_moves'),
+    (Creature, 'sense', 'sense'),
+    (NeuralNetwork, 'decide', 'decide'),
+    (Creature, 'act', 'act'),
+    (Creature, '_get_valid_moves', 'valid_moves'),
+    (Creature, '_count_family_nearby', 'proximity_family'),
+)
+
+
+class _Phase:
+    __slots__ = ('calls', 'samples')
+
+    def __init__(self, window):
+        self.calls = 0
+        self.samples = deque(maxlen=window)
+
+
+class TickProfiler:
+    """Call counts and rolling timing statistics for named phases."""
+    __slots__ = ('window', '_phases', '_patched')
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._phases = {}
+        self._patched = []  # (owner, attribute, original, was_own_attribute)
+
+    def record(self, name, seconds):
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self.window)
+        phase.calls += 1
+        phase.samples.append(seconds)
+
+    def timed(self, name, func):
+        """`func` wrapped so every call is recorded under `name`."""
+        perf_counter = time.perf_counter
+        record = self.record
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, perf_counter() - start)
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def wrap(self, owner, attribute, name):
+        """Replace `owner.attribute` with a timed version until `detach`."""
+        was_own = attribute in vars(owner)
+        original = getattr(owner, attribute)
+        self._patched.append((owner, attribute, original if was_own else None, was_own))
+        setattr(owner, attribute, self.timed(name, original))
+
+    def attach(self, grid, sub_steps=True):
+        """Time every tick phase of `grid` and, optionally, the creature hot paths.
+
+        Sub-steps are patched on their classes, so they are timed for every
+        grid in the process while attached.
+        """
+        for phase in GRID_PHASES:
+            self.wrap(grid, phase, phase)
+        if sub_steps:
+            for owner, attribute, name in SUB_STEPS:
+                self.wrap(owner, attribute, name)
+
+    def detach(self):
+        """Restore everything `wrap` replaced, newest first."""
+        while self._patched:
+            owner, attribute, original, was_own = self._patched.pop()
+            if was_own:
+                setattr(owner, attribute, original)
+            else:
+                delattr(owner, attribute)
+
+    def stats(self):
+        """{phase: {calls, mean_ms, p50_ms, p90_ms, p99_ms, max_ms}} over the rolling window."""
+        result = {}
+        for name, phase in self._phases.items():
+            samples = np.fromiter(phase.samples, dtype=np.float64) * 1000.0
+            p50, p90, p99 = np.percentile(samples, (50, 90, 99))
+            result[name] = {
+                'calls': phase.calls,
+                'mean_ms': float(samples.mean()),
+                'p50_ms': float(p50),
+                'p90_ms': float(p90),
+                'p99_ms': float(p99),
+                'max_ms': float(samples.max()),
+            }
+        return result
+
+    def report(self):
+        """The stats as an aligned text table, slowest mean first."""
+        stats = sorted(self.stats().items(), key=lambda item: item[1]['mean_ms'], reverse=True)
+        lines = [f"{'phase':<24}{'calls':>10}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}  (ms)"]
+        for name, s in stats:
+            lines.append(f"{name:<24}{s['calls']:>10}{s['mean_ms']:>10.3f}{s['p50_ms']:>10.3f}"
+                         f"{s['p90_ms']:>10.3f}{s['p99_ms']:>10.3f}")
+        return "\n".join(lines)
+
+    def dump(self, filename=PROFILE_FILE):
+        with open(filename, 'w') as f:
+            json.dump({'window': self.window, 'phases': self.stats()}, f, indent=2)
+        print(f"Wrote tick profile to {filename}.")
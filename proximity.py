@@ -0,0 +1,93 @@
+class ProximityIndex:
+    """
+    Bucketed index of living creatures by family, for neighborhood counts.
+
+    The grid is split into square buckets of `bucket_size` rows x cols. Each
+    bucket maps family id -> set of flat positions of that family's living
+    creatures in the bucket. A square query window of radius r <= bucket_size
+    touches at most 2x2 buckets, so a family query only visits that family's
+    members in those buckets instead of reading every hex in the window.
+
+    The grid keeps it in sync: `Grid.set_hex` moves creatures in and out, and
+    `Creature.die` removes the dead.
+    """
+    __slots__ = ('rows', 'cols', 'bucket_size', 'bucket_cols', '_buckets', '_families')
+
+    def __init__(self, rows, cols, bucket_size=8):
+        self.rows = rows
+        self.cols = cols
+        self.bucket_size = bucket_size
+        self.bucket_cols = (cols + bucket_size - 1) // bucket_size
+        bucket_rows = (rows + bucket_size - 1) // bucket_size
+        self._buckets = [dict() for _ in range(bucket_rows * self.bucket_cols)]
+        self._families = {}  # pos -> family, for removal by position
+
+    def _bucket(self, pos):
+        row, col = divmod(pos, self.cols)
+        size = self.bucket_size
+        return self._buckets[(row // size) * self.bucket_cols + col // size]
+
+    def add(self, pos, family):
+        self._families[pos] = family
+        bucket = self._bucket(pos)
+        members = bucket.get(family)
+        if members is None:
+            bucket[family] = {pos}
+        else:
+            members.add(pos)
+
+    def discard(self, pos):
+        family = self._families.pop(pos, None)
+        if family is None:
+            return
+        bucket = self._bucket(pos)
+        members = bucket[family]
+        members.discard(pos)
+        if not members:
+            del bucket[family]
+
+    def _window_buckets(self, pos, radius):
+        cols = self.cols
+        size = self.bucket_size
+        row, col = divmod(pos, cols)
+        buckets = self._buckets
+        bucket_cols = self.bucket_cols
+        first_row = max(0, row - radius) // size
+        last_row = min(self.rows - 1, row + radius) // size
+        first_col = max(0, col - radius) // size
+        last_col = min(cols - 1, col + radius) // size
+        for bucket_row in range(first_row, last_row + 1):
+            base = bucket_row * bucket_cols
+            for bucket_col in range(first_col, last_col + 1):
+                yield buckets[base + bucket_col]
+
+    def count_family(self, pos, family, radius, exclude=-1):
+        """Living members of `family` within `radius` rows and cols of `pos`."""
+        cols = self.cols
+        row, col = divmod(pos, cols)
+        count = 0
+        for bucket in self._window_buckets(pos, radius):
+            members = bucket.get(family)
+            if members:
+                for other in members:
+                    other_row, other_col = divmod(other, cols)
+                    if (abs(other_row - row) <= radius and abs(other_col - col) <= radius
+                            and other != exclude):
+                        count += 1
+        return count
+
+    def count_enemies(self, pos, family, radius, exclude=-1):
+        """Living creatures of any other family within `radius` of `pos`."""
+        cols = self.cols
+        row, col = divmod(pos, cols)
+        count = 0
+        for bucket in self._window_buckets(pos, radius):
+            for other_family, members in bucket.items():
+                if other_family == family:
+                    continue
+                for other in members:
+                    other_row, other_col = divmod(other, cols)
+                    if (abs(other_row - row) <= radius and abs(other_col - col) <= radius
+                            and other != exclude):
+                        count += 1
+        return count
@@ -0,0 +1,476 @@
+import math
+from collections import OrderedDict
+import numpy as np
+import pygame
+from consts import HEX_SIZE, CHUNK_SIZE, LOD_ZOOM
+from hex import (Content, hex_points, MOTHER, DEAD, _COLOR_WALL, _COLOR_FOOD,
+                 _COLOR_EMPTY, _COLOR_DEAD, _COLOR_TOXIN, _COLOR_DEFAULT)
+
+
+BACKGROUND_COLOR = (10, 10, 10)
+# Horizontal half-extent of a pointy-top hex, in units of HEX_SIZE
+_HALF_WIDTH = math.sqrt(3) / 2
+
+class SpriteAtlas:
+    """
+    Pre-rasterized hex sprites, so every hex is drawn with a single blit.
+
+    Content sprites (wall, food, toxin, empty outline) are built up front.
+    Creature sprites depend on the family color, so they are built on demand
+    and kept in a bounded LRU cache keyed by (color, state).
+    """
+
+    def __init__(self, size=HEX_SIZE, max_creature_sprites=512):
+        self.size = size
+        self.half_width = math.ceil(size * _HALF_WIDTH) + 1
+        self.sprite_size = (2 * self.half_width + 1, 2 * size + 3)
+        # Sprite-local hex center; integer so sprites rasterize exactly like
+        # polygons drawn straight onto the screen at integer hex centers
+        self.center = (self.half_width, size + 1)
+        self.points = hex_points(self.center[0], self.center[1], size)
+        self.max_creature_sprites = max_creature_sprites
+
+        self.content_sprites = {
+            Content.WALL: self._filled(_COLOR_WALL),
+            Content.FOOD: self._filled(_COLOR_FOOD),
+            Content.TOXIN: self._filled(_COLOR_TOXIN),
+        }
+        self.empty_sprite = self._new_sprite()
+        pygame.draw.polygon(self.empty_sprite, _COLOR_EMPTY, self.points, 1)
+        self.default_sprite = self._filled(_COLOR_DEFAULT)
+        self._creature_sprites = OrderedDict()
+
+    def offset(self, cx, cy):
+        """Top-left blit position for a sprite centred on (cx, cy)."""
+        return (cx - self.center[0], cy - self.center[1])
+
+    def _new_sprite(self):
+        return pygame.Surface(self.sprite_size, pygame.SRCALPHA)
+
+    def _filled(self, color):
+        sprite = self._new_sprite()
+        pygame.draw.polygon(sprite, color, self.points, 0)
+        return sprite
+
+    def creature_sprite(self, color, state):
+        key = (color, state)
+        sprites = self._creature_sprites
+        sprite = sprites.get(key)
+        if sprite is not None:
+            sprites.move_to_end(key)
+            return sprite
+
+        sprite = self._filled(color)
+        size = self.size
+        if state == DEAD:
+            # Dead creature - just red circle
+            pygame.draw.circle(sprite, _COLOR_DEAD, self.center, int(size * 0.7))
+        else:
+            # Living creature - draw dot
+            r, g, b = color
+            dot_color = (255 - r, 255 - g, 255 - b)
+            dot_radius = int(size * 0.4) if state == MOTHER else int(size * 0.15)
+            pygame.draw.circle(sprite, dot_color, self.center, dot_radius)
+
+        sprites[key] = sprite
+        if len(sprites) > self.max_creature_sprites:
+            sprites.popitem(last=False)
+        return sprite
+
+    def sprite_for(self, grid, pos):
+        """Sprite for whatever occupies `pos`, or None for an empty hex."""
+        content = grid.flat_content.item(pos)
+        if content == Content.EMPTY:
+            return None
+        if content == Content.CREATURE:
+            look = grid.creature_look(pos)
+            if look is not None:
+                return self.creature_sprite(*look)
+        return self.content_sprites.get(content, self.default_sprite)
+
+
+class GridRenderer:
+    """
+    Incremental grid renderer.
+
+    Walls and the outlines of every hex never change after maze generation,
+    so they are drawn once into a cached background surface. Each frame only
+    the hexes the grid marked dirty are redrawn, and the affected rects are
+    returned for `pygame.display.update`. Hexes are blitted from a SpriteAtlas.
+    """
+
+    def __init__(self, grid, size, atlas=None):
+        self.grid = grid
+        self.atlas = atlas if atlas is not None else SpriteAtlas()
+        self.background = pygame.Surface(size)
+        self.background.fill(BACKGROUND_COLOR)
+
+        atlas = self.atlas
+        # Blit position of every hex's sprite, by flat index
+        self._dests = [atlas.offset(*grid.hex_center(pos))
+                       for pos in range(grid.n_hexes)]
+
+        wall_sprite = atlas.content_sprites[Content.WALL]
+        empty_sprite = atlas.empty_sprite
+        flat_content = grid.flat_content
+        self.background.blits(
+            [(wall_sprite if flat_content.item(pos) == Content.WALL else empty_sprite, dest)
+             for pos, dest in enumerate(self._dests)],
+            doreturn=False)
+
+    def invalidate(self):
+        """Force a full redraw on the next frame (e.g. after the window was exposed)."""
+        self.grid._all_dirty = True
+
+    def _foreground(self, positions):
+        """(sprite, dest) pairs for the non-empty, non-wall hexes among `positions`."""
+        grid = self.grid
+        flat_content = grid.flat_content
+        sprite_for = self.atlas.sprite_for
+        dests = self._dests
+        blits = []
+        for pos in positions:
+            content = flat_content.item(pos)
+            if content != Content.EMPTY and content != Content.WALL:
+                blits.append((sprite_for(grid, pos), dests[pos]))
+        return blits
+
+    def draw(self, screen):
+        grid = self.grid
+        dirty = grid._dirty_hexes
+
+        if grid._all_dirty:
+            screen.blit(self.background, (0, 0))
+            content = grid.content.ravel()
+            occupied = np.flatnonzero((content != Content.EMPTY) &
+                                      (content != Content.WALL))
+            screen.blits(self._foreground(occupied.tolist()), doreturn=False)
+            grid._all_dirty = False
+            dirty.clear()
+            return [screen.get_rect()]
+
+        # Hex bounding rects overlap their neighbors', so each dirty rect is
+        # restored from the background and every hex touching it is redrawn in
+        # the same order as a full redraw, clipped to the rect.
+        background = self.background
+        neighbors = grid.neighbors
+        off_grid = grid.off_grid
+        sprite_size = self.atlas.sprite_size
+        dests = self._dests
+        rects = []
+        for pos in dirty:
+            rect = pygame.Rect(dests[pos], sprite_size)
+            screen.set_clip(rect)
+            screen.blit(background, rect, rect)
+            touching = neighbors[pos].tolist()
+            touching.append(pos)
+            touching.sort()
+            if touching[-1] == off_grid:
+                touching = [other for other in touching if other != off_grid]
+            screen.blits(self._foreground(touching), doreturn=False)
+            rects.append(rect)
+        screen.set_clip(None)
+        dirty.clear()
+        return rects
+
+
+def draw_grid(screen, grid):
+    """One-off full redraw of the grid onto `screen`."""
+    GridRenderer(grid, screen.get_size()).draw(screen)
+
+
+class Camera:
+    """
+    Pan/zoom view of the world. (x, y) is the world pixel shown at the
+    screen's top-left; zoom moves between fixed levels so cached sprites and
+    chunk surfaces stay pixel-exact at zoom 1. `version` changes on every move
+    so renderers know when the whole view must be redrawn.
+    """
+    ZOOM_LEVELS = (0.125, 0.25, 0.5, 1.0, 2.0)
+
+    def __init__(self, world_size, view_size):
+        self.world_size = world_size
+        self.view_size = view_size
+        self.level = self.ZOOM_LEVELS.index(1.0)
+        self.x = 0
+        self.y = 0
+        self.version = 0
+
+    @property
+    def zoom(self):
+        return self.ZOOM_LEVELS[self.level]
+
+    def to_world(self, sx, sy):
+        zoom = self.zoom
+        return self.x + sx / zoom, self.y + sy / zoom
+
+    def visible(self):
+        """World-pixel (x, y, width, height) currently on screen."""
+        zoom = self.zoom
+        return self.x, self.y, self.view_size[0] / zoom, self.view_size[1] / zoom
+
+    def pan(self, dx, dy):
+        """Move the view by (dx, dy) screen pixels."""
+        zoom = self.zoom
+        self._move(self.x + dx / zoom, self.y + dy / zoom)
+
+    def zoom_by(self, steps, anchor):
+        """Change zoom level by `steps`, keeping the world point under `anchor` in place."""
+        wx, wy = self.to_world(*anchor)
+        self.level = min(max(self.level + steps, 0), len(self.ZOOM_LEVELS) - 1)
+        zoom = self.zoom
+        self._move(wx - anchor[0] / zoom, wy - anchor[1] / zoom)
+
+    def _move(self, x, y):
+        _, _, view_w, view_h = self.visible()
+        world_w, world_h = self.world_size
+        # Integer world offsets keep zoom-1 blits on whole pixels
+        self.x = int(min(max(x, 0), max(0, world_w - view_w)))
+        self.y = int(min(max(y, 0), max(0, world_h - view_h)))
+        self.version += 1
+
+
+class _Chunk:
+    __slots__ = ('x', 'y', 'positions', 'background', 'surface', 'updated')
+
+    def __init__(self, x, y, positions, background, surface):
+        self.x = x
+        self.y = y
+        self.positions = positions
+        self.background = background
+        self.surface = surface
+        self.updated = []  # Chunk-local rects redrawn since the last frame
+
+
+class ChunkedRenderer:
+    """
+    Camera renderer for worlds larger than the window.
+
+    The world is tiled into CHUNK_SIZE x CHUNK_SIZE hex chunks. A chunk's
+    surfaces (background plus current foreground, drawn exactly like
+    `GridRenderer` does) are built the first time it becomes visible, kept in
+    an LRU cache and patched in place for dirty hexes, so off-screen parts of
+    the world cost nothing to draw. Below LOD_ZOOM the visible hexes are drawn
+    as one pixel each, straight from the content array, and scaled up.
+    """
+
+    def __init__(self, grid, view_size, camera=None, atlas=None,
+                 chunk_size=CHUNK_SIZE, max_chunks=128):
+        self.grid = grid
+        self.view_size = view_size
+        self.camera = camera if camera is not None else Camera(grid.world_size(), view_size)
+        self.atlas = atlas if atlas is not None else SpriteAtlas()
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.chunk_rows = -(-grid.rows // chunk_size)
+        self.chunk_cols = -(-grid.cols // chunk_size)
+        self._chunks = OrderedDict()
+        self._drawn_version = None
+
+        # Blit position of every hex's sprite, by flat index
+        row, col = np.divmod(np.arange(grid.n_hexes), grid.cols)
+        cx = HEX_SIZE + col * grid.x_step + (row % 2) * grid.x_shift
+        cy = HEX_SIZE + row * grid.y_step
+        ox, oy = self.atlas.offset(0, 0)
+        self._dests = np.stack([cx + ox, cy + oy], axis=1).astype(np.int32)
+
+        # Per-content colors for the one-pixel-per-hex level of detail
+        self._lod_colors = np.zeros((max(Content) + 1, 3), dtype=np.uint8)
+        self._lod_colors[:] = BACKGROUND_COLOR
+        self._lod_colors[Content.WALL] = _COLOR_WALL
+        self._lod_colors[Content.FOOD] = _COLOR_FOOD
+        self._lod_colors[Content.TOXIN] = _COLOR_TOXIN
+        self._lod_colors[Content.CREATURE] = _COLOR_DEFAULT
+
+    def invalidate(self):
+        """Redraw the whole view on the next frame (e.g. after the window was exposed)."""
+        self._drawn_version = None
+
+    def _build_chunk(self, key):
+        grid = self.grid
+        size = self.chunk_size
+        row0, col0 = key[0] * size, key[1] * size
+        row1, col1 = min(row0 + size, grid.rows), min(col0 + size, grid.cols)
+
+        own = (np.arange(row0, row1)[:, None] * grid.cols + np.arange(col0, col1)).ravel()
+        sprite_w, sprite_h = self.atlas.sprite_size
+        x, y = self._dests[own].min(axis=0).tolist()
+        x1, y1 = self._dests[own].max(axis=0).tolist()
+        width, height = x1 + sprite_w - x, y1 + sprite_h - y
+
+        # Own hexes plus a one-hex ring: every sprite that can reach this chunk
+        ring_rows = np.arange(max(row0 - 1, 0), min(row1 + 1, grid.rows))
+        ring_cols = np.arange(max(col0 - 1, 0), min(col1 + 1, grid.cols))
+        positions = (ring_rows[:, None] * grid.cols + ring_cols).ravel()
+        local = (self._dests[positions] - (x, y)).tolist()
+
+        atlas = self.atlas
+        wall_sprite = atlas.content_sprites[Content.WALL]
+        empty_sprite = atlas.empty_sprite
+        flat_content = grid.flat_content
+        background = pygame.Surface((width, height))
+        background.fill(BACKGROUND_COLOR)
+        background.blits(
+            [(wall_sprite if flat_content.item(pos) == Content.WALL else empty_sprite, tuple(dest))
+             for pos, dest in zip(positions.tolist(), local)],
+            doreturn=False)
+
+        surface = background.copy()
+        chunk = _Chunk(x, y, positions, background, surface)
+        surface.blits(self._foreground(chunk, positions.tolist()), doreturn=False)
+        return chunk
+
+    def _foreground(self, chunk, positions):
+        """(sprite, chunk-local dest) pairs for the non-empty, non-wall hexes among `positions`."""
+        grid = self.grid
+        flat_content = grid.flat_content
+        sprite_for = self.atlas.sprite_for
+        dests = self._dests
+        x, y = chunk.x, chunk.y
+        blits = []
+        for pos in positions:
+            content = flat_content.item(pos)
+            if content != Content.EMPTY and content != Content.WALL:
+                dx, dy = dests[pos].tolist()
+                blits.append((sprite_for(grid, pos), (dx - x, dy - y)))
+        return blits
+
+    def _apply_dirty(self, dirty):
+        """Patch every cached chunk that a dirty hex's sprite reaches."""
+        grid = self.grid
+        neighbors = grid.neighbors
+        off_grid = grid.off_grid
+        cols = grid.cols
+        size = self.chunk_size
+        chunks = self._chunks
+        sprite_size = self.atlas.sprite_size
+
+        for pos in dirty:
+            touching = neighbors[pos].tolist()
+            touching.append(pos)
+            touching.sort()
+            if touching[-1] == off_grid:
+                touching = [other for other in touching if other != off_grid]
+            # Every chunk whose one-hex ring holds this hex has its sprite baked in
+            row, col = divmod(pos, cols)
+            keys = {((row + dr) // size, (col + dc) // size)
+                    for dr in (-1, 0, 1) for dc in (-1, 0, 1)}
+            dx, dy = self._dests[pos].tolist()
+            for key in keys:
+                chunk = chunks.get(key)
+                if chunk is None:
+                    continue
+                # Same restore-and-redraw as GridRenderer, in chunk coordinates
+                rect = pygame.Rect(dx - chunk.x, dy - chunk.y, *sprite_size)
+                surface = chunk.surface
+                surface.set_clip(rect)
+                surface.blit(chunk.background, rect, rect)
+                surface.blits(self._foreground(chunk, touching), doreturn=False)
+                surface.set_clip(None)
+                chunk.updated.append(rect)
+
+    def _visible_chunks(self):
+        grid = self.grid
+        x, y, width, height = self.camera.visible()
+        sprite_w, sprite_h = self.atlas.sprite_size
+        size = self.chunk_size
+        row0 = max(int((y - sprite_h) // grid.y_step) - 1, 0) // size
+        row1 = min(int((y + height) // grid.y_step) + 1, grid.rows - 1) // size
+        col0 = max(int((x - sprite_w - grid.x_shift) // grid.x_step) - 1, 0) // size
+        col1 = min(int((x + width) // grid.x_step) + 1, grid.cols - 1) // size
+        return [(r, c) for r in range(row0, row1 + 1) for c in range(col0, col1 + 1)]
+
+    def _chunk(self, key):
+        chunks = self._chunks
+        chunk = chunks.get(key)
+        if chunk is None:
+            chunk = chunks[key] = self._build_chunk(key)
+            chunk.updated.append(None)  # Whole chunk is new on screen
+        else:
+            chunks.move_to_end(key)
+        return chunk
+
+    def draw(self, screen):
+        grid = self.grid
+        camera = self.camera
+        if grid._all_dirty:
+            self._chunks.clear()
+            grid._all_dirty = False
+            self._drawn_version = None
+        elif grid._dirty_hexes:
+            self._apply_dirty(grid._dirty_hexes)
+        grid._dirty_hexes.clear()
+
+        if camera.zoom < LOD_ZOOM:
+            for chunk in self._chunks.values():
+                chunk.updated.clear()
+            self._drawn_version = None
+            return self._draw_lod(screen)
+
+        visible = [self._chunk(key) for key in self._visible_chunks()]
+        zoom = camera.zoom
+        if zoom == 1.0:
+            rects = self._draw_unscaled(screen, visible)
+        else:
+            self._draw_scaled(screen, visible)
+            rects = [screen.get_rect()]
+            self._drawn_version = None
+
+        for chunk in self._chunks.values():
+            chunk.updated.clear()
+        while len(self._chunks) > max(self.max_chunks, len(visible)):
+            self._chunks.popitem(last=False)
+        return rects
+
+    def _draw_unscaled(self, screen, visible):
+        camera = self.camera
+        ox, oy = camera.x, camera.y
+        if self._drawn_version != camera.version:
+            screen.fill(BACKGROUND_COLOR)
+            screen.blits([(chunk.surface, (chunk.x - ox, chunk.y - oy)) for chunk in visible],
+                         doreturn=False)
+            self._drawn_version = camera.version
+            return [screen.get_rect()]
+
+        rects = []
+        screen_rect = screen.get_rect()
+        for chunk in visible:
+            sx, sy = chunk.x - ox, chunk.y - oy
+            for rect in chunk.updated:
+                if rect is None:
+                    rect = chunk.surface.get_rect()
+                dest = rect.move(sx, sy).clip(screen_rect)
+                if dest.width and dest.height:
+                    screen.blit(chunk.surface, dest, dest.move(-sx, -sy))
+                    rects.append(dest)
+        return rects
+
+    def _draw_scaled(self, screen, visible):
+        camera = self.camera
+        x, y, width, height = camera.visible()
+        canvas = pygame.Surface((math.ceil(width), math.ceil(height)))
+        canvas.fill(BACKGROUND_COLOR)
+        canvas.blits([(chunk.surface, (chunk.x - x, chunk.y - y)) for chunk in visible],
+                     doreturn=False)
+        screen.blit(pygame.transform.scale(canvas, self.view_size), (0, 0))
+
+    def _draw_lod(self, screen):
+        grid = self.grid
+        camera = self.camera
+        zoom = camera.zoom
+        x, y, width, height = camera.visible()
+        row0 = max(int((y - HEX_SIZE) // grid.y_step), 0)
+        row1 = min(int((y + height) // grid.y_step) + 1, grid.rows)
+        col0 = max(int((x - HEX_SIZE) // grid.x_step), 0)
+        col1 = min(int((x + width) // grid.x_step) + 1, grid.cols)
+
+        screen.fill(BACKGROUND_COLOR)
+        if row1 > row0 and col1 > col0:
+            pixels = self._lod_colors[grid.content[row0:row1, col0:col1]]
+            image = pygame.surfarray.make_surface(pixels.transpose(1, 0, 2))
+            size = (max(1, round((col1 - col0) * grid.x_step * zoom)),
+                    max(1, round((row1 - row0) * grid.y_step * zoom)))
+            left = (HEX_SIZE - grid.x_step / 2 + col0 * grid.x_step - x) * zoom
+            top = (HEX_SIZE - grid.y_step / 2 + row0 * grid.y_step - y) * zoom
+            screen.blit(pygame.transform.scale(image, size), (round(left), round(top)))
+        return [screen.get_rect()]
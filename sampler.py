@@ -0,0 +1,82 @@
+import random
+import numpy as np
+
+
+class EmptyHexSampler:
+    """
+    Indexed free-list of empty hex positions.
+
+    `_dense[:_size]` holds every member in arbitrary order and `_index[pos]`
+    is that position's slot in `_dense` (-1 when absent). Removal swaps the
+    last member into the freed slot, so add, discard, membership and uniform
+    random sampling are all O(1). Both are int32 arrays of `n_hexes`, 8 bytes
+    a hex, so even large worlds do not pay for a Python int per hex.
+    """
+    __slots__ = ('_dense', '_index', '_size')
+
+    def __init__(self, n_hexes):
+        self._dense = np.empty(n_hexes, dtype=np.int32)
+        self._index = np.full(n_hexes, -1, dtype=np.int32)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, pos):
+        return self._index[pos] >= 0
+
+    def members(self):
+        """Every member, in slot order (the order `sample` draws from)."""
+        return self._dense[:self._size]
+
+    def add(self, pos):
+        index = self._index
+        if index[pos] < 0:
+            size = self._size
+            index[pos] = size
+            self._dense[size] = pos
+            self._size = size + 1
+
+    def update(self, positions):
+        """Add `positions` in order, as repeated `add` calls would."""
+        positions = np.asarray(positions, dtype=np.int32)
+        if positions.size == 0:
+            return
+        # First occurrence of each position that is not a member yet, kept in order
+        _, first = np.unique(positions, return_index=True)
+        first.sort()
+        positions = positions[first]
+        positions = positions[self._index[positions] < 0]
+        size = self._size
+        end = size + positions.size
+        self._dense[size:end] = positions
+        self._index[positions] = np.arange(size, end, dtype=np.int32)
+        self._size = end
+
+    def discard(self, pos):
+        index = self._index
+        slot = int(index[pos])
+        if slot < 0:
+            return
+        dense = self._dense
+        size = self._size - 1
+        last = int(dense[size])
+        if last != pos:
+            dense[slot] = last
+            index[last] = slot
+        index[pos] = -1
+        self._size = size
+
+    def sample(self, rng=random):
+        """One uniformly random member, or None when empty."""
+        size = self._size
+        if not size:
+            return None
+        return int(self._dense[rng.randrange(size)])
+
+    def sample_k(self, k, rng=random):
+        """Up to `k` distinct uniformly random members."""
+        size = self._size
+        # `rng.sample` only draws indices, so sampling slots picks the same members
+        slots = rng.sample(range(size), min(k, size))
+        return self._dense[slots].tolist()
@@ -0,0 +1,64 @@
+"""Named NumPy arrays packed into one `multiprocessing.shared_memory` block.
+
+Both process-crossing channels build on it: `frames.FrameChannel` (simulation
+to viewer) and `stripes.StripePool` (coordinator to stripe workers).
+"""
+from multiprocessing import shared_memory
+import numpy as np
+
+_ALIGN = 8
+
+
+def _aligned(offset):
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class SharedArrays:
+    """
+    Arrays laid out back to back, each 8-byte aligned, in one shared block.
+
+    `spec` is a sequence of (name, shape, dtype); `arrays[name]` is the view
+    onto that field. Pickles by block name, so a process that unpickles it
+    attaches to the same memory. Every process calls `close` when done with
+    it; only the creator calls `unlink`.
+    """
+    __slots__ = ('spec', 'shm', 'arrays')
+
+    def __init__(self, spec):
+        self.spec = tuple(spec)
+        self.shm = shared_memory.SharedMemory(create=True, size=self._layout(self.spec)[1])
+        self._map()
+
+    @staticmethod
+    def _layout(spec):
+        """Byte offset of every field, and the total size."""
+        offsets = []
+        offset = 0
+        for _, shape, dtype in spec:
+            offsets.append(offset)
+            offset = _aligned(offset + int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        return offsets, max(offset, _ALIGN)
+
+    def _map(self):
+        buf = self.shm.buf
+        self.arrays = {name: np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+                       for (name, shape, dtype), offset in zip(self.spec, self._layout(self.spec)[0])}
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __getstate__(self):
+        return {'spec': self.spec, 'name': self.shm.name}
+
+    def __setstate__(self, state):
+        self.spec = state['spec']
+        self.shm = shared_memory.SharedMemory(name=state['name'])
+        self._map()
+
+    def close(self):
+        """Unmap the block. Views taken from `arrays` must be dropped first."""
+        self.arrays = None
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
@@ -0,0 +1,286 @@
+"""Stripe-parallel move planning for one large world.
+
+The world is cut into horizontal stripes of hex rows, one worker process
+each. While a pool is attached, the grid's hex buffers, the store columns
+planning reads and the store's brain genome tables live in shared memory
+(the coordinator, the process that owns the `Grid`, keeps using them as its
+own arrays), so nothing world-sized is copied per tick. Each tick the
+coordinator only writes the list of thinkers and the family goals; each
+worker then senses, decides and plans (`intents.plan_moves`) for the
+thinkers standing in its stripe and writes its slice of the `MovePlan`
+back. The coordinator resolves and applies the merged plan as usual.
+
+Only that planning runs in parallel. Resolving and applying moves, aging,
+deaths, reproduction and spawning stay serial in the coordinator, so the
+speedup is bounded by their share of the tick.
+
+Halo rows need no exchange: the coordinator waits while workers plan, so a
+worker reads the rows bordering its stripe straight out of shared memory.
+Handoff is implicit too: a creature belongs to whichever stripe holds its
+position at the start of the tick. Stripe bounds are recut every tick so
+each worker gets about the same number of thinkers.
+
+Resolution does not depend on plan order, so a tick comes out exactly as in
+the single-process two-phase mode:
+
+    grid.stripes = StripePool(grid, workers=4)
+    ...
+    grid.stripes.close()
+"""
+from multiprocessing import Pipe, Process
+import numpy as np
+import intents
+from intents import MovePlan, plan_moves
+from brain import GenomeTable, decide_batch
+from sensing import SensoryEncoder
+from shared import SharedArrays
+
+# Store columns a worker reads, kept in shared memory while the pool is attached
+_STORE_COLUMNS = ('pos', 'hunger', 'family', 'flags', 'mother', 'history')
+
+# MovePlan fields, written back by the workers
+_PLAN_FIELDS = (('rows', np.intp), ('pos', np.intp), ('targets', np.intp),
+                ('moving', bool), ('points', np.int64), ('hunger', np.int64))
+
+# intents' live-tunable globals, forwarded with every tick so tuning reaches the workers
+_TUNABLES = ('EXPLORATION_REWARD', 'FAMILY_PROXIMITY_PENALTY', 'DISTANCE_FROM_MOTHER_BONUS')
+
+
+class _SharedStore:
+    """The store columns `plan_moves` and `SensoryEncoder.encode_rows` read."""
+    __slots__ = _STORE_COLUMNS
+
+    def __init__(self, arrays):
+        for name in _STORE_COLUMNS:
+            setattr(self, name, arrays[name])
+
+
+class _SharedWorld:
+    """The `Grid` attributes `plan_moves` and `encode_rows` read, backed by shared memory."""
+    __slots__ = ('rows', 'cols', 'off_grid', 'flat_content', 'flat_creature_ids',
+                 'neighbors', 'store')
+
+    def __init__(self, rows, cols, hexes):
+        self.rows = rows
+        self.cols = cols
+        self.off_grid = rows * cols
+        arrays = hexes.arrays
+        self.flat_content = arrays['content']
+        self.flat_creature_ids = arrays['creature_ids']
+        self.neighbors = arrays['neighbors']
+        self.store = None
+
+
+def _plan_stripe(world, arrays, brains, encoder, count, lo, hi):
+    """Plan the thinkers on flat hexes [lo, hi) into their slice of the output arrays."""
+    store = world.store
+    thinkers = arrays['thinkers'][:count]
+    pos = store.pos[thinkers]
+    rows = thinkers[(pos >= lo) & (pos < hi)].astype(np.intp)
+    if rows.size == 0:
+        return 0
+    # Thinkers' mothers are alive; a mother's row has goals when she has a mother brain
+    mother = store.mother[rows]
+    has_goals = (mother >= 0) & arrays['has_goals'][mother]
+    goals = np.where(has_goals[:, None], arrays['goals'][mother], 0).astype(np.float32)
+
+    inputs = encoder.encode_rows(world, rows, goals)
+    plan = plan_moves(world, rows, decide_batch(brains, rows, inputs), goals, has_goals)
+
+    # Stripes own consecutive slices of the output, in stripe order
+    start = np.count_nonzero(pos < lo)
+    end = start + rows.size
+    for name, _ in _PLAN_FIELDS:
+        arrays['plan_' + name][start:end] = getattr(plan, name)
+    return rows.size
+
+
+def _stripe_worker(conn, rows, cols, hexes):
+    """Worker loop: plan a stripe per 'plan' message until told to stop with None."""
+    world = _SharedWorld(rows, cols, hexes)
+    encoder = SensoryEncoder()
+    block = None
+    brains = None
+    try:
+        while True:
+            message = conn.recv()
+            if message is None:
+                break
+            if message[0] == 'map':
+                if block is not None:
+                    world.store = brains = None
+                    block.close()
+                _, block, layer_sizes = message
+                world.store = _SharedStore(block.arrays)
+                brains = GenomeTable.from_arrays(
+                    block['brain_arch'], layer_sizes,
+                    [block[f'genome{i}'] for i in range(len(layer_sizes))])
+            else:
+                _, count, lo, hi, tunables = message
+                for name, value in tunables:
+                    setattr(intents, name, value)
+                conn.send(_plan_stripe(world, block.arrays, brains, encoder, count, lo, hi))
+    finally:
+        world.store = brains = None
+        world.flat_content = world.flat_creature_ids = world.neighbors = None
+        if block is not None:
+            block.close()
+        hexes.close()
+        conn.close()
+
+
+class StripePool:
+    """
+    Worker processes that plan a grid's two-phase moves, one stripe each.
+
+    Attach with `grid.stripes = StripePool(grid, workers)`; the grid's
+    two-phase move phase then calls `plan` instead of planning in-process.
+    Call `close` when done, to stop the workers, give the grid private
+    copies of its arrays back and free the shared memory.
+    """
+    __slots__ = ('grid', 'workers', '_hexes', '_block', '_conns', '_processes')
+
+    def __init__(self, grid, workers=2):
+        self.grid = grid
+        self.workers = workers
+        n = grid.n_hexes
+        hexes = self._hexes = SharedArrays((
+            ('content', (n + 1,), grid.flat_content.dtype),
+            ('creature_ids', (n + 1,), grid.flat_creature_ids.dtype),
+            ('neighbors', grid.neighbors.shape, grid.neighbors.dtype),
+        ))
+        hexes['content'][:] = grid.flat_content
+        hexes['creature_ids'][:] = grid.flat_creature_ids
+        hexes['neighbors'][:] = grid.neighbors
+        grid.bind_hex_buffers(hexes['content'], hexes['creature_ids'])
+        self._block = None
+
+        self._conns = []
+        self._processes = []
+        for _ in range(workers):
+            conn, child_conn = Pipe()
+            process = Process(target=_stripe_worker,
+                              args=(child_conn, grid.rows, grid.cols, hexes),
+                              daemon=True)
+            process.start()
+            child_conn.close()
+            self._conns.append(conn)
+            self._processes.append(process)
+
+    def _mapped(self):
+        """Whether the store still keeps everything the workers read in the current block."""
+        block = self._block
+        if block is None:
+            return False
+        store = self.grid.store
+        brains = store.brains
+        arrays = block.arrays
+        return (all(getattr(store, name) is arrays[name] for name in _STORE_COLUMNS) and
+                brains.arch is arrays['brain_arch'] and
+                all(matrix is arrays.get(f'genome{i}') for i, matrix in enumerate(brains.matrices)))
+
+    def _remap(self):
+        """Move the store's columns and genome tables onto a new shared block and hand it out.
+
+        Needed when the pool attaches and whenever the store has replaced one
+        of them since, i.e. after it grew or met a new brain architecture.
+        """
+        store = self.grid.store
+        brains = store.brains
+        capacity = store.capacity
+        block = SharedArrays(
+            tuple((name, getattr(store, name).shape, getattr(store, name).dtype)
+                  for name in _STORE_COLUMNS) +
+            (('brain_arch', brains.arch.shape, brains.arch.dtype),) +
+            tuple((f'genome{i}', matrix.shape, matrix.dtype)
+                  for i, matrix in enumerate(brains.matrices)) +
+            (('goals', (capacity, 3), np.float32),
+             ('has_goals', (capacity,), bool),
+             ('thinkers', (capacity,), np.int32)) +
+            tuple(('plan_' + name, (capacity,), dtype) for name, dtype in _PLAN_FIELDS))
+        for name in _STORE_COLUMNS:
+            block[name][:] = getattr(store, name)
+            setattr(store, name, block[name])
+        block['brain_arch'][:] = brains.arch
+        brains.arch = block['brain_arch']
+        for i, matrix in enumerate(brains.matrices):
+            block[f'genome{i}'][:] = matrix
+            brains.matrices[i] = block[f'genome{i}']
+
+        layer_sizes = [list(sizes) for sizes in brains.layer_sizes]
+        for conn in self._conns:
+            conn.send(('map', block, layer_sizes))
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+        self._block = block
+
+    def plan(self, thinkers):
+        """The `MovePlan` for `thinkers`, as `plan_moves` would make it in-process."""
+        grid = self.grid
+        store = grid.store
+        if not self._mapped():
+            self._remap()
+        arrays = self._block.arrays
+
+        n = len(thinkers)
+        rows = np.fromiter((c.id for c in thinkers), dtype=np.intp, count=n)
+        arrays['thinkers'][:n] = rows
+
+        # Goals once per family, as `Creature.get_mother_goals` would read them
+        views = store.views
+        goals = arrays['goals']
+        has_goals = arrays['has_goals']
+        has_goals[:store.size] = False
+        for mother in np.unique(store.mother[rows]).tolist():
+            if mother >= 0 and views[mother].mother_brain is not None:
+                goals[mother] = views[mother].family_goals()
+                has_goals[mother] = True
+
+        # Cut the rows where the running thinker count crosses each worker's share
+        workers = self.workers
+        cols = grid.cols
+        per_row = np.bincount(store.pos[rows] // cols, minlength=grid.rows)
+        cuts = np.searchsorted(np.cumsum(per_row), np.arange(1, workers) * n / workers) + 1
+        bounds = [0] + (np.minimum(cuts, grid.rows) * cols).tolist() + [grid.n_hexes]
+
+        tunables = tuple((name, getattr(intents, name)) for name in _TUNABLES)
+        for conn, lo, hi in zip(self._conns, bounds[:-1], bounds[1:]):
+            conn.send(('plan', n, lo, hi, tunables))
+        planned = sum(conn.recv() for conn in self._conns)
+        if planned != n:
+            raise RuntimeError(f"stripe workers planned {planned} of {n} thinkers")
+
+        return MovePlan(*(arrays['plan_' + name][:n].copy() for name, _ in _PLAN_FIELDS))
+
+    def close(self):
+        for conn in self._conns:
+            conn.send(None)
+        for process in self._processes:
+            process.join()
+        for conn in self._conns:
+            conn.close()
+        self._conns = []
+        self._processes = []
+
+        # The grid keeps running on private copies of whatever is still shared
+        grid = self.grid
+        block = self._block
+        if block is not None:
+            store = grid.store
+            brains = store.brains
+            for name in _STORE_COLUMNS:
+                if getattr(store, name) is block[name]:
+                    setattr(store, name, block[name].copy())
+            if brains.arch is block['brain_arch']:
+                brains.arch = brains.arch.copy()
+            matrices = brains.matrices
+            for i in range(len(matrices)):
+                if matrices[i] is block.arrays.get(f'genome{i}'):
+                    matrices[i] = matrices[i].copy()
+            block.close()
+            block.unlink()
+            self._block = None
+        grid.bind_hex_buffers(grid.flat_content.copy(), grid.flat_creature_ids.copy())
+        self._hexes.close()
+        self._hexes.unlink()
@@ -0,0 +1,21 @@
+import json
+import os
+import sys
+
+# The simulation modules live at the repository root, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint import snapshot
+
+# Header fields that record how a world moves rather than what is in it
+_MODE_FIELDS = ("two_phase", "batched", "stripe_workers")
+
+
+def world_state(grid):
+    """`snapshot(grid)` without the move mode, to compare worlds run in different modes."""
+    arrays = snapshot(grid)
+    header = json.loads(arrays["header"].item())
+    for field in _MODE_FIELDS:
+        del header[field]
+    arrays["header"] = json.dumps(header)
+    return arrays
@@ -0,0 +1,32 @@
+"""The batched move phase must give exactly the world the sequential one does."""
+import numpy as np
+import pytest
+import grid as grid_module
+from grid import Grid
+from conftest import world_state
+
+
+def assert_same_world(a, b):
+    left, right = world_state(a), world_state(b)
+    for key in left:
+        assert np.array_equal(left[key], right[key]), key
+
+
+def run_both(seed, ticks):
+    sequential = Grid(seed=seed, batched=False)
+    batched = Grid(seed=seed, batched=True)
+    for _ in range(ticks):
+        sequential.tick()
+        batched.tick()
+        assert_same_world(sequential, batched)
+
+
+@pytest.mark.parametrize("seed", [1, 7])
+def test_batched_matches_sequential(seed):
+    run_both(seed, 60)
+
+
+def test_batched_matches_sequential_between_goal_refreshes(monkeypatch):
+    # Goals missing between refreshes are computed at each creature's turn
+    monkeypatch.setattr(grid_module, "GOAL_REFRESH_INTERVAL", 4)
+    run_both(3, 60)
@@ -0,0 +1,45 @@
+"""A checkpoint must bring back the world's move mode along with the world."""
+import numpy as np
+import pytest
+from grid import Grid
+from checkpoint import save_checkpoint, load_checkpoint, snapshot
+from stripes import StripePool
+
+
+@pytest.mark.parametrize("two_phase, batched", [(False, False), (False, True), (True, True)])
+def test_resume_keeps_move_mode(tmp_path, two_phase, batched):
+    grid = Grid(seed=2, two_phase=two_phase, batched=batched)
+    for _ in range(50):
+        grid.tick()
+    path = str(tmp_path / "world.npz")
+    save_checkpoint(grid, path)
+    resumed = load_checkpoint(path)
+    assert (resumed.two_phase, resumed.batched) == (two_phase, batched)
+    assert resumed.stripes is None
+
+    for _ in range(50):
+        grid.tick()
+        resumed.tick()
+    left, right = snapshot(grid), snapshot(resumed)
+    for key in left:
+        assert np.array_equal(left[key], right[key]), key
+
+
+def test_resume_restarts_stripe_workers(tmp_path):
+    grid = Grid(seed=2, rows=80, cols=100, two_phase=True)
+    grid.stripes = StripePool(grid, 2)
+    try:
+        grid.tick()
+        path = str(tmp_path / "world.npz")
+        save_checkpoint(grid, path)
+    finally:
+        grid.stripes.close()
+
+    resumed = load_checkpoint(path)
+    try:
+        assert resumed.two_phase
+        assert resumed.stripes is not None and resumed.stripes.workers == 2
+        resumed.tick()
+    finally:
+        resumed.stripes.close()
+    assert load_checkpoint(path, workers=0).stripes is None
@@ -0,0 +1,33 @@
+"""The store's running family totals must always match a recount."""
+import numpy as np
+import pytest
+from grid import Grid
+from checkpoint import save_checkpoint, load_checkpoint
+
+
+def assert_family_totals(grid):
+    store = grid.store
+    size = store.size
+    kids, kids_hunger = store.kids[:size].copy(), store.kids_hunger[:size].copy()
+    store.recount_families()
+    assert np.array_equal(kids, store.kids[:size])
+    assert np.array_equal(kids_hunger, store.kids_hunger[:size])
+
+
+@pytest.mark.parametrize("mode", [dict(batched=False), dict(batched=True), dict(two_phase=True)])
+def test_family_totals_match_recount(tmp_path, mode):
+    grid = Grid(seed=3, **mode)
+    for _ in range(8):
+        for _ in range(10):
+            grid.tick()
+        assert_family_totals(grid)
+
+    path = str(tmp_path / "world.npz")
+    save_checkpoint(grid, path)
+    resumed = load_checkpoint(path)
+    size = grid.store.size
+    assert np.array_equal(resumed.store.kids[:size], grid.store.kids[:size])
+    assert np.array_equal(resumed.store.kids_hunger[:size], grid.store.kids_hunger[:size])
+    for _ in range(10):
+        resumed.tick()
+    assert_family_totals(resumed)
@@ -0,0 +1,53 @@
+"""Brains of different hidden shapes must be able to share one world and its genome tables."""
+import numpy as np
+import pytest
+from grid import Grid
+from brain import NeuralNetwork, MotherBrain
+from checkpoint import save_checkpoint, load_checkpoint
+from conftest import world_state
+
+
+def mixed_world(**mode):
+    grid = Grid(seed=1, **mode)
+    grid.spawn_mother(None, None)
+    rng = np.random.default_rng(0)
+    grid.spawn_mother(NeuralNetwork(hidden_sizes=[16], rng=rng),
+                      MotherBrain(hidden_sizes=[5], rng=rng))
+    return grid
+
+
+def test_batched_matches_sequential_with_mixed_brains():
+    sequential = mixed_world(batched=False)
+    batched = mixed_world(batched=True)
+    for _ in range(60):
+        sequential.tick()
+        batched.tick()
+    assert any(len(c.brain.hidden_sizes) == 1 for c in batched.creatures)
+    left, right = world_state(sequential), world_state(batched)
+    for key in left:
+        assert np.array_equal(left[key], right[key]), key
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_two_phase_runs_with_mixed_brains(batched):
+    grid = mixed_world(two_phase=True, batched=batched)
+    for _ in range(30):
+        grid.tick()
+
+
+def test_store_genomes_mirror_the_brains(tmp_path):
+    grid = mixed_world()
+    for _ in range(60):
+        grid.tick()
+    path = str(tmp_path / "world.npz")
+    save_checkpoint(grid, path)
+    for world in (grid, load_checkpoint(path)):
+        store = world.store
+        for creature in world.creatures:
+            for table, brain in ((store.brains, creature.brain),
+                                 (store.mother_brains, creature.mother_brain)):
+                arch = table.arch[creature.id]
+                if brain is None:
+                    assert arch == -1
+                else:
+                    assert np.array_equal(table.matrices[arch][creature.id], brain.genome)
@@ -0,0 +1,35 @@
+"""The proximity index must count exactly what a scan of the query window finds."""
+import pytest
+from grid import Grid
+from consts import FAMILY_PROXIMITY_THRESHOLD
+
+
+def window_scan(grid, pos, radius):
+    """(family, position) of every living creature within `radius` rows and cols of `pos`."""
+    row, col = divmod(pos, grid.cols)
+    found = []
+    for r in range(max(0, row - radius), min(grid.rows, row + radius + 1)):
+        for c in range(max(0, col - radius), min(grid.cols, col + radius + 1)):
+            creature = grid.get_creature(r * grid.cols + c)
+            if creature is not None and not creature.dead:
+                found.append((creature.family, creature.pos))
+    return found
+
+
+@pytest.mark.parametrize("radius", [2, FAMILY_PROXIMITY_THRESHOLD])
+def test_counts_match_window_scan(radius):
+    grid = Grid(seed=6)
+    for _ in range(40):
+        grid.tick()
+    proximity = grid.proximity
+    enemies_seen = 0
+    for creature in grid.creatures[:300]:
+        pos, family = creature.pos, creature.family
+        found = window_scan(grid, pos, radius)
+        assert proximity.count_family(pos, family, radius, exclude=pos) == sum(
+            1 for other_family, other in found if other_family == family and other != pos)
+        enemies = proximity.count_enemies(pos, family, radius, exclude=pos)
+        assert enemies == sum(
+            1 for other_family, other in found if other_family != family and other != pos)
+        enemies_seen += enemies
+    assert enemies_seen > 0
@@ -0,0 +1,49 @@
+"""Stripe workers must plan exactly the moves the in-process two-phase mode plans."""
+import numpy as np
+import pytest
+from grid import Grid
+from conftest import world_state
+from stripes import StripePool
+from brain import NeuralNetwork, MotherBrain
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_stripes_match_in_process(workers):
+    local = Grid(seed=5, rows=120, cols=160, two_phase=True)
+    striped = Grid(seed=5, rows=120, cols=160, two_phase=True)
+    striped.stripes = StripePool(striped, workers)
+    try:
+        for _ in range(60):
+            local.tick()
+            striped.tick()
+            assert np.array_equal(local.flat_content, striped.flat_content)
+            assert np.array_equal(local.flat_creature_ids, striped.flat_creature_ids)
+        left, right = world_state(local), world_state(striped)
+        for key in left:
+            assert np.array_equal(left[key], right[key]), key
+    finally:
+        striped.stripes.close()
+
+
+def test_stripes_with_mixed_brains_then_detached():
+    rng = np.random.default_rng(0)
+    brain, mother_brain = NeuralNetwork(hidden_sizes=[16], rng=rng), MotherBrain(rng=rng)
+    local = Grid(seed=5, rows=120, cols=160, two_phase=True)
+    striped = Grid(seed=5, rows=120, cols=160, two_phase=True)
+    for world in (local, striped):
+        world.spawn_mother(brain, mother_brain)
+    striped.stripes = StripePool(striped, 2)
+    try:
+        for _ in range(40):
+            local.tick()
+            striped.tick()
+    finally:
+        striped.stripes.close()
+        striped.stripes = None
+    # Closing hands the grid private arrays, and it carries on from there
+    for _ in range(10):
+        local.tick()
+        striped.tick()
+    left, right = world_state(local), world_state(striped)
+    for key in left:
+        assert np.array_equal(left[key], right[key]), key
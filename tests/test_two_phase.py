@@ -0,0 +1,37 @@
+"""Two-phase moves must not depend on the order of `Grid.creatures`."""
+import random
+import numpy as np
+import pytest
+from grid import Grid
+from checkpoint import save_checkpoint, load_checkpoint, snapshot
+
+
+def move_phase(grid):
+    grid.move_creatures()
+    grid.age_creatures()
+    grid.remove_dead_creatures()
+
+
+@pytest.mark.parametrize("seed", [4, 9])
+def test_outcome_ignores_creature_order(tmp_path, seed):
+    grid = Grid(seed=seed, two_phase=True)
+    for _ in range(80):
+        grid.tick()
+    path = str(tmp_path / "world.npz")
+    save_checkpoint(grid, path)
+    ordered, shuffled = load_checkpoint(path), load_checkpoint(path)
+    shuffle = random.Random(seed)
+
+    for _ in range(5):
+        shuffle.shuffle(shuffled.creatures)
+        for index, creature in enumerate(shuffled.creatures):
+            shuffled.store.listed[creature.id] = index
+        for world in (ordered, shuffled):
+            world.two_phase = True
+            move_phase(world)
+
+        left, right = snapshot(ordered), snapshot(shuffled)
+        # Only where each creature sits in the list may differ
+        for key in left:
+            if key != "listed":
+                assert np.array_equal(left[key], right[key]), key
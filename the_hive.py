@@ -1,61 +1,52 @@
-from consts import H, W
+import queue
+import time
+from consts import PROFILE_TICKS
 from grid import Grid
-import pygame
+from frames import FramePublisher
+from profiler import TickProfiler
 
 
-def the_hive(shared, options_event):
-    pygame.init()
-    pygame.display.set_caption("the_hive")
+def the_hive(control, channel, commands):
+    """Simulation process: ticks as fast as it can and publishes frames for the viewer."""
     grid = Grid()
-    screen = pygame.display.set_mode((W, H))
-    clock = pygame.time.Clock()
-
-    bg_color = (10, 10, 10)
-
-    pg_event_get = pygame.event.get
-    pg_mouse_get_pressed = pygame.mouse.get_pressed
-    pg_mouse_get_pos = pygame.mouse.get_pos
-    pg_display_flip = pygame.display.flip
-
-    grid_draw = grid.draw
-    grid_move = grid.move_creatures
-    grid_remove_dead = grid.remove_dead_creatures
-    grid_reproduction = grid.handle_reproduction
-    grid_evolution = grid.handle_evolution_spawn
-    grid_add_creature = grid.add_creature
-    grid_spawn_toxins = grid.spawn_toxins
-    grid_spawn_food = grid.spawn_food
-
-    running_key = "running"
-
-    while shared[running_key]:
-        for e in pg_event_get():
-            if e.type == pygame.QUIT:
-                shared[running_key] = False
-            elif e.type == pygame.KEYDOWN:
-                if e.key == pygame.K_q:
-                    grid.save_best()
-                    shared[running_key] = False
-                elif e.key == pygame.K_o:
-                    if not options_event.is_set():
-                        options_event.set()
-                    else:
-                        options_event.clear()
-            elif e.type == pygame.MOUSEBUTTONDOWN:
-                left, _, right = pg_mouse_get_pressed()
-                if left:
-                    x, y = pg_mouse_get_pos()
-                    grid_add_creature(x, y)
-
-        screen.fill(bg_color)
-        grid_draw(screen)
-        grid_move()
-        grid_remove_dead()
-        grid_reproduction()
-        grid_evolution()
-        grid_spawn_toxins()
-        grid_spawn_food()
-        pg_display_flip()
-        clock.tick(5000)
-
-    pygame.quit()
+    publisher = FramePublisher(channel)
+    profiler = None
+    if PROFILE_TICKS:
+        profiler = TickProfiler()
+        profiler.attach(grid)
+
+    grid_tick = grid.tick
+    maybe_publish = publisher.maybe_publish
+    get_command = commands.get_nowait
+    params_version = -1
+
+    while control.running:
+        while True:
+            try:
+                command = get_command()
+            except queue.Empty:
+                break
+            name = command[0]
+            if name == "add_creature":
+                grid.add_creature(*command[1:])
+            elif name == "save_quit":
+                grid.save_best()
+                control.stop()
+            elif name == "profile" and profiler is not None:
+                profiler.dump()
+
+        if control.version != params_version:
+            params_version = control.version
+            control.apply()
+
+        if control.paused and not control.take_step():
+            maybe_publish(grid)
+            time.sleep(0.01)
+            continue
+
+        grid_tick()
+        maybe_publish(grid)
+
+    if profiler is not None:
+        profiler.dump()
+    channel.close()
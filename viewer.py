@@ -0,0 +1,65 @@
+import time
+import pygame
+from consts import H, W, FRAME_RATE
+from frames import FrameGrid
+from render import Camera, ChunkedRenderer
+
+
+def viewer(control, options_event, channel, commands):
+    """Window process: draws the latest frame the simulation published and forwards input."""
+    pygame.init()
+    pygame.display.set_caption("the_hive")
+    screen = pygame.display.set_mode((W, H))
+    clock = pygame.time.Clock()
+    frame = FrameGrid(channel)
+
+    # The background is built from the walls, so wait for the first frame
+    while control.running and not frame.update():
+        pygame.event.pump()
+        time.sleep(0.01)
+    camera = Camera(frame.world_size(), (W, H))
+    renderer = ChunkedRenderer(frame, (W, H), camera)
+    pan_step = 100
+    pan_keys = {pygame.K_LEFT: (-pan_step, 0), pygame.K_RIGHT: (pan_step, 0),
+                pygame.K_UP: (0, -pan_step), pygame.K_DOWN: (0, pan_step)}
+    pygame.key.set_repeat(200, 30)
+
+    while control.running:
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT:
+                control.stop()
+            elif e.type == pygame.KEYDOWN:
+                if e.key == pygame.K_q:
+                    commands.put(("save_quit",))
+                elif e.key == pygame.K_p:
+                    commands.put(("profile",))
+                elif e.key == pygame.K_SPACE:
+                    control.paused = not control.paused
+                elif e.key == pygame.K_s:
+                    control.request_step()
+                elif e.key in pan_keys:
+                    camera.pan(*pan_keys[e.key])
+                elif e.key == pygame.K_o:
+                    if not options_event.is_set():
+                        options_event.set()
+                    else:
+                        options_event.clear()
+            elif e.type == pygame.WINDOWEXPOSED:
+                renderer.invalidate()
+            elif e.type == pygame.MOUSEWHEEL:
+                camera.zoom_by(e.y, pygame.mouse.get_pos())
+            elif e.type == pygame.MOUSEMOTION and e.buttons[2]:
+                # Right-drag pans
+                camera.pan(-e.rel[0], -e.rel[1])
+            elif e.type == pygame.MOUSEBUTTONDOWN:
+                left, _, right = pygame.mouse.get_pressed()
+                if left:
+                    x, y = camera.to_world(*pygame.mouse.get_pos())
+                    commands.put(("add_creature", int(x), int(y)))
+
+        frame.update()
+        pygame.display.update(renderer.draw(screen))
+        clock.tick(FRAME_RATE)
+
+    pygame.quit()
+    channel.close()